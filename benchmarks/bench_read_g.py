@@ -0,0 +1,97 @@
+"""
+Microbenchmark comparing the single pass .g reader with the original regex based reader.
+
+A synthetic ParSeMiS output file with roughly one million lines is generated, and both readers
+parse it into FrequentGraph objects.
+
+Usage: PYTHONPATH=. python benchmarks/bench_read_g.py [number_of_lines]
+"""
+import random
+import re
+import sys
+import tempfile
+import time
+
+import networkx as nx
+
+from parsemis.parsemis_wrapper import ParsemisMiner, FrequentGraph
+
+
+def legacy_read_g(output_file, graphs):
+    frequent_graphs = []
+    with open(output_file, "r") as f:
+        graph_map = {}
+        node_map = {}
+        graph_id = 0
+        for line in f.readlines():
+            line = line.strip()
+            if line.startswith("XP"):
+                graph_id += 1
+                node_map = {}
+                graph_map[graph_id] = nx.Graph(id=graph_id, embeddings=[])
+            elif line.startswith("v"):
+                node_id = line.split(" ")[1]
+                label = " ".join(line.split(" ")[2:])
+                graph_map[graph_id].add_node(label)
+                node_map[node_id] = label
+            elif line.startswith("u"):
+                start_node_id = line.split(" ")[1]
+                end_node_id = line.split(" ")[2]
+                label = None
+                if len(line.split(" ")) >= 3:
+                    label = " ".join(line.split(" ")[3:])
+                graph_map[graph_id].add_edge(node_map[start_node_id], node_map[end_node_id], label=label)
+            elif line.startswith("% => "):
+                line = re.sub(r"(% => \d{1,}\[)", "", line)
+                line = re.sub(r"\]$", "", line)
+                for index in line.split(","):
+                    if index != "":
+                        appears_in_id = graphs[int(index.strip())].graph['id']
+                        graph_map[graph_id].graph['embeddings'].append(appears_in_id)
+
+        for graph in graph_map:
+            frequent_graphs.append(FrequentGraph(graph_map[graph], graph_map[graph].graph['embeddings']))
+
+    return frequent_graphs
+
+
+def write_synthetic_output(path, n_lines, n_graphs, seed=0):
+    rng = random.Random(seed)
+    written = 0
+    with open(path, "w") as f:
+        while written < n_lines:
+            n_nodes = rng.randint(1, 4)
+            f.write("XP\n")
+            for node in range(1, n_nodes + 1):
+                f.write("v %i label_%i\n" % (node, rng.randint(0, 500)))
+            for node in range(2, n_nodes + 1):
+                f.write("u %i %i appears_in\n" % (rng.randint(1, node - 1), node))
+            support = sorted(rng.sample(range(n_graphs), rng.randint(1, 200)))
+            f.write("%% => %i[%s]\n" % (len(support), ",".join(str(i) for i in support)))
+            written += 2 * n_nodes + 1
+
+
+def time_call(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main(n_lines=1000000, n_graphs=10000):
+    data_location = tempfile.mkdtemp()
+    miner = ParsemisMiner(data_location)
+    graphs = [nx.Graph(id="graph_%i" % i) for i in range(n_graphs)]
+    write_synthetic_output(miner.output_file, n_lines, n_graphs)
+
+    legacy_time, legacy = time_call(lambda: legacy_read_g(miner.output_file, graphs))
+    current_time, current = time_call(lambda: miner.read_g(graphs))
+    assert len(legacy) == len(current)
+
+    print("lines: %i, fragments: %i" % (n_lines, len(current)))
+    print("legacy read_g:  %.2fs" % legacy_time)
+    print("current read_g: %.2fs" % current_time)
+    print("speedup:        %.2fx" % (legacy_time / current_time))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
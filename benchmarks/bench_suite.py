@@ -0,0 +1,175 @@
+"""
+Benchmark suite timing each stage of the wrapper over synthetic collections at several scales.
+
+For each scale a collection with planted motifs is generated (see synthetic.py), and the following stages are
+timed: writing the input (write_g or write_lg), mining (perform_mining), reading the output (read_g or read_lg),
+the dot product and Jaccard similarity matrices, and containment checks of the fragments against the collection.
+
+By default mining is replayed by ReplayMiner, which copies a recorded output file into place rather than starting
+Java, so the Python side can be benchmarked anywhere. The recording is written from the planted motifs, unless
+--replay gives the prefix of the outputs of an earlier --java --record run, which replays what ParSeMiS really found.
+The collections are generated again from the same parameters and seed, so a recording only fits a run that uses
+the parameters it was recorded with.
+
+Results are written as JSON, and --compare prints the ratio of each stage's time to an earlier results file.
+
+Usage: PYTHONPATH=. python benchmarks/bench_suite.py [--scales 100 1000 10000] [--output results.json]
+                                                     [--compare baseline.json] [--directed]
+                                                     [--java [--record PREFIX] | --replay PREFIX]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from parsemis.parsemis_wrapper import ParsemisMiner
+from synthetic import generate_collection, write_recording
+
+
+class ReplayMiner(ParsemisMiner):
+    """
+    Stands in for ParSeMiS by copying a recorded output file into place
+    """
+
+    def __init__(self, data_location, recording, mine_undirected=True) -> None:
+        super().__init__(data_location, mine_undirected=mine_undirected, debug=False)
+        self.recording = recording
+
+    def perform_mining(self, **kwargs):
+        shutil.copyfile(self.recording, self.output_file)
+        return 0
+
+
+def time_stage(function, repeat):
+    """
+    :return: A dict of the timings of a stage over several runs, and the result of the last run
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return {'min': min(times), 'median': statistics.median(times), 'runs': times}, result
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.realpath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scale(n_graphs, arguments):
+    graphs, motifs = generate_collection(n_graphs, n_nodes=arguments.nodes, density=arguments.density,
+                                         n_node_labels=arguments.node_labels, n_edge_labels=arguments.edge_labels,
+                                         n_motifs=arguments.motifs, motif_frequency=arguments.motif_frequency,
+                                         directed=arguments.directed, seed=arguments.seed)
+    data_location = tempfile.mkdtemp()
+    mine_undirected = not arguments.directed
+    parameters = {'minimum_frequency': "%g%%" % (100 * arguments.motif_frequency)}
+    try:
+        if arguments.java:
+            miner = ParsemisMiner(data_location, mine_undirected=mine_undirected, debug=False)
+        else:
+            if arguments.replay is not None:
+                recording = "%s.%i" % (arguments.replay, n_graphs)
+            else:
+                recording = "%s/recording" % data_location
+                write_recording(recording, motifs, arguments.directed)
+            miner = ReplayMiner(data_location, recording, mine_undirected)
+
+        stages = {}
+        stages['write'], _ = time_stage(lambda: miner.write_graph(graphs), arguments.repeat)
+        stages['mine'], _ = time_stage(lambda: miner.perform_mining(**parameters), arguments.repeat)
+        if arguments.java and arguments.record is not None:
+            shutil.copyfile(miner.output_file, "%s.%i" % (arguments.record, n_graphs))
+        stages['read'], frequent_graphs = time_stage(lambda: miner.read_graph(), arguments.repeat)
+        stages['dot_product_similarity'], _ = time_stage(
+            lambda: ParsemisMiner.calculate_dot_product_similarity_matrix(frequent_graphs, graphs), arguments.repeat)
+        stages['jaccard_similarity'], _ = time_stage(
+            lambda: ParsemisMiner.calculate_jaccard_similarity_matrix(frequent_graphs, graphs), arguments.repeat)
+        stages['containment'], _ = time_stage(
+            lambda: ParsemisMiner.contains_many(frequent_graphs, graphs), arguments.repeat)
+        return {'n_graphs': n_graphs, 'n_fragments': len(frequent_graphs),
+                'input_bytes': os.path.getsize(miner.input_file), 'stages': stages}
+    finally:
+        shutil.rmtree(data_location, ignore_errors=True)
+
+
+def compare(results, baseline):
+    """
+    Prints the ratio of each stage's median time to the baseline's, where both have the scale
+    """
+    baseline_scales = {scale['n_graphs']: scale for scale in baseline['scales']}
+    print("%-10s %-24s %10s %10s %8s" % ("graphs", "stage", "baseline", "current", "ratio"))
+    for scale in results['scales']:
+        old = baseline_scales.get(scale['n_graphs'])
+        if old is None:
+            continue
+        for stage, timing in scale['stages'].items():
+            if stage not in old['stages']:
+                continue
+            before, after = old['stages'][stage]['median'], timing['median']
+            print("%-10i %-24s %9.4fs %9.4fs %7.2fx" % (scale['n_graphs'], stage, before, after,
+                                                       after / before if before > 0 else float('inf')))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--nodes", type=int, default=10)
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument("--node-labels", type=int, default=50)
+    parser.add_argument("--edge-labels", type=int, default=5)
+    parser.add_argument("--motifs", type=int, default=10)
+    parser.add_argument("--motif-frequency", type=float, default=0.2)
+    parser.add_argument("--directed", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    mining = parser.add_mutually_exclusive_group()
+    mining.add_argument("--java", action="store_true", help="run ParSeMiS rather than replaying a recording")
+    mining.add_argument("--replay", help="replays the outputs of a --record run, REPLAY.<n_graphs> for each scale")
+    parser.add_argument("--record", help="with --java, keeps the output of each scale as RECORD.<n_graphs>")
+    parser.add_argument("--output", help="writes the results as JSON to this file, rather than stdout")
+    parser.add_argument("--compare", help="a JSON results file to compare against")
+    arguments = parser.parse_args(argv)
+    if arguments.replay is not None:
+        missing = [n_graphs for n_graphs in arguments.scales
+                   if not os.path.exists("%s.%i" % (arguments.replay, n_graphs))]
+        if missing:
+            parser.error("no recording %s.<n_graphs> for %s graphs" % (arguments.replay,
+                                                                       ", ".join(map(str, missing))))
+
+    results = {'revision': git_revision(),
+               'python': sys.version.split()[0],
+               'platform': platform.platform(),
+               'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+               'parameters': {name: value for name, value in vars(arguments).items()
+                              if name not in ('output', 'compare', 'record')},
+               'scales': []}
+    for n_graphs in arguments.scales:
+        print("Benchmarking %i graphs" % n_graphs, file=sys.stderr)
+        results['scales'].append(run_scale(n_graphs, arguments))
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
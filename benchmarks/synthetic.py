@@ -0,0 +1,104 @@
+"""
+Synthetic labelled graph collections for benchmarking.
+
+Graphs are built over a node label alphabet and an edge label alphabet, with a controllable number of nodes per
+graph and edge density. Motifs (small connected labelled graphs) are planted in a chosen fraction of the graphs, so
+a collection has a known set of frequent fragments, and ParSeMiS' output for them can be written out and replayed.
+As in the rest of the wrapper, node keys are their labels, so a graph can't hold two nodes with the same label.
+"""
+import random
+
+import networkx as nx
+
+
+class Motif:
+    """
+    A labelled graph planted into a known set of graph positions
+    """
+
+    def __init__(self, graph, positions) -> None:
+        super().__init__()
+        self.graph = graph
+        self.positions = positions
+
+
+def random_motif(rng, node_labels, edge_labels, n_nodes, directed=False):
+    """
+    :return: A random connected labelled graph, built as a random tree plus one extra edge when possible
+    """
+    motif = nx.DiGraph() if directed else nx.Graph()
+    nodes = rng.sample(node_labels, n_nodes)
+    motif.add_node(nodes[0])
+    for i in range(1, n_nodes):
+        motif.add_edge(nodes[rng.randrange(i)], nodes[i], label=rng.choice(edge_labels))
+    if n_nodes > 2:
+        u, v = rng.sample(nodes, 2)
+        if not motif.has_edge(u, v):
+            motif.add_edge(u, v, label=rng.choice(edge_labels))
+    return motif
+
+
+def generate_collection(n_graphs, n_nodes=10, density=0.2, n_node_labels=50, n_edge_labels=5, n_motifs=5,
+                        motif_size=4, motif_frequency=0.2, directed=False, seed=0):
+    """
+    Generates a collection of random labelled graphs with planted motifs
+    :param n_graphs: The number of graphs
+    :param n_nodes: The number of nodes of each graph, before motifs are planted
+    :param density: The probability of an edge between any two nodes
+    :param n_node_labels: The size of the node label alphabet
+    :param n_edge_labels: The size of the edge label alphabet
+    :param n_motifs: The number of planted motifs
+    :param motif_size: The number of nodes of each motif
+    :param motif_frequency: The fraction of graphs each motif is planted in
+    :param directed: Generates DiGraphs rather than Graphs
+    :param seed: The random seed, so that collections are reproducible
+    :return: A tuple of (graphs, motifs)
+    """
+    rng = random.Random(seed)
+    node_labels = ["n%i" % i for i in range(n_node_labels)]
+    edge_labels = ["e%i" % i for i in range(n_edge_labels)]
+    n_nodes = min(n_nodes, n_node_labels)
+
+    graphs = []
+    for i in range(n_graphs):
+        graph = nx.DiGraph(id="g%i" % i) if directed else nx.Graph(id="g%i" % i)
+        nodes = rng.sample(node_labels, n_nodes)
+        graph.add_nodes_from(nodes)
+        for a in range(len(nodes)):
+            for b in range(len(nodes)) if directed else range(a + 1, len(nodes)):
+                if a != b and rng.random() < density:
+                    graph.add_edge(nodes[a], nodes[b], label=rng.choice(edge_labels))
+        graphs.append(graph)
+
+    motifs = []
+    for _ in range(n_motifs):
+        motif = random_motif(rng, node_labels, edge_labels, min(motif_size, n_node_labels), directed)
+        positions = sorted(rng.sample(range(n_graphs), max(1, int(round(motif_frequency * n_graphs)))))
+        for position in positions:
+            graphs[position].add_edges_from(motif.edges(data=True))
+        motifs.append(Motif(motif, positions))
+    return graphs, motifs
+
+
+def write_recording(path, motifs, directed=False):
+    """
+    Writes the output ParSeMiS would give for the planted motifs, with their embeddings, in the .g or .lg format
+    """
+    with open(path, "w") as f:
+        for i, motif in enumerate(motifs):
+            node_ids = {node: n_id for n_id, node in enumerate(motif.graph.nodes())}
+            if directed:
+                f.write("t # %i\n" % i)
+                for node, n_id in node_ids.items():
+                    f.write("v %i %s\n" % (n_id, node))
+                for u, v, label in motif.graph.edges(data='label'):
+                    f.write("e %i %i %s\n" % (node_ids[u], node_ids[v], label))
+                for position in motif.positions:
+                    f.write("#=> g%i\n" % position)
+            else:
+                f.write("XP\n")
+                for node, n_id in node_ids.items():
+                    f.write("v %i %s\n" % (n_id + 1, node))
+                for u, v, label in motif.graph.edges(data='label'):
+                    f.write("u %i %i %s\n" % (node_ids[u] + 1, node_ids[v] + 1, label))
+                f.write("%% => %i[%s]\n" % (len(motif.positions), ",".join(str(p) for p in motif.positions)))
@@ -1,33 +1,20 @@
 """
 This short example shows how you can mine frequent graphs using the wrapper
 """
+from parsemis.dataset import load_collection
 from parsemis.parsemis_wrapper import ParsemisMiner
-import networkx as nx
-import os
+from parsemis.ranking import rank_patterns
 
-# Load our graphs
-graph_folder = "example_dataset"
-graphs = []
-for f in os.listdir(graph_folder):
-    path = "%s/%s" % (graph_folder, f)
-    graphs.append(nx.read_gml(path))
+# Load our graphs, parsing the GML files only on the first run
+graphs = load_collection("example_dataset", "data/example_dataset")
 
-frequent_graphs = ParsemisMiner(
-    "data", minimum_frequency="1%", close_graph=True, store_embeddings=False, debug=True,
-    mine_undirected=True
-).mine_graphs(graphs)
+frequent_graphs = ParsemisMiner("data", debug=True, mine_undirected=True).mine_graphs(
+    graphs, minimum_frequency="1%", close_graph=True
+)
 
-# Count our subgraphs
-frequent_graph_counts = []
-for frequent_graph in frequent_graphs:
-    count = 0
-    for graph in graphs:
-        if graph.graph['id'] in frequent_graph.appears_in:
-            count += 1
-    frequent_graph_counts.append((count, frequent_graph))
-
-for frequent_graph in sorted(frequent_graph_counts, key=lambda subgraph: subgraph[0], reverse=True):
-    if len(frequent_graph[1].graph.edges()) == 0:
-        print("%i - %s" % (frequent_graph[0], frequent_graph[1].graph.nodes()))
+# Rank our subgraphs by support
+for frequent_graph in rank_patterns(frequent_graphs, 'support'):
+    if len(frequent_graph.graph.edges()) == 0:
+        print("%i - %s" % (frequent_graph.support, frequent_graph.graph.nodes()))
     else:
-        print("%i - %s" % (frequent_graph[0], frequent_graph[1].graph.edges()))
+        print("%i - %s" % (frequent_graph.support, frequent_graph.graph.edges()))
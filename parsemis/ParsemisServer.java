@@ -0,0 +1,44 @@
+import java.io.BufferedReader;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+
+/**
+ * Keeps a JVM with ParSeMiS loaded alive between mining runs.
+ *
+ * Each line read from stdin holds the tab separated ParSeMiS arguments for one run, and is answered on stdout with
+ * "OK" or "ERROR message" once the output file has been written. "PING" is answered with "PONG" and "QUIT" stops
+ * the server. ParSeMiS' own output is redirected to stderr so that it doesn't interfere with the protocol, and the
+ * output of each run is ended by an END_OF_RUN line, written before the answer.
+ */
+public class ParsemisServer {
+
+    static final String END_OF_RUN = "ParsemisServer: end of run";
+
+    public static void main(String[] args) throws Exception {
+        PrintStream protocol = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        System.setOut(System.err);
+
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, "UTF-8"));
+        String line;
+        while ((line = in.readLine()) != null) {
+            if (line.equals("PING")) {
+                protocol.println("PONG");
+            } else if (line.equals("QUIT")) {
+                break;
+            } else {
+                String answer = "OK";
+                try {
+                    de.parsemis.Miner.run(line.split("\t"));
+                } catch (Throwable t) {
+                    t.printStackTrace();
+                    answer = "ERROR " + String.valueOf(t).replace('\n', ' ');
+                }
+                System.err.println(END_OF_RUN);
+                System.err.flush();
+                protocol.println(answer);
+            }
+        }
+    }
+}
@@ -0,0 +1,124 @@
+"""
+Mining from asyncio code.
+
+Each job works on an isolated_job copy of the miner, with its own input and output files in a fresh directory under
+data_location, so any number of jobs can share one miner. ParSeMiS runs as an InstrumentedProcess, whose exit is
+awaited rather than waited for, while writing the input and parsing the output run in the loop's default executor,
+so the event loop is never blocked. Each job's RunReport is kept as its result's report, and as the miner's
+last_report. A semaphore on the miner bounds the number of JVMs running at once. With a MemoryScheduler, each job's heap
+is sized to its input and held in the shared memory budget while its JVM runs, as it is for mine_graphs.
+"""
+import asyncio
+import logging as log
+import os
+import shutil
+import tempfile
+
+from parsemis.report import InstrumentedProcess, RunReport
+from parsemis.results import MiningResult
+from parsemis.scheduler import OUT_OF_MEMORY_EXIT_CODE, format_size
+
+
+async def mine_async(miner, graphs, timeout=None, serialization_workers=None, **kwargs):
+    """
+    Mines graphs in an isolated job. See ParsemisMiner.amine_graphs
+    :return: A MiningResult
+    """
+    from parsemis.parsemis_wrapper import FrequentGraph
+
+    loop = asyncio.get_running_loop()
+    slots = miner.job_slots()
+    job_location = tempfile.mkdtemp(dir=miner.data_location)
+    report = miner.last_report = RunReport(miner.metrics)
+    job = miner.isolated_job(job_location)
+    try:
+        with report.phase('write'):
+            await loop.run_in_executor(None, job.write_graph, graphs, serialization_workers)
+        report.bytes_written = os.path.getsize(job.input_file)
+        frequent_graphs = None
+        if job.cache is not None:
+            key = await loop.run_in_executor(None, lambda: job.cache_key(**kwargs))
+            frequent_graphs = await loop.run_in_executor(None, job.cache.get, key, job.graph_index, FrequentGraph)
+        if frequent_graphs is None:
+            with report.phase('mine'):
+                if job.scheduler is None:
+                    async with slots:
+                        await run_async(job.build_commands(**kwargs), timeout, report=report)
+                else:
+                    await run_scheduled(job, slots, timeout, **kwargs)
+            report.bytes_read = os.path.getsize(job.output_file)
+            with report.phase('read'):
+                frequent_graphs = await loop.run_in_executor(None, job.read_graph, job.graph_index)
+            if job.cache is not None:
+                await loop.run_in_executor(None, job.cache.put, key, frequent_graphs, job.graph_index)
+        report.n_fragments = len(frequent_graphs)
+        result = MiningResult(frequent_graphs, job.graph_index)
+        result.report = report.finish()
+        return result
+    finally:
+        shutil.rmtree(job_location, ignore_errors=True)
+
+
+async def run_scheduled(job, slots, timeout=None, **kwargs):
+    """
+    Runs ParSeMiS with the heap the job's MemoryScheduler plans for its input, holding the heap in the scheduler's
+    budget while it runs, and retrying as MemoryScheduler.run does when it runs out of memory
+    :raises MemoryError: If the last retry still ran out of memory
+    """
+    scheduler = job.scheduler
+    heap, minimum_frequency = scheduler.plan(job, **kwargs)
+    for attempt in range(scheduler.max_retries + 1):
+        commands = job.build_commands(**dict(kwargs, heap_size=format_size(heap), minimum_frequency=minimum_frequency))
+        await _acquire(scheduler, heap)
+        try:
+            async with slots:
+                return_code = await run_async(commands, timeout, check=False, report=job.last_report)
+        finally:
+            scheduler.release(heap)
+        if return_code != OUT_OF_MEMORY_EXIT_CODE:
+            if return_code != 0:
+                raise RuntimeError("ParSeMiS exited with code %i" % return_code)
+            return return_code
+        retry = scheduler.retry(job, heap, minimum_frequency)
+        if retry is None:
+            break
+        heap, minimum_frequency = retry
+    raise MemoryError("ParSeMiS ran out of memory with a %s heap" % format_size(heap))
+
+
+async def _acquire(scheduler, heap):
+    """
+    Waits for a heap to fit in the scheduler's budget without blocking the event loop
+    """
+    acquiring = asyncio.get_running_loop().run_in_executor(None, scheduler.acquire, heap)
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        # The wait can't be interrupted, so hand the heap back once it has been reserved
+        acquiring.add_done_callback(lambda _: scheduler.release(heap))
+        raise
+
+
+async def run_async(commands, timeout=None, check=True, report=None):
+    """
+    Runs a command, killing it if it outlives the timeout or the awaiting task is cancelled
+    :param check: Raise RuntimeError if the command exits with a nonzero code, rather than returning the code
+    :param report: The RunReport to capture the command's output and resource usage in
+    :raises asyncio.TimeoutError: If the command didn't finish within the timeout
+    :raises RuntimeError: If the command exited with a nonzero code
+    """
+    loop = asyncio.get_running_loop()
+    process = InstrumentedProcess(commands, report)
+    exited = loop.create_future()
+    process.add_exit_callback(lambda: loop.call_soon_threadsafe(exited.set_result, process.returncode))
+    try:
+        return_code = await asyncio.wait_for(asyncio.shield(exited), timeout)
+    except BaseException:
+        if process.poll() is None:
+            log.warning("Killing ParSeMiS process %i" % process.pid)
+            process.kill()
+            await asyncio.shield(exited)
+        raise
+    if check and return_code != 0:
+        raise RuntimeError("ParSeMiS exited with code %i" % return_code)
+    return return_code
@@ -0,0 +1,75 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+from parsemis.parsemis_wrapper import ParsemisMiner
+from parsemis.pipes_test import PipedStubMiner
+from parsemis.testing import NodeAndEdgeMiner, as_dict, random_graphs
+
+
+class SleepingMiner(ParsemisMiner):
+    """
+    Stands in for a JVM that never finishes, recording its pid
+    """
+
+    def build_commands(self, **kwargs):
+        script = "import os, time; open(%r, 'w').write(str(os.getpid())); time.sleep(60)" % self.pid_file()
+        return [sys.executable, "-c", script]
+
+    def pid_file(self):
+        return "%s/pid" % self.data_location
+
+
+class TestAsyncMining(unittest.TestCase):
+
+    def assertKilled(self, miner):
+        with open(miner.pid_file()) as f:
+            pid = int(f.read())
+        with self.assertRaises(ProcessLookupError):
+            os.kill(pid, 0)
+
+    def test_concurrent_jobs(self):
+        collections = [random_graphs(30, seed) for seed in range(4)]
+        expected = [as_dict(NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs, minimum_frequency=4))
+                    for graphs in collections]
+
+        miner = PipedStubMiner(tempfile.mkdtemp(), max_concurrent_jobs=2)
+
+        async def mine_all():
+            return await asyncio.gather(*[miner.amine_graphs(graphs, minimum_frequency=4) for graphs in collections])
+
+        results = asyncio.run(mine_all())
+        self.assertEqual([as_dict(result) for result in results], expected)
+        self.assertEqual(os.listdir(miner.data_location), [])
+
+    def test_timeout_kills_jvm(self):
+        miner = SleepingMiner(tempfile.mkdtemp())
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(miner.amine_graphs(random_graphs(5), timeout=1))
+        self.assertKilled(miner)
+
+    def test_cancel_kills_jvm(self):
+        miner = SleepingMiner(tempfile.mkdtemp())
+
+        async def cancel():
+            task = asyncio.create_task(miner.amine_graphs(random_graphs(5)))
+            while not os.path.exists(miner.pid_file()):
+                await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancel())
+        self.assertKilled(miner)
+
+    def test_nonzero_exit(self):
+        miner = PipedStubMiner(tempfile.mkdtemp())
+        miner.exit_code = 3
+        with self.assertRaises(RuntimeError):
+            asyncio.run(miner.amine_graphs(random_graphs(5), minimum_frequency=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
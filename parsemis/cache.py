@@ -0,0 +1,104 @@
+"""
+An on-disk, content addressed cache of mining results.
+
+Entries are keyed by a hash of the serialized input file together with the mining parameters, so a repeated run on
+the same collection returns its results without starting Java. Each entry is a directory of results as save_results
+writes them. The least recently used entries are evicted once the cache grows beyond its size or entry limits.
+"""
+import hashlib
+import json
+import logging as log
+import os
+import shutil
+
+from parsemis.storage import load_results, save_results
+
+# Parameters that only affect how ParSeMiS runs, not what it finds
+RUNTIME_PARAMETERS = {'heap_size', 'n_threads', 'distribution'}
+
+
+class ResultCache:
+
+    def __init__(self, directory, max_bytes=None, max_entries=None) -> None:
+        """
+        :param directory: The directory to keep cached results in
+        :param max_bytes: The maximum total size of the cached results
+        :param max_entries: The maximum number of cached results
+        """
+        super().__init__()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(input_file, mine_undirected, parameters):
+        """
+        Hashes a serialized input file together with the normalized mining parameters
+        :return: A hex digest identifying the mining run
+        """
+        digest = hashlib.sha256()
+        with open(input_file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        normalized = {name: str(value) for name, value in parameters.items() if name not in RUNTIME_PARAMETERS}
+        digest.update(json.dumps([mine_undirected, normalized], sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return "%s/%s.results" % (self.directory, key)
+
+    def get(self, key, index, frequent_graph_class):
+        """
+        :return: The cached frequent graphs for a key, or None on a cache miss
+        """
+        path = self._path(key)
+        try:
+            frequent_graphs = list(load_results(path, frequent_graph_class, mmap_mode=None, index=index))
+        except (OSError, ValueError, KeyError):
+            return None
+        os.utime(path)
+        log.debug("Cache hit for %s" % key)
+        return frequent_graphs
+
+    def put(self, key, frequent_graphs, index):
+        """
+        Stores frequent graphs under a key. Results whose labels can't be written as JSON aren't cached
+        :param index: The GraphIndex the supports of the frequent graphs are positions in
+        """
+        try:
+            save_results(self._path(key), frequent_graphs, index)
+        except TypeError as e:
+            log.debug("Not caching %s: %s" % (key, e))
+            return
+        self.evict()
+
+    def _entries(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".results"):
+                yield "%s/%s" % (self.directory, name)
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache is within its limits
+        """
+        entries = []
+        for path in self._entries():
+            try:
+                size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+            except FileNotFoundError:
+                # Evicted or replaced by another process meanwhile
+                continue
+        entries.sort()
+
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and ((self.max_bytes is not None and total_bytes > self.max_bytes) or
+                           (self.max_entries is not None and len(entries) > self.max_entries)):
+            _, size, path = entries.pop(0)
+            shutil.rmtree(path, ignore_errors=True)
+            total_bytes -= size
+
+    def clear(self):
+        for path in list(self._entries()):
+            shutil.rmtree(path, ignore_errors=True)
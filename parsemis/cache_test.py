@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+
+from parsemis.cache import ResultCache
+from parsemis.parsemis_wrapper import ParsemisMiner
+from parsemis.storage import load_results
+from parsemis.testing import NodeAndEdgeMiner
+from parsemis.vocabulary import LabelVocabulary
+
+
+class CountingMiner(ParsemisMiner):
+    """
+    Writes a fixed ParSeMiS output file and counts how often mining was run
+    """
+
+    runs = 0
+    exit_code = 0
+
+    def perform_mining(self, **kwargs):
+        CountingMiner.runs += 1
+        if self.exit_code != 0:
+            return self.exit_code
+        with open(self.output_file, "w") as f:
+            f.write("XP\nv 1 a\nv 2 b\nu 1 2 x\n% => 2[0,2]\nXP\nv 1 c\n% => 1[1]\n")
+        return 0
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        CountingMiner.runs = 0
+        self.cache = ResultCache(tempfile.mkdtemp())
+        self.miner = CountingMiner(tempfile.mkdtemp(), cache=self.cache)
+        self.graphs = []
+        for i in range(3):
+            graph = nx.Graph(id="g%i" % i)
+            graph.add_edge("a", "b", label="x")
+            self.graphs.append(graph)
+
+    def test_hit_skips_mining(self):
+        first = self.miner.mine_graphs(self.graphs, minimum_frequency=1)
+        second = self.miner.mine_graphs(self.graphs, minimum_frequency=1, heap_size="1g")
+
+        self.assertEqual(CountingMiner.runs, 1)
+        self.assertEqual(len(second), 2)
+        for a, b in zip(first, second):
+            self.assertEqual(a.appears_in, b.appears_in)
+            self.assertEqual(sorted(a.graph.edges(data='label')), sorted(b.graph.edges(data='label')))
+
+        self.miner.mine_graphs(self.graphs, minimum_frequency=2)
+        self.assertEqual(CountingMiner.runs, 2)
+
+    def test_entries_are_saved_results(self):
+        first = self.miner.mine_graphs(self.graphs, minimum_frequency=1)
+        entry, = os.listdir(self.cache.directory)
+        stored = load_results(os.path.join(self.cache.directory, entry))
+        self.assertEqual(stored[:], first[:])
+        self.assertEqual(stored.graphs_containing(0), ["g0", "g2"])
+        self.assertEqual(stored.to_string(1), "c")
+
+    def test_hit_keeps_label_types(self):
+        graphs = []
+        for i in range(3):
+            graph = nx.DiGraph(id="g%i" % i)
+            graph.add_edge(1, 2.5, label=(i % 2, "x"))
+            graph.add_edge(2.5, "c")
+            graphs.append(graph)
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp(), cache=self.cache, label_vocabulary=LabelVocabulary())
+        miss = miner.mine_graphs(graphs, minimum_frequency=1)
+        hit = miner.mine_graphs(graphs, minimum_frequency=1)
+
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+        self.assertEqual(len(hit), len(miss))
+        for a, b in zip(miss, hit):
+            self.assertEqual(a.appears_in, b.appears_in)
+            self.assertEqual(list(b.graph.nodes()), list(a.graph.nodes()))
+            self.assertEqual(list(b.graph.edges(data='label')), list(a.graph.edges(data='label')))
+            self.assertEqual([type(node) for node in b.graph.nodes()], [type(node) for node in a.graph.nodes()])
+        self.assertIn(1, {node for fg in hit for node in fg.graph.nodes()})
+
+        # Labels that can't be written as JSON are mined every time rather than cached
+        graphs[0].add_edge("c", object())
+        miner.mine_graphs(graphs, minimum_frequency=1)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+
+    def test_failed_run_is_not_cached(self):
+        self.miner.mine_graphs(self.graphs, minimum_frequency=1)
+        self.miner.exit_code = 3
+        self.assertRaises(RuntimeError, self.miner.mine_graphs, self.graphs, minimum_frequency=2)
+        self.assertFalse(os.path.exists(self.miner.output_file))
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+
+        uncached = CountingMiner(self.miner.data_location)
+        uncached.exit_code = 3
+        self.assertRaises(RuntimeError, uncached.mine_graphs, self.graphs, minimum_frequency=1)
+
+    def test_lru_eviction(self):
+        self.cache.max_entries = 1
+        self.miner.mine_graphs(self.graphs, minimum_frequency=1)
+        self.miner.mine_graphs(self.graphs, minimum_frequency=2)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+
+        self.miner.mine_graphs(self.graphs, minimum_frequency=2)
+        self.assertEqual(CountingMiner.runs, 2)
+        self.miner.mine_graphs(self.graphs, minimum_frequency=1)
+        self.assertEqual(CountingMiner.runs, 3)
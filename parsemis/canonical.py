@@ -0,0 +1,215 @@
+"""
+Canonical codes for fragments, for deduplicating and joining patterns across shards and runs.
+
+Nodes are identified by their labels throughout the wrapper, so when a fragment's node labels are unique it is
+determined exactly by its sorted node labels and sorted (source, target, edge label) triples, and a digest of those
+is a canonical code: two such fragments are isomorphic exactly when their codes are equal.
+
+A CompactGraph read from ParSeMiS can hold several nodes with the same label. Those fragments are coded with a
+label aware Weisfeiler-Lehman hash instead, which isomorphic fragments always share but which very rarely collides,
+so equality of WL coded fragments falls back to an exact isomorphism test.
+
+Labels are compared by their string form, as they are when written for ParSeMiS. Codes are plain strings that are
+stable across processes and runs, so they can be stored and joined on.
+"""
+import hashlib
+import json
+
+import networkx as nx
+
+from parsemis.compact import CompactGraph, NO_LABEL, NONE_LABEL
+from parsemis.support import GraphSupport
+
+EXACT = "c"
+HASHED = "w"
+
+
+def _edge_label(data, attribute_name):
+    if attribute_name not in data:
+        return 0, ""
+    if data[attribute_name] is None:
+        return 1, ""
+    return 2, str(data[attribute_name])
+
+
+def _compact_edge_label(compact, label):
+    if label == NO_LABEL:
+        return 0, ""
+    if label == NONE_LABEL:
+        return 1, ""
+    return 2, str(compact.labels[label])
+
+
+def _has_unique_labels(graph):
+    if isinstance(graph, CompactGraph):
+        return len(set(graph.node_labels.tolist())) == len(graph.node_labels)
+    return True
+
+
+def _exact_code(graph, attribute_name):
+    directed = graph.is_directed()
+    nodes = sorted(str(node) for node in graph.nodes())
+    edges = []
+    for u, v, data in graph.edges(data=True):
+        u, v = str(u), str(v)
+        if not directed and v < u:
+            u, v = v, u
+        edges.append((u, v) + _edge_label(data, attribute_name))
+    edges.sort()
+    text = json.dumps([directed, nodes, edges], separators=(",", ":"))
+    return EXACT + hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def structural_graph(compact):
+    """
+    :return: A NetworkX graph of a CompactGraph with a node per node index rather than per label, with string labels
+    as node and edge attributes
+    """
+    graph = nx.DiGraph() if compact.directed else nx.Graph()
+    labels = compact.labels
+    for i, label in enumerate(compact.node_labels.tolist()):
+        graph.add_node(i, label=str(labels[label]))
+    for (u, v), label in zip(compact.edges_array.tolist(), compact.edge_labels.tolist()):
+        graph.add_edge(u, v, label="%i:%s" % _compact_edge_label(compact, label))
+    return graph
+
+
+def _hashed_code(compact):
+    graph = structural_graph(compact)
+    digest = nx.weisfeiler_lehman_graph_hash(graph, node_attr='label', edge_attr='label', iterations=3)
+    return "%s%i%s" % (HASHED, int(compact.directed), digest)
+
+
+def canonical_code(graph, attribute_name='label'):
+    """
+    :param graph: A NetworkX graph or CompactGraph
+    :return: The canonical code of the graph
+    """
+    if _has_unique_labels(graph):
+        return _exact_code(graph, attribute_name)
+    return _hashed_code(graph)
+
+
+def is_exact(code):
+    return code.startswith(EXACT)
+
+
+def _label_match(a, b):
+    return a.get('label') == b.get('label')
+
+
+def equivalent(a, b):
+    """
+    :param a: A FrequentGraph
+    :param b: A FrequentGraph
+    :return: True if the two fragments are isomorphic
+    """
+    if a.canonical_code != b.canonical_code:
+        return False
+    if is_exact(a.canonical_code):
+        return True
+    return nx.is_isomorphic(structural_graph(a.compact), structural_graph(b.compact),
+                            node_match=_label_match, edge_match=_label_match)
+
+
+class PatternSet:
+    """
+    A set of fragments up to isomorphism, bucketed by canonical code so that adding and looking up a fragment takes
+    constant time
+    """
+
+    def __init__(self, frequent_graphs=()) -> None:
+        super().__init__()
+        self._buckets = {}
+        self._size = 0
+        for frequent_graph in frequent_graphs:
+            self.add(frequent_graph)
+
+    def _find(self, frequent_graph):
+        bucket = self._buckets.get(frequent_graph.canonical_code)
+        if bucket is None:
+            return None, None
+        if is_exact(frequent_graph.canonical_code):
+            return bucket, bucket[0]
+        for member in bucket:
+            if equivalent(member, frequent_graph):
+                return bucket, member
+        return bucket, None
+
+    def add(self, frequent_graph):
+        """
+        :return: The fragment already in the set that is isomorphic to this one, or else this one, once added
+        """
+        bucket, member = self._find(frequent_graph)
+        if member is not None:
+            return member
+        if bucket is None:
+            self._buckets[frequent_graph.canonical_code] = [frequent_graph]
+        else:
+            bucket.append(frequent_graph)
+        self._size += 1
+        return frequent_graph
+
+    def get(self, frequent_graph, default=None):
+        """
+        :return: The fragment in the set that is isomorphic to this one, or default
+        """
+        member = self._find(frequent_graph)[1]
+        return default if member is None else member
+
+    def __contains__(self, frequent_graph):
+        return self._find(frequent_graph)[1] is not None
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for bucket in self._buckets.values():
+            yield from bucket
+
+
+def dedupe(frequent_graphs):
+    """
+    :return: The fragments with every isomorphic repeat dropped, keeping the first of each
+    """
+    return list(PatternSet(frequent_graphs))
+
+
+def merge(*collections):
+    """
+    Merges fragments found in several collections (such as the shards of one collection) into one fragment per
+    pattern, whose support is the union of the supports of the pattern in every collection
+    :return: A list of FrequentGraph objects
+    """
+    patterns = PatternSet()
+    supports = {}
+    for collection in collections:
+        for frequent_graph in collection:
+            member = patterns.add(frequent_graph)
+            supports.setdefault(id(member), []).append(frequent_graph.appears_in)
+
+    merged = []
+    for member in patterns:
+        parts = supports[id(member)]
+        support = parts[0]
+        for part in parts[1:]:
+            if isinstance(support, GraphSupport) and isinstance(part, GraphSupport) and support.index is part.index:
+                support = support | part
+            else:
+                support = sorted(set(support) | set(part), key=str)
+        merged.append(type(member)(member.compact, support))
+    return merged
+
+
+def join(left, right):
+    """
+    Pairs up the fragments of two results, such as the results of two runs, that are the same pattern
+    :return: A list of (left fragment, right fragment) tuples, in the order of right
+    """
+    patterns = PatternSet(left)
+    pairs = []
+    for frequent_graph in right:
+        member = patterns.get(frequent_graph)
+        if member is not None:
+            pairs.append((member, frequent_graph))
+    return pairs
@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+
+import networkx as nx
+
+from parsemis.canonical import PatternSet, canonical_code, dedupe, join, merge
+from parsemis.compact import CompactGraph
+from parsemis.parsemis_wrapper import FrequentGraph
+from parsemis.testing import NodeAndEdgeMiner, random_graphs
+
+
+def graph_of(edges, graph_class=nx.Graph):
+    graph = graph_class()
+    for u, v, label in edges:
+        graph.add_edge(u, v, label=label)
+    return graph
+
+
+class TestCanonicalCodes(unittest.TestCase):
+
+    def test_exact_codes(self):
+        a = graph_of([("a", "b", "x"), ("b", "c", "y")])
+        b = graph_of([("c", "b", "y"), ("b", "a", "x")])
+        self.assertEqual(canonical_code(a), canonical_code(b))
+        self.assertEqual(canonical_code(a), canonical_code(CompactGraph.from_networkx(b)))
+        self.assertNotEqual(canonical_code(a), canonical_code(graph_of([("a", "b", "y"), ("b", "c", "x")])))
+        self.assertNotEqual(canonical_code(a), canonical_code(graph_of([("a", "b", "x"), ("b", "c", None)])))
+
+        directed = graph_of([("a", "b", "x")], nx.DiGraph)
+        self.assertNotEqual(canonical_code(directed), canonical_code(graph_of([("b", "a", "x")], nx.DiGraph)))
+        self.assertNotEqual(canonical_code(directed), canonical_code(graph_of([("a", "b", "x")])))
+
+    def test_repeated_labels(self):
+        # a path a - b - a, with its nodes in different orders, and a different fragment over the same labels
+        labels = ["a", "b"]
+        path = CompactGraph.from_lists(labels, [0, 1, 0], [0, 1, 1, 2], [-1, -1])
+        reordered = CompactGraph.from_lists(labels, [1, 0, 0], [1, 0, 0, 2], [-1, -1])
+        other = CompactGraph.from_lists(labels, [0, 0, 1], [0, 1, 1, 2], [-1, -1])
+
+        self.assertEqual(FrequentGraph(path, []), FrequentGraph(reordered, []))
+        self.assertNotEqual(FrequentGraph(path, []), FrequentGraph(other, []))
+        self.assertEqual(hash(FrequentGraph(path, [])), hash(FrequentGraph(reordered, [])))
+        self.assertEqual(len({FrequentGraph(path, []), FrequentGraph(reordered, []), FrequentGraph(other, [])}), 2)
+
+    def test_dedupe_merge_join(self):
+        graphs = random_graphs(60, seed=5)
+        full = NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs, minimum_frequency=1)
+        first = NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs[:30], minimum_frequency=1)
+        second = NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs[30:], minimum_frequency=1)
+
+        self.assertEqual(len(dedupe(list(full) + list(first) + list(full))), len(full))
+
+        merged = {frequent_graph: set(frequent_graph.appears_in) for frequent_graph in merge(first, second)}
+        self.assertEqual(merged, {frequent_graph: set(frequent_graph.appears_in) for frequent_graph in full})
+
+        pairs = join(first, full)
+        self.assertEqual(len(pairs), len(first))
+        for left, right in pairs:
+            self.assertEqual(left.canonical_code, right.canonical_code)
+
+        patterns = PatternSet(first)
+        self.assertEqual(len(patterns), len(first))
+        self.assertTrue(all(frequent_graph in patterns for frequent_graph in first))
+        self.assertIs(patterns.add(FrequentGraph(first[0].graph, [])), first[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
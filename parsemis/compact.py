@@ -0,0 +1,156 @@
+"""
+A compact, read only representation of mined fragments.
+
+A CompactGraph holds a fragment as three small numpy arrays (the label id of each node, the pairs of node indices of
+each edge, and the label id of each edge) plus a reference to the label table the ids index into, which is shared by
+every fragment of a result. That is a fraction of the memory and allocations of a NetworkX graph.
+
+It answers the read only part of the NetworkX graph API that the wrapper uses (nodes(), edges(data=...),
+get_edge_data(), is_directed() and so on), with nodes identified by their labels as they are in the NetworkX graphs,
+so the similarity and containment helpers work on it directly. to_networkx builds the equivalent NetworkX graph, a
+multigraph when the graph was built from one.
+"""
+import networkx as nx
+import numpy as np
+
+from parsemis.vocabulary import LabelVocabulary
+
+# Edge label ids for an edge whose label is None, and for an edge without a label attribute at all
+NONE_LABEL = -1
+NO_LABEL = -2
+
+
+class CompactGraph:
+
+    __slots__ = ('labels', 'node_labels', 'edges_array', 'edge_labels', 'directed', 'graph_id', 'multigraph')
+
+    def __init__(self, labels, node_labels, edges, edge_labels, directed=False, graph_id=None,
+                 multigraph=False) -> None:
+        """
+        :param labels: The label table, a list that the label ids index into
+        :param node_labels: An int32 array of the label id of each node
+        :param edges: An int32 array of shape (n_edges, 2), of the node indices of each edge
+        :param edge_labels: An int32 array of the label id of each edge, or NONE_LABEL or NO_LABEL
+        :param directed: Whether the edges are directed
+        :param graph_id: The id of the fragment
+        :param multigraph: Whether the graph may have parallel edges, as a NetworkX MultiGraph or MultiDiGraph
+        """
+        super().__init__()
+        self.labels = labels
+        self.node_labels = node_labels
+        self.edges_array = edges
+        self.edge_labels = edge_labels
+        self.directed = directed
+        self.graph_id = graph_id
+        self.multigraph = multigraph
+
+    @staticmethod
+    def from_lists(labels, node_labels, edges, edge_labels, directed=False, graph_id=None, multigraph=False):
+        """
+        :param edges: A flat list of source and target node indices
+        """
+        return CompactGraph(labels, np.array(node_labels, dtype=np.int32),
+                            np.array(edges, dtype=np.int32).reshape(-1, 2),
+                            np.array(edge_labels, dtype=np.int32), directed, graph_id, multigraph)
+
+    @staticmethod
+    def from_networkx(graph, labels=None, attribute_name='label'):
+        """
+        :param labels: A LabelVocabulary to add the labels to, or None for a vocabulary of the graph's own
+        """
+        if labels is None:
+            labels = LabelVocabulary()
+        nodes = {node: i for i, node in enumerate(graph.nodes())}
+        edges, edge_labels = [], []
+        for u, v, data in graph.edges(data=True):
+            edges.extend((nodes[u], nodes[v]))
+            if attribute_name not in data:
+                edge_labels.append(NO_LABEL)
+            elif data[attribute_name] is None:
+                edge_labels.append(NONE_LABEL)
+            else:
+                edge_labels.append(labels.encode(data[attribute_name]))
+        return CompactGraph.from_lists(labels.labels, [labels.encode(node) for node in nodes], edges, edge_labels,
+                                       nx.is_directed(graph), graph.graph.get('id'), graph.is_multigraph())
+
+    def to_networkx(self, attribute_name='label'):
+        if self.multigraph:
+            graph = nx.MultiDiGraph(id=self.graph_id) if self.directed else nx.MultiGraph(id=self.graph_id)
+        else:
+            graph = nx.DiGraph(id=self.graph_id) if self.directed else nx.Graph(id=self.graph_id)
+        graph.add_nodes_from(self.nodes())
+        for u, v, label in self._edges():
+            if label == NO_LABEL:
+                graph.add_edge(u, v)
+            else:
+                graph.add_edge(u, v, **{attribute_name: None if label == NONE_LABEL else self.labels[label]})
+        return graph
+
+    def _edges(self):
+        labels = self.labels
+        node_labels = self.node_labels.tolist()
+        for (u, v), label in zip(self.edges_array.tolist(), self.edge_labels.tolist()):
+            yield labels[node_labels[u]], labels[node_labels[v]], label
+
+    @property
+    def graph(self):
+        """
+        :return: The graph attributes, as NetworkX graphs have them, so that the writers can serialize a CompactGraph
+        """
+        return {} if self.graph_id is None else {'id': self.graph_id}
+
+    def is_directed(self):
+        return self.directed
+
+    def is_multigraph(self):
+        return self.multigraph
+
+    def nodes(self):
+        """
+        :return: The node labels, without repeats
+        """
+        labels = self.labels
+        return list(dict.fromkeys(labels[label] for label in self.node_labels.tolist()))
+
+    def edges(self, data=False, default=None):
+        """
+        As networkx.Graph.edges, but returning a list of edges between node labels
+        """
+        edges = []
+        for u, v, label in self._edges():
+            if data is False:
+                edges.append((u, v))
+            elif label == NO_LABEL:
+                edges.append((u, v, {} if data is True else default))
+            else:
+                value = None if label == NONE_LABEL else self.labels[label]
+                edges.append((u, v, {'label': value} if data is True else value if data == 'label' else default))
+        return edges
+
+    def has_edge(self, u, v):
+        return self.get_edge_data(u, v) is not None
+
+    def get_edge_data(self, u, v, default=None):
+        """
+        As networkx.Graph.get_edge_data: the attributes of the edge from u to v, or of a multigraph a dict of each
+        parallel edge's attributes
+        """
+        found = {}
+        for a, b, data in self.edges(data=True):
+            if (a == u and b == v) or (not self.directed and a == v and b == u):
+                found[len(found)] = data
+        if not found:
+            return default
+        return found if self.multigraph else found[len(found) - 1]
+
+    def number_of_nodes(self):
+        return len(self.nodes())
+
+    def number_of_edges(self):
+        return len(self.edge_labels)
+
+    def __len__(self):
+        return self.number_of_nodes()
+
+    def __repr__(self):
+        return "CompactGraph(nodes=%s, edges=%s)" % (self.nodes(), self.edges(data='label'))
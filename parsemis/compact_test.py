@@ -0,0 +1,92 @@
+import random
+import tempfile
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from parsemis.compact import CompactGraph
+from parsemis.parsemis_wrapper import FrequentGraph, ParsemisMiner
+from parsemis.testing import NodeAndEdgeMiner, random_graphs, random_mixed_graphs
+
+
+def edge_set(graph):
+    return {(frozenset((u, v)), data.get('label', 'missing')) for u, v, data in graph.edges(data=True)}
+
+
+class TestCompactGraph(unittest.TestCase):
+
+    def test_networkx_round_trip(self):
+        for graph_class in (nx.Graph, nx.DiGraph, nx.MultiGraph, nx.MultiDiGraph):
+            graph = graph_class(id=7)
+            graph.add_edge("a", "b", label="x")
+            graph.add_edge("a", "b", label="y")
+            graph.add_edge("b", "c", label=None)
+            graph.add_edge("c", "d")
+            graph.add_node("e")
+
+            compact = CompactGraph.from_networkx(graph)
+            self.assertEqual(compact.nodes(), ["a", "b", "c", "d", "e"])
+            self.assertEqual(compact.number_of_edges(), graph.number_of_edges())
+            self.assertEqual(compact.is_directed(), graph.is_directed())
+            self.assertEqual(compact.is_multigraph(), graph.is_multigraph())
+            self.assertEqual(compact.edges(data='label'), list(graph.edges(data='label')))
+            self.assertEqual(compact.edges(data=True), list(graph.edges(data=True)))
+
+            converted = compact.to_networkx()
+            self.assertEqual(type(converted), graph_class)
+            self.assertEqual(converted.graph['id'], 7)
+            self.assertEqual(list(converted.edges(data=True)), list(graph.edges(data=True)))
+
+    def test_read_is_compact_and_lazy(self):
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+        result = miner.mine_graphs(random_graphs(30), minimum_frequency=3)
+        for frequent_graph in result:
+            compact = frequent_graph.compact
+            self.assertIsInstance(compact, CompactGraph)
+            self.assertIs(compact.labels, result[0].compact.labels)
+            self.assertIsNone(frequent_graph._graph)
+            graph = frequent_graph.graph
+            self.assertIsInstance(graph, nx.Graph)
+            self.assertIs(frequent_graph.graph, graph)
+            self.assertEqual(set(graph.nodes()), set(compact.nodes()))
+            self.assertEqual(edge_set(graph), edge_set(compact))
+            self.assertEqual(frequent_graph.to_string(), FrequentGraph(graph, None).to_string())
+
+    def test_helpers_on_compact(self):
+        graphs = random_graphs(40, seed=3)
+        result = NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs, minimum_frequency=3)
+        as_networkx = [frequent_graph.graph for frequent_graph in result]
+        compact = [FrequentGraph(frequent_graph.compact, None) for frequent_graph in result]
+
+        np.testing.assert_array_equal(ParsemisMiner.contains_many(compact, graphs),
+                                      ParsemisMiner.contains_many(as_networkx, graphs))
+        np.testing.assert_allclose(ParsemisMiner.calculate_dot_product_similarity_matrix(compact, graphs),
+                                   ParsemisMiner.calculate_dot_product_similarity_matrix(as_networkx, graphs))
+        np.testing.assert_allclose(ParsemisMiner.calculate_jaccard_similarity_matrix(compact, graphs),
+                                   ParsemisMiner.calculate_jaccard_similarity_matrix(as_networkx, graphs))
+
+        for frequent_graph in result[:20]:
+            for graph in graphs[:10]:
+                self.assert_same_helpers(frequent_graph.compact, frequent_graph.graph, graph)
+
+    def test_pairwise_helpers_on_compact(self):
+        rng = random.Random(5)
+        for graph_class in (nx.Graph, nx.DiGraph, nx.MultiGraph, nx.MultiDiGraph):
+            graphs = random_mixed_graphs(graph_class, 10, rng)
+            for pattern in graphs:
+                for graph in graphs:
+                    self.assert_same_helpers(CompactGraph.from_networkx(pattern), pattern, graph)
+                    self.assertEqual(ParsemisMiner.is_subgraph(CompactGraph.from_networkx(graph), pattern),
+                                     ParsemisMiner.is_subgraph(graph, pattern))
+
+    def assert_same_helpers(self, compact, pattern, graph):
+        self.assertEqual(ParsemisMiner.is_subgraph(graph, compact), ParsemisMiner.is_subgraph(graph, pattern))
+        self.assertEqual(ParsemisMiner.calculate_dot_product_similarity(compact, graph),
+                         ParsemisMiner.calculate_dot_product_similarity(pattern, graph))
+        self.assertEqual(ParsemisMiner.calculate_jaccard_similarity(compact, graph),
+                         ParsemisMiner.calculate_jaccard_similarity(pattern, graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Labelled subgraph containment.
+
+Nodes are identified by their keys, as in the rest of the wrapper, so a pattern appears in a graph when all of its
+nodes do, and every one of its edges is matched by an edge between the same nodes that shares one of its labels
+(or when neither edge has a label). These are the semantics of ParsemisMiner.graph_has_edge.
+
+ContainmentIndex precomputes a node set and a (u, v, label) edge set per graph, plus posting lists from each of those
+features to the graphs that have them, so a check is a handful of set lookups and a bulk check starts from the
+graphs that share the pattern's rarest feature.
+"""
+import networkx as nx
+import numpy as np
+
+from parsemis.compact import CompactGraph
+
+
+def _edge_features(graph, attribute_name, both_directions):
+    """
+    :return: A dict of (u, v) -> the set of features of the edges between u and v
+    """
+    pairs = {}
+    for u, v, data in graph.edges(data=True):
+        pairs.setdefault((u, v), [])
+        if attribute_name in data:
+            pairs[(u, v)].append(data[attribute_name])
+
+    features = {}
+    for (u, v), labels in pairs.items():
+        for a, b in ((u, v), (v, u)) if both_directions else ((u, v),):
+            if len(labels) == 0:
+                features.setdefault((a, b), set()).add((a, b, False, None))
+            else:
+                features.setdefault((a, b), set()).update((a, b, True, label) for label in labels)
+    return features
+
+
+class ContainmentIndex:
+    """
+    Node and labelled edge sets for a collection of graphs, for repeated subgraph checks against them
+    """
+
+    def __init__(self, graphs, attribute_name='label') -> None:
+        super().__init__()
+        self.attribute_name = attribute_name
+        self._nodes = []
+        self._edges = []
+        self._postings = {}
+        for position, graph in enumerate(graphs):
+            nodes = frozenset(graph.nodes())
+            edges = set()
+            for features in _edge_features(graph, attribute_name, not nx.is_directed(graph)).values():
+                edges.update(features)
+            self._nodes.append(nodes)
+            self._edges.append(frozenset(edges))
+            for feature in nodes:
+                self._postings.setdefault(('n', feature), set()).add(position)
+            for feature in edges:
+                self._postings.setdefault(('e',) + feature, set()).add(position)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def _requirements(self, pattern):
+        """
+        Breaks a pattern into its nodes, and for each edge the features of which any one has to be present
+        """
+        if not isinstance(pattern, (nx.Graph, CompactGraph)):
+            pattern = pattern.compact
+        edges = _edge_features(pattern, self.attribute_name, False).values()
+        return set(pattern.nodes()), list(edges)
+
+    def contains(self, position, pattern):
+        """
+        :param position: The position of a graph in the index
+        :param pattern: A NetworkX graph, CompactGraph or FrequentGraph
+        :return: True if the pattern is a subgraph of the graph
+        """
+        nodes, edges = self._requirements(pattern)
+        graph_edges = self._edges[position]
+        return nodes <= self._nodes[position] and all(not features.isdisjoint(graph_edges) for features in edges)
+
+    def containing(self, pattern):
+        """
+        :param pattern: A NetworkX graph, CompactGraph or FrequentGraph
+        :return: The sorted positions of the graphs that contain the pattern
+        """
+        nodes, edges = self._requirements(pattern)
+        candidates = [self._postings.get(('n', node), set()) for node in nodes]
+        for features in edges:
+            candidates.append(set().union(*[self._postings.get(('e',) + feature, set()) for feature in features]))
+        if len(candidates) == 0:
+            return np.arange(len(self), dtype=np.int32)
+        candidates.sort(key=len)
+        positions = set(candidates[0]).intersection(*candidates[1:])
+        return np.array(sorted(positions), dtype=np.int32)
+
+    def contains_many(self, patterns):
+        """
+        :param patterns: NetworkX graphs, CompactGraphs or FrequentGraph objects
+        :return: A boolean matrix of shape (len(patterns), len(index)), True where a pattern is in a graph
+        """
+        patterns = list(patterns)
+        matrix = np.zeros((len(patterns), len(self)), dtype=bool)
+        for i, pattern in enumerate(patterns):
+            matrix[i, self.containing(pattern)] = True
+        return matrix
+
+
+def contains_many(patterns, graphs, attribute_name='label'):
+    """
+    :return: A boolean matrix of shape (len(patterns), len(graphs)), True where a pattern is a subgraph of a graph
+    """
+    return ContainmentIndex(graphs, attribute_name).contains_many(patterns)
+
+
+def edge_key(u, v, label, directed):
+    if directed:
+        return u, v, label
+    return frozenset((u, v)), label
+
+
+def written_sets(graph, directed, attribute_name='label'):
+    """
+    Builds the node set and labelled edge set of a graph as it is written for ParSeMiS, where nodes and labels are
+    compared by their string form. Used to match fragments read back from ParSeMiS against input graphs.
+    :return: A tuple of (nodes, edges)
+    """
+    nodes = frozenset(str(node) for node in graph.nodes())
+    edges = set()
+    for u, v, data in graph.edges(data=True):
+        if attribute_name in data:
+            label = data[attribute_name]
+            edges.add(edge_key(str(u), str(v), None if label is None else str(label), directed))
+    return nodes, frozenset(edges)
+
+
+def pattern_key(pattern, directed):
+    """
+    A key identifying a fragment. Fragment nodes are identified by their labels, so two fragments are the same when
+    their node and labelled edge sets are
+    """
+    return written_sets(pattern, directed)
+
+
+def contains(sets, pattern_sets):
+    """
+    :param sets: The (nodes, edges) sets of a graph
+    :param pattern_sets: The (nodes, edges) sets of a fragment
+    :return: True if the fragment appears in the graph
+    """
+    return pattern_sets[0] <= sets[0] and pattern_sets[1] <= sets[1]
@@ -0,0 +1,30 @@
+import random
+import unittest
+
+import networkx as nx
+
+from parsemis.containment import ContainmentIndex
+from parsemis.parsemis_wrapper import ParsemisMiner
+from parsemis.testing import random_mixed_graphs
+
+
+class TestContainmentIndex(unittest.TestCase):
+
+    def test_matches_is_subgraph(self):
+        rng = random.Random(2)
+        for graph_class in [nx.Graph, nx.DiGraph, nx.MultiGraph, nx.MultiDiGraph]:
+            graphs = random_mixed_graphs(graph_class, 30, rng)
+            patterns = [nx.edge_subgraph(graph, list(graph.edges)[:2]).copy() for graph in graphs[:10]]
+            patterns += random_mixed_graphs(graph_class, 10, rng)
+
+            matrix = ParsemisMiner.contains_many(patterns, graphs)
+            index = ContainmentIndex(graphs)
+            for i, pattern in enumerate(patterns):
+                for j, graph in enumerate(graphs):
+                    self.assertEqual(matrix[i, j], ParsemisMiner.is_subgraph(graph, pattern))
+                    self.assertEqual(index.contains(j, pattern), matrix[i, j])
+            self.assertTrue(matrix[range(10), range(10)].all())
+
+    def test_empty_pattern(self):
+        index = ContainmentIndex([nx.Graph(), nx.Graph()])
+        self.assertEqual(index.containing(nx.Graph()).tolist(), [0, 1])
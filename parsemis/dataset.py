@@ -0,0 +1,307 @@
+"""
+Loading graph collections from directories of graph files into a binary store.
+
+Parsing GML or GraphML is far slower than mining small graphs, so a collection is parsed once, by a process pool,
+and compiled into a GraphStore: a directory holding the label vocabulary as JSON, and the graphs as a handful of
+.npy arrays in CSR layout. Per graph offsets index into flat arrays of node label codes, edges as pairs of node
+indices, and edge label codes, so loading the store again only memory maps the arrays. Whether each graph is
+directed, and whether it is a multigraph, are kept as flags, so to_networkx gives back graphs of the classes read.
+
+A GraphStore is a sequence of CompactGraph objects, which the writers serialize directly, so a stored collection is
+mined without building any NetworkX graphs. load_collection compiles a directory on first use and reuses the store
+until the files in the directory change. Compiling only ever replaces a directory that holds a graph store.
+"""
+import hashlib
+import json
+import logging as log
+import os
+import shutil
+import tempfile
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+
+from parsemis.compact import CompactGraph
+from parsemis.vocabulary import LabelVocabulary
+
+STORE_VERSION = 2
+STORE_FORMAT = 'graph_store'
+ARRAYS = ('directed', 'multigraph', 'node_offsets', 'node_labels', 'edge_offsets', 'edges', 'edge_labels')
+
+
+def read_edge_list(path):
+    """
+    Reads an edge list of "source target [label]" lines
+    """
+    graph = nx.Graph()
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 0 or parts[0].startswith("#"):
+                continue
+            if len(parts) > 2:
+                graph.add_edge(parts[0], parts[1], label=" ".join(parts[2:]))
+            else:
+                graph.add_edge(parts[0], parts[1])
+    return graph
+
+
+READERS = {
+    '.gml': nx.read_gml,
+    '.graphml': nx.read_graphml,
+    '.edgelist': read_edge_list,
+    '.edges': read_edge_list,
+}
+
+
+def read_graph_file(path):
+    """
+    Reads a graph file with the reader for its extension. Graphs without an id are given their file name
+    :return: A NetworkX graph
+    """
+    name, extension = os.path.splitext(os.path.basename(path))
+    reader = READERS.get(extension.lower())
+    if reader is None:
+        raise ValueError("No reader for graph file %s" % path)
+    graph = reader(path)
+    graph.graph.setdefault('id', name)
+    return graph
+
+
+def list_graph_files(directory):
+    """
+    :return: The paths of the graph files in a directory that have a reader, sorted by name
+    """
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if os.path.splitext(name)[1].lower() in READERS]
+
+
+def source_fingerprint(paths):
+    """
+    :return: A hex digest of the names, sizes and modification times of some files
+    """
+    stats = []
+    for path in paths:
+        stat = os.stat(path)
+        stats.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return hashlib.sha256(json.dumps(stats).encode("utf-8")).hexdigest()
+
+
+def _compile_chunk(paths, attribute_name='label'):
+    """
+    Reads a chunk of graph files into arrays whose label codes index into the chunk's own label list, so that only
+    arrays and the chunk's labels are sent back from a worker
+    """
+    labels = LabelVocabulary()
+    ids, directed, multigraph, node_counts, node_labels, edge_counts, edges, edge_labels = \
+        [], [], [], [], [], [], [], []
+    for path in paths:
+        compact = CompactGraph.from_networkx(read_graph_file(path), labels, attribute_name)
+        ids.append(compact.graph_id)
+        directed.append(compact.directed)
+        multigraph.append(compact.multigraph)
+        node_counts.append(len(compact.node_labels))
+        node_labels.append(compact.node_labels)
+        edge_counts.append(len(compact.edge_labels))
+        edges.append(compact.edges_array)
+        edge_labels.append(compact.edge_labels)
+    return (labels.labels, ids, directed, multigraph, node_counts, np.concatenate(node_labels), edge_counts,
+            np.concatenate(edges), np.concatenate(edge_labels))
+
+
+def count_offsets(counts):
+    """
+    :return: An int64 array of the offset of each of a run of slices of the given lengths, and of their end
+    """
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def concatenate_arrays(arrays, dtype):
+    """
+    :return: The arrays concatenated as dtype, or an empty array if there are none
+    """
+    if len(arrays) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate(arrays).astype(dtype)
+
+
+def label_codes(vocabulary, labels):
+    """
+    :return: An int32 array of the code in vocabulary of each label of a label list, to remap label ids with
+    """
+    return np.array([vocabulary.encode(label) for label in labels] or [0], dtype=np.int32)
+
+
+def edge_label_codes(edge_labels, codes):
+    # Negative edge label ids mark unlabelled edges and stay as they are
+    return np.where(edge_labels >= 0, codes[np.maximum(edge_labels, 0)], edge_labels).astype(np.int32)
+
+
+def _is_store(meta):
+    # Stores of the first version didn't record their format, and are told apart from saved results by their source
+    return 'source' in meta
+
+
+def read_meta(path, format_name=STORE_FORMAT, unrecorded=_is_store):
+    """
+    :param format_name: The format the directory has to hold
+    :param unrecorded: A function of metadata that doesn't record its format, that's True if it's of format_name
+    :return: The metadata of the arrays in a directory, or None if it holds none of format_name
+    """
+    try:
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict):
+        return None
+    if meta.get('format', format_name if unrecorded(meta) else None) != format_name:
+        return None
+    return meta
+
+
+def write_arrays(path, arrays, vocabulary, meta):
+    """
+    Writes arrays as .npy files to a new directory, with the vocabulary and metadata as JSON, and moves it to path,
+    replacing the directory there
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    temporary = tempfile.mkdtemp(dir=parent)
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(temporary, "%s.npy" % name), array)
+        vocabulary.save(os.path.join(temporary, "labels.json"))
+        with open(os.path.join(temporary, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(temporary, path)
+    except BaseException:
+        shutil.rmtree(temporary, ignore_errors=True)
+        raise
+
+
+class GraphStore(Sequence):
+    """
+    A collection of graphs compiled into memory mapped arrays. Indexing it gives a CompactGraph, whose arrays are
+    views of the store
+    """
+
+    def __init__(self, path, mmap_mode='r') -> None:
+        """
+        :param path: The directory of the store
+        :param mmap_mode: The mode the arrays are memory mapped with, or None to read them into memory
+        """
+        super().__init__()
+        self.path = path
+        meta = read_meta(path)
+        if meta is None:
+            raise ValueError("%s is not a graph store" % path)
+        if meta['version'] != STORE_VERSION:
+            raise ValueError("Graph store %s has version %s, expected %i" % (path, meta['version'], STORE_VERSION))
+        self.ids = meta['ids']
+        self.source = meta.get('source')
+        self.vocabulary = LabelVocabulary.load(os.path.join(path, "labels.json"))
+        arrays = {name: np.load(os.path.join(path, "%s.npy" % name), mmap_mode=mmap_mode) for name in ARRAYS}
+        self.directed = arrays['directed']
+        self.multigraph = arrays['multigraph']
+        self.node_offsets = arrays['node_offsets']
+        self.node_labels = arrays['node_labels']
+        self.edge_offsets = arrays['edge_offsets']
+        self.edges = arrays['edges']
+        self.edge_labels = arrays['edge_labels']
+
+    @staticmethod
+    def compile(paths, path, n_workers=None, chunk_size=256, source=None, attribute_name='label'):
+        """
+        Reads graph files, across a process pool, and writes them to a new store, replacing any store at path. Any
+        other file or directory at path is left alone, and raises a FileExistsError
+        :param paths: The graph files, in the order of the collection
+        :param path: The directory to write the store to
+        :param n_workers: The number of processes reading files, defaults to the number of CPUs
+        :param chunk_size: The number of files each process reads at once
+        :param source: A fingerprint of the files, to tell whether the store is up to date
+        :return: The GraphStore
+        """
+        if os.path.exists(path) and read_meta(path) is None:
+            raise FileExistsError("%s exists and is not a graph store" % path)
+        chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+        vocabulary = LabelVocabulary()
+        ids, directed, multigraph, node_counts, node_labels, edge_counts, edges, edge_labels = \
+            [], [], [], [], [], [], [], []
+        with ProcessPoolExecutor(n_workers) as executor:
+            for chunk in executor.map(_compile_chunk, chunks, [attribute_name] * len(chunks)):
+                chunk_labels, chunk_ids, chunk_directed, chunk_multigraph, chunk_node_counts, chunk_node_labels, \
+                    chunk_edge_counts, chunk_edges, chunk_edge_labels = chunk
+                codes = label_codes(vocabulary, chunk_labels)
+                ids.extend(chunk_ids)
+                directed.extend(chunk_directed)
+                multigraph.extend(chunk_multigraph)
+                node_counts.extend(chunk_node_counts)
+                node_labels.append(codes[chunk_node_labels])
+                edge_counts.extend(chunk_edge_counts)
+                edges.append(chunk_edges)
+                edge_labels.append(edge_label_codes(chunk_edge_labels, codes))
+
+        arrays = {
+            'directed': np.array(directed, dtype=bool),
+            'multigraph': np.array(multigraph, dtype=bool),
+            'node_offsets': count_offsets(node_counts),
+            'node_labels': concatenate_arrays(node_labels, np.int32),
+            'edge_offsets': count_offsets(edge_counts),
+            'edges': concatenate_arrays(edges, np.int32).reshape(-1, 2),
+            'edge_labels': concatenate_arrays(edge_labels, np.int32),
+        }
+        write_arrays(path, arrays, vocabulary,
+                      {'format': STORE_FORMAT, 'version': STORE_VERSION, 'ids': ids, 'source': source})
+        log.debug("Compiled %i graphs into %s" % (len(ids), path))
+        return GraphStore(path)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("Graph store index out of range")
+        nodes = slice(self.node_offsets[item], self.node_offsets[item + 1])
+        edges = slice(self.edge_offsets[item], self.edge_offsets[item + 1])
+        return CompactGraph(self.vocabulary.labels, self.node_labels[nodes], self.edges[edges],
+                            self.edge_labels[edges], bool(self.directed[item]), self.ids[item],
+                            bool(self.multigraph[item]))
+
+    def to_networkx(self):
+        """
+        :return: A list of the graphs as NetworkX graphs
+        """
+        return [graph.to_networkx() for graph in self]
+
+
+def load_collection(source, store_path=None, n_workers=None, chunk_size=256):
+    """
+    Loads a directory of graph files, compiling it into a GraphStore the first time, and whenever a file has been
+    added, removed or modified since
+    :param source: The directory of graph files
+    :param store_path: The directory of the store, defaults to a "<source>.store" directory next to source
+    :param n_workers: The number of processes reading files when compiling
+    :return: A GraphStore of the graphs, in the order of their file names
+    """
+    if store_path is None:
+        store_path = os.path.join(os.path.dirname(os.path.abspath(source)),
+                                  "%s.store" % os.path.basename(os.path.normpath(source)))
+    paths = list_graph_files(source)
+    fingerprint = source_fingerprint(paths)
+    meta = read_meta(store_path)
+    if meta is not None:
+        if meta['version'] == STORE_VERSION and meta.get('source') == fingerprint:
+            return GraphStore(store_path)
+        log.debug("Graph store %s is out of date" % store_path)
+    return GraphStore.compile(paths, store_path, n_workers, chunk_size, fingerprint)
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+
+from parsemis.dataset import GraphStore, list_graph_files, load_collection, read_graph_file
+from parsemis.testing import NodeAndEdgeMiner, as_dict, random_graphs
+
+
+def write_collection(directory, graphs):
+    for graph in graphs:
+        nx.write_gml(graph, os.path.join(directory, "%s.gml" % graph.graph['id']))
+
+
+def edge_set(graph):
+    if graph.is_directed():
+        return {(u, v, label) for u, v, label in graph.edges(data='label')}
+    return {(frozenset((u, v)), label) for u, v, label in graph.edges(data='label')}
+
+
+class TestGraphStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.graphs = random_graphs(30, seed=6)
+        self.graphs[3] = nx.DiGraph(self.graphs[3])
+        self.graphs[4].add_node("lonely")
+        write_collection(self.directory, self.graphs)
+        with open(os.path.join(self.directory, "extra.edgelist"), "w") as f:
+            f.write("# an edge list\na b x\nb c\n")
+        with open(os.path.join(self.directory, "notes.txt"), "w") as f:
+            f.write("not a graph")
+        self.paths = list_graph_files(self.directory)
+
+    def test_compile_round_trip(self):
+        store = GraphStore.compile(self.paths, os.path.join(self.directory, "store"), n_workers=2, chunk_size=4)
+        self.assertEqual(len(store), 31)
+        self.assertEqual(len(store[-1:]), 1)
+        for path, graph in zip(self.paths, store):
+            expected = read_graph_file(path)
+            self.assertEqual(graph.graph['id'], expected.graph['id'])
+            self.assertEqual(graph.is_directed(), expected.is_directed())
+            self.assertEqual(graph.nodes(), list(expected.nodes()))
+            self.assertEqual(edge_set(graph.to_networkx()), edge_set(expected))
+        self.assertEqual(store[0].graph['id'], "extra")
+        self.assertEqual(edge_set(store[0].to_networkx()), {(frozenset("ab"), "x"), (frozenset("bc"), None)})
+
+    def test_multigraphs(self):
+        directory = tempfile.mkdtemp()
+        graphs = [nx.MultiGraph(id="m0"), nx.MultiDiGraph(id="m1"), nx.Graph(id="m2")]
+        for graph in graphs:
+            graph.add_edge("a", "b", label="x")
+            graph.add_edge("a", "b", label="y")
+        write_collection(directory, graphs)
+        store = GraphStore.compile(list_graph_files(directory), os.path.join(directory, "store"), n_workers=1)
+        for graph, stored in zip(graphs, store.to_networkx()):
+            self.assertEqual(type(stored), type(graph))
+            self.assertEqual(sorted(stored.edges(data='label')), sorted(graph.edges(data='label')))
+        self.assertTrue(store[0].is_multigraph())
+
+    def test_only_replaces_stores(self):
+        path = os.path.join(tempfile.mkdtemp(), "store")
+        os.makedirs(path)
+        with open(os.path.join(path, "keep.txt"), "w") as f:
+            f.write("not a store")
+        with self.assertRaises(FileExistsError):
+            GraphStore.compile(self.paths, path, n_workers=1)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({'version': 1, 'ids': []}, f)
+        with self.assertRaises(FileExistsError):
+            GraphStore.compile(self.paths, path, n_workers=1)
+        self.assertTrue(os.path.exists(os.path.join(path, "keep.txt")))
+
+        # A store of the first version is recompiled rather than read
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({'version': 1, 'ids': [], 'source': None}, f)
+        self.assertEqual(len(load_collection(self.directory, path, n_workers=1)), 31)
+        self.assertFalse(os.path.exists(os.path.join(path, "keep.txt")))
+
+    def test_writers_and_mining_use_the_store(self):
+        store = GraphStore.compile(self.paths, os.path.join(self.directory, "store"), n_workers=1)
+        graphs = store.to_networkx()
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+        for write in (miner.write_g, miner.write_lg):
+            write(graphs)
+            with open(miner.input_file) as f:
+                expected = f.read()
+            write(store)
+            with open(miner.input_file) as f:
+                self.assertEqual(f.read(), expected)
+
+        expected = as_dict(miner.mine_graphs(graphs, minimum_frequency=3))
+        self.assertEqual(as_dict(miner.mine_graphs(store, minimum_frequency=3, serialization_workers=2)), expected)
+        self.assertEqual(as_dict(miner.mine_graphs(store, minimum_frequency=3, prune_labels=True,
+                                                   dedupe_graphs=True)), expected)
+
+    def test_load_collection_reuses_store(self):
+        store_path = os.path.join(tempfile.mkdtemp(), "store")
+        store = load_collection(self.directory, store_path, n_workers=1)
+        self.assertEqual(load_collection(self.directory, store_path).source, store.source)
+        self.assertEqual(os.path.getmtime(os.path.join(store_path, "meta.json")),
+                         os.path.getmtime(os.path.join(load_collection(self.directory, store_path).path,
+                                                       "meta.json")))
+
+        graph = nx.Graph(id="new")
+        graph.add_edge("a", "z", label="x")
+        write_collection(self.directory, [graph])
+        reloaded = load_collection(self.directory, store_path, n_workers=1)
+        self.assertNotEqual(reloaded.source, store.source)
+        self.assertEqual(len(reloaded), 32)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Deduplication of identical input graphs, mining one representative per group with multiplicity weights.
+
+Input graphs with the same canonical code are written identically, so ParSeMiS would find the same fragments in each
+copy. Only one representative of every group is written, and a fragment's support in the full collection is the
+sum of the multiplicities of the representatives it appears in.
+
+ParSeMiS counts every representative once, so it is run with the smallest count that could still reach the
+threshold, the number of the largest groups needed to add up to it. Fragments are then filtered by their weighted
+support, and their supports expanded back to every member of their groups. A set of representatives expands to a
+distinct set of graphs, so closedness is preserved and supports are the same as mining the whole collection.
+"""
+import numpy as np
+
+from parsemis.canonical import canonical_code
+from parsemis.support import GraphIndex, GraphSupport
+
+
+class GraphDeduplication:
+    """
+    The representatives of the groups of identical graphs in a collection, and the members of every group
+    """
+
+    __slots__ = ('threshold', 'maximum_frequency', 'graphs', 'multiplicities', 'indptr', 'members', 'index')
+
+    def __init__(self, graphs, threshold, maximum_frequency=None, positions=None, index=None) -> None:
+        """
+        :param graphs: The NetworkX graphs to deduplicate, as a sequence
+        :param threshold: The minimum number of graphs of the full collection a fragment has to appear in
+        :param maximum_frequency: The maximum number of graphs of the full collection a fragment may appear in
+        :param positions: The positions of the graphs in the collection supports refer to, if they are a part of
+        it (such as the graphs kept by a LabelPruning)
+        :param index: The GraphIndex of that collection, defaults to an index over the graphs
+        """
+        super().__init__()
+        self.threshold = threshold
+        self.maximum_frequency = maximum_frequency
+        self.index = index if index is not None else GraphIndex.from_graphs(graphs)
+        self.graphs = []
+
+        groups = {}
+        group_members = []
+        for position, graph in enumerate(graphs):
+            code = canonical_code(graph)
+            group = groups.get(code)
+            if group is None:
+                group = groups[code] = len(self.graphs)
+                self.graphs.append(graph)
+                group_members.append([])
+            group_members[group].append(position if positions is None else positions[position])
+
+        self.multiplicities = np.array([len(members) for members in group_members], dtype=np.int64)
+        self.indptr = np.zeros(len(group_members) + 1, dtype=np.int64)
+        np.cumsum(self.multiplicities, out=self.indptr[1:])
+        self.members = np.array([member for members in group_members for member in members], dtype=np.int32)
+
+    @property
+    def n_duplicates(self):
+        return int(self.indptr[-1]) - len(self.graphs)
+
+    @property
+    def minimum_count(self):
+        """
+        :return: The smallest number of representatives whose multiplicities add up to the threshold
+        """
+        largest = np.cumsum(np.sort(self.multiplicities)[::-1])
+        return max(int(np.searchsorted(largest, self.threshold)) + 1, 1)
+
+    def mining_parameters(self, kwargs):
+        """
+        :return: The mining parameters to mine the representatives with. The frequency limits are applied to the
+        weighted supports afterwards, which needs the representatives every fragment appears in, so embeddings are
+        always stored
+        """
+        kwargs = {key: value for key, value in kwargs.items() if key != 'maximum_frequency'}
+        kwargs['minimum_frequency'] = self.minimum_count
+        kwargs['store_embeddings'] = True
+        return kwargs
+
+    def expand(self, representatives):
+        """
+        :param representatives: An array of positions of representatives
+        :return: The sorted positions of all of the members of their groups
+        """
+        representatives = np.asarray(representatives, dtype=np.int64)
+        counts = self.multiplicities[representatives]
+        starts = np.cumsum(counts) - counts
+        offsets = np.repeat(self.indptr[representatives] - starts, counts)
+        return np.sort(self.members[offsets + np.arange(int(counts.sum()))])
+
+    def restore(self, frequent_graphs):
+        """
+        Filters fragments mined from the representatives by their weighted support, and expands their supports to
+        the full collection
+        :return: A generator of FrequentGraph objects whose supports are over index
+        """
+        for frequent_graph in frequent_graphs:
+            representatives = frequent_graph.appears_in.positions
+            support = int(self.multiplicities[representatives].sum())
+            if support < self.threshold:
+                continue
+            if self.maximum_frequency is not None and support > self.maximum_frequency:
+                continue
+            yield type(frequent_graph)(frequent_graph.compact, GraphSupport(self.expand(representatives), self.index))
@@ -0,0 +1,78 @@
+import random
+import tempfile
+import unittest
+
+import networkx as nx
+
+from parsemis.dedupe import GraphDeduplication
+from parsemis.testing import NodeAndEdgeMiner, as_dict, random_graphs
+
+
+def repeated_graphs(n_graphs, seed=0):
+    rng = random.Random(seed)
+    distinct = random_graphs(8, seed=seed)
+    graphs = []
+    for i in range(n_graphs):
+        graph = rng.choice(distinct).copy()
+        graph.graph['id'] = "g%i" % i
+        graphs.append(graph)
+    return graphs
+
+
+class TestGraphDeduplication(unittest.TestCase):
+
+    def test_groups(self):
+        graphs = [nx.Graph(id=i) for i in range(5)]
+        for i in (0, 2, 3):
+            graphs[i].add_edge("a", "b", label="x")
+        graphs[1].add_edge("b", "a", label="x")
+        graphs[1].add_edge("b", "c", label="y")
+        graphs[4].add_edge("b", "c", label="y")
+        graphs[4].add_edge("a", "b", label="x")
+
+        deduplication = GraphDeduplication(graphs, 3)
+        self.assertEqual(len(deduplication.graphs), 2)
+        self.assertEqual(deduplication.n_duplicates, 3)
+        self.assertEqual(deduplication.multiplicities.tolist(), [3, 2])
+        self.assertEqual(deduplication.expand([1]).tolist(), [1, 4])
+        self.assertEqual(deduplication.expand([1, 0]).tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(deduplication.minimum_count, 1)
+        self.assertEqual(GraphDeduplication(graphs, 4).minimum_count, 2)
+
+    def test_mining_parameters(self):
+        deduplication = GraphDeduplication(repeated_graphs(20), 10)
+        parameters = deduplication.mining_parameters({'minimum_frequency': 10, 'maximum_frequency': 15,
+                                                      'store_embeddings': False, 'close_graph': True})
+        self.assertEqual(parameters, {'minimum_frequency': deduplication.minimum_count, 'store_embeddings': True,
+                                      'close_graph': True})
+
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+        commands = miner.build_commands(**parameters)
+        self.assertIn("--storeEmbeddings=True", commands)
+
+    def test_mining_matches_undeduplicated(self):
+        graphs = repeated_graphs(120, seed=4)
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+
+        for minimum_frequency in ["10%", 20, 0.5, 1]:
+            expected = as_dict(miner.mine_graphs(graphs, minimum_frequency=minimum_frequency))
+            deduplicated = miner.mine_graphs(iter(graphs), dedupe_graphs=True, minimum_frequency=minimum_frequency)
+            self.assertEqual(as_dict(deduplicated), expected)
+            self.assertEqual(len(deduplicated.index), len(graphs))
+
+            both = miner.mine_graphs(graphs, prune_labels=True, dedupe_graphs=True,
+                                     minimum_frequency=minimum_frequency)
+            self.assertEqual(as_dict(both), expected)
+            self.assertIn('dedupe', both.report.phases)
+
+    def test_maximum_frequency(self):
+        graphs = repeated_graphs(60, seed=1)
+        expected = {pattern: ids for pattern, ids in as_dict(
+            NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs, minimum_frequency=5)).items() if len(ids) <= 20}
+        deduplicated = NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs, dedupe_graphs=True,
+                                                                        minimum_frequency=5, maximum_frequency=20)
+        self.assertEqual(as_dict(deduplicated), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
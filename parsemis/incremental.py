@@ -0,0 +1,74 @@
+"""
+Incremental mining for collections that grow over time.
+
+When graphs are appended to a collection, the support of every previously frequent fragment can only grow by the
+number of new graphs it appears in. A fragment that wasn't frequent before had a support of at most the old
+threshold minus one, so to become frequent it has to appear in at least (new threshold - old threshold + 1) of the
+new graphs. Mining just the new graphs at that threshold therefore finds every new candidate, and only those
+candidates have to be counted in the old graphs.
+"""
+import logging as log
+
+import numpy as np
+
+from parsemis.containment import contains, pattern_key, written_sets
+from parsemis.results import MiningResult
+from parsemis.support import GraphIndex, GraphSupport
+
+
+def mine_incremental(miner, new_graphs):
+    """
+    Extends the latest result of a miner with new graphs. See ParsemisMiner.update
+    :return: A tuple of (graphs, result, parameters) for the whole collection
+    """
+    parameters = miner.last_parameters
+    if parameters.get('close_graph', False):
+        raise ValueError("Closed fragments can't be updated incrementally, as closedness depends on every super "
+                         "fragment of the old collection")
+
+    old_graphs = list(miner.last_graphs)
+    new_graphs = list(new_graphs)
+    graphs = old_graphs + new_graphs
+    minimum_frequency = parameters.get('minimum_frequency', '0.05')
+    old_threshold = miner.resolve_frequency(minimum_frequency, len(old_graphs))
+    new_threshold = miner.resolve_frequency(minimum_frequency, len(graphs))
+    maximum_frequency = parameters.get('maximum_frequency')
+
+    directed = not miner.mine_undirected
+    offset = len(old_graphs)
+    new_sets = [written_sets(graph, directed) for graph in new_graphs]
+
+    candidates = {}
+    for i, frequent_graph in enumerate(miner.last_result):
+        key = pattern_key(frequent_graph.compact, directed)
+        new_positions = [offset + j for j, sets in enumerate(new_sets) if contains(sets, key)]
+        candidates[key] = (frequent_graph, [miner.last_result.graph_positions(i), new_positions])
+
+    delta_threshold = max(1, new_threshold - old_threshold + 1)
+    log.debug("Mining %i new graphs with frequency %i" % (len(new_graphs), delta_threshold))
+    delta_miner = miner.__class__("%s/delta" % miner.data_location, mine_undirected=miner.mine_undirected,
+                                  debug=miner.debug_statement is not None)
+    delta_result = delta_miner.mine_graphs(new_graphs, **dict(parameters, minimum_frequency=delta_threshold,
+                                                              store_embeddings=True))
+
+    old_sets = None
+    for i, frequent_graph in enumerate(delta_result):
+        key = pattern_key(frequent_graph.compact, directed)
+        if key in candidates:
+            continue
+        if old_sets is None:
+            old_sets = [written_sets(graph, directed) for graph in old_graphs]
+        old_positions = [j for j, sets in enumerate(old_sets) if contains(sets, key)]
+        candidates[key] = (frequent_graph, [old_positions, delta_result.graph_positions(i) + offset])
+
+    index = GraphIndex.from_graphs(graphs)
+    frequent_graphs = []
+    for frequent_graph, positions in candidates.values():
+        support = GraphSupport(np.concatenate([np.asarray(p, dtype=np.int32) for p in positions]), index)
+        if len(support) < new_threshold:
+            continue
+        if maximum_frequency is not None and len(support) > maximum_frequency:
+            continue
+        frequent_graphs.append(type(frequent_graph)(frequent_graph.compact, support))
+
+    return graphs, MiningResult(frequent_graphs, graphs), parameters
@@ -0,0 +1,44 @@
+import tempfile
+import unittest
+
+from parsemis.testing import NodeAndEdgeMiner, as_dict, random_graphs
+
+
+class TestIncrementalMining(unittest.TestCase):
+
+    def test_update_matches_full_mine(self):
+        graphs = random_graphs(80, seed=1)
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+
+        for minimum_frequency in ["20%", 12]:
+            expected = as_dict(NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(
+                graphs, minimum_frequency=minimum_frequency))
+
+            miner.mine_graphs(graphs[:50], minimum_frequency=minimum_frequency)
+            miner.update(graphs[50:70])
+            result = miner.update(graphs[70:])
+
+            self.assertEqual(as_dict(result), expected)
+            self.assertEqual(len(miner.last_graphs), 80)
+
+    def test_update_needs_previous_result(self):
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+        self.assertRaises(ValueError, miner.update, random_graphs(2))
+
+        miner.mine_graphs(random_graphs(5), close_graph=True)
+        self.assertRaises(ValueError, miner.update, random_graphs(2))
+
+    def test_update_follows_latest_run(self):
+        graphs = random_graphs(40, seed=2)
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+        miner.mine_graphs(graphs[:10], minimum_frequency=3)
+        list(miner.mine_graphs(graphs[:20], lazy=True, minimum_frequency=3))
+        self.assertIsNone(miner.last_graphs)
+        self.assertRaises(ValueError, miner.update, graphs[20:])
+
+        def by_code(result):
+            return {frequent_graph.canonical_code: frequent_graph.appears_in.tolist() for frequent_graph in result}
+
+        miner.mine_graphs_sharded(graphs[:30], n_shards=2, n_workers=1, minimum_frequency=3)
+        expected = by_code(NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs, minimum_frequency=3))
+        self.assertEqual(by_code(miner.update(graphs[30:])), expected)
@@ -5,44 +5,115 @@ For this example, our graphs are represented using NetworkX
 
 https://www2.informatik.uni-erlangen.de/EN/research/zold/ParSeMiS/index.html
 """
-import subprocess
+import asyncio
+import copy
 import networkx as nx
 import logging as log
+import math
 import os
-import re
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 import numpy as np
 
+from parsemis.asynchronous import mine_async
+from parsemis.canonical import canonical_code, equivalent
+from parsemis.compact import CompactGraph, NONE_LABEL
+from parsemis.containment import ContainmentIndex
+from parsemis.dedupe import GraphDeduplication
+from parsemis.incremental import mine_incremental
+from parsemis.pipes import mine_piped
+from parsemis.progressive import mine_progressive
+from parsemis.pruning import LabelPruning
+from parsemis.report import RunReport, run_instrumented
+from parsemis.results import MiningResult
+from parsemis.scheduler import InputStatistics
+from parsemis.session import MinerSession
+from parsemis.sharding import mine_sharded
+from parsemis.similarity import SimilarityIndex
+from parsemis.support import GraphIndex, GraphSupport
+from parsemis.vocabulary import LabelVocabulary
+
 
 class FrequentGraph:
+    """
+    A frequent fragment and the graphs it appears in. Fragments read from ParSeMiS are held as a CompactGraph, and
+    only converted to a NetworkX graph the first time graph is accessed.
+
+    Frequent graphs are equal, and hash the same, when their fragments are isomorphic, whatever their supports.
+    """
+
+    __slots__ = ('_graph', '_compact', '_appears_in', '_code', '__rank')
 
     def __init__(self, graph, appears_in) -> None:
+        """
+        :param graph: The fragment, as a NetworkX graph or a CompactGraph
+        :param appears_in: The graphs the fragment appears in
+        """
         super().__init__()
-        self._graph = graph
+        if isinstance(graph, CompactGraph):
+            self._graph = None
+            self._compact = graph
+        else:
+            self._graph = graph
+            self._compact = None
         self._appears_in = appears_in
-        self._support = len(self._appears_in)
+        self._code = None
         self.__rank = None
 
     def to_string(self):
-        if len(self._graph.edges()) == 0:
-            return  ",".join(self._graph.nodes())
+        graph = self._compact if self._compact is not None else self._graph
+        if len(graph.edges()) == 0:
+            return ",".join(map(str, graph.nodes()))
         else:
-            edge_strings = []
-            for edge in self._graph.edges():
-                labels = ParsemisMiner.get_label_from_edge(self._graph, edge)
-                for label in labels:
-                    if (nx.is_directed(self._graph)):
-                        edge_strings.append("(%s)-[%s]->(%s)" % (edge[0], label, edge[1]))
+            edge_strings = set()
+            for u, v, data in graph.edges(data=True):
+                if 'label' in data:
+                    if graph.is_directed():
+                        edge_strings.add("(%s)-[%s]->(%s)" % (u, data['label'], v))
                     else:
-                        edge_strings.append("(%s)-[%s]-(%s)" % (edge[0], label, edge[1]))
-            return ", ".join(list(set(edge_strings)))
+                        edge_strings.add("(%s)-[%s]-(%s)" % (u, data['label'], v))
+            return ", ".join(edge_strings)
 
     @property
     def graph(self):
+        """
+        :return: The fragment as a NetworkX graph
+        """
+        if self._graph is None:
+            self._graph = self._compact.to_networkx()
         return self._graph
 
+    @property
+    def compact(self):
+        """
+        :return: The fragment as a CompactGraph
+        """
+        if self._compact is None:
+            self._compact = CompactGraph.from_networkx(self._graph)
+        return self._compact
+
+    @property
+    def canonical_code(self):
+        """
+        :return: A string identifying the fragment up to isomorphism, computed once
+        """
+        if self._code is None:
+            self._code = canonical_code(self._compact if self._compact is not None else self._graph)
+        return self._code
+
+    def __eq__(self, other):
+        if not isinstance(other, FrequentGraph):
+            return NotImplemented
+        return self is other or equivalent(self, other)
+
+    def __hash__(self):
+        return hash(self.canonical_code)
+
     @property
     def support(self):
-        return self._support
+        return len(self._appears_in)
 
     @property
     def appears_in(self):
@@ -62,10 +133,49 @@ class ParsemisMiner:
 
     The wrapper itself has one required argument, a location to store the input and output files for the graphs
     that are required for parsing.
+
+    Passing a ResultCache as cache skips ParSeMiS whenever the same input has already been mined with the same
+    parameters.
+
+    With transport='pipe', the input and output files are named pipes in a temporary directory, so graphs are
+    streamed into ParSeMiS and fragments are parsed as they are written, without touching the disk.
+
+    max_concurrent_jobs bounds the number of JVMs started at once by amine_graphs.
+
+    Passing a MemoryScheduler as scheduler sizes the heap of each run to its input rather than using heap_size, holds
+    runs back while the machine's memory budget is used up, and retries runs that run out of memory.
+
+    Every run is described by a RunReport. metrics is an optional callback(event, data) for exporting its phases,
+    ParSeMiS' progress output and the finished report to monitoring.
+
+    Passing a LabelVocabulary (or the path of its JSON file) as label_vocabulary writes labels to ParSeMiS as integer
+    codes and decodes them on read, so files are smaller and any label round trips exactly. A vocabulary given as a
+    path is loaded if it exists, and saved after every write.
     """
 
-    def __init__(self, data_location, mine_undirected=True, debug=True):
+    def __init__(self, data_location, mine_undirected=True, debug=True, cache=None, transport='file',
+                 max_concurrent_jobs=None, scheduler=None, metrics=None, label_vocabulary=None):
+        if transport not in ('file', 'pipe'):
+            raise ValueError("Unknown transport %s, expected 'file' or 'pipe'" % transport)
+        if transport == 'pipe' and cache is not None:
+            raise ValueError("Results can't be cached with the pipe transport, as the cache is keyed by the input file")
         self.data_location = data_location
+        self.cache = cache
+        self.transport = transport
+        self.max_concurrent_jobs = max_concurrent_jobs or os.cpu_count() or 1
+        self._job_slots = None
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.last_report = None
+        self.label_vocabulary_file = None
+        if isinstance(label_vocabulary, str):
+            self.label_vocabulary_file = label_vocabulary
+            if os.path.exists(label_vocabulary):
+                label_vocabulary = LabelVocabulary.load(label_vocabulary)
+            else:
+                label_vocabulary = LabelVocabulary()
+        self.label_vocabulary = label_vocabulary
+        self.n_label_codes = 0
 
         self.parsemis_location = "%s/parsemis.jar" % os.path.dirname(os.path.realpath(__file__))
         os.makedirs(self.data_location, exist_ok=True)
@@ -75,6 +185,12 @@ class ParsemisMiner:
         else:
             self.debug_statement = None
 
+        self.graph_index = None
+        self.input_statistics = None
+        self.last_graphs = None
+        self.last_result = None
+        self.last_parameters = None
+
         self.mine_undirected = mine_undirected
         if self.mine_undirected:
             self.input_file = "%s/input.g" % self.data_location
@@ -88,184 +204,589 @@ class ParsemisMiner:
         if os.path.exists(self.output_file):
             os.remove(self.output_file)
 
-    def mine_graphs(self, graphs, **kwargs):
-        log.debug("Mining %i graphs" % len(graphs))
-        self.write_graph(graphs)
-        self.perform_mining(**kwargs)
-        return self.read_graph(graphs)
+    def mine_graphs(self, graphs, lazy=False, serialization_workers=None, prune_labels=False, dedupe_graphs=False,
+                    **kwargs):
+        """
+        Mines the frequent subgraphs of a collection of graphs
+        :param graphs: The NetworkX graphs to mine, as any iterable (including a generator)
+        :param lazy: If True, returns a generator of FrequentGraph objects that parses the output file as it is consumed
+        :param serialization_workers: Serializes the graphs across a process pool of this size
+        :param prune_labels: If True, drops the nodes and edges whose labels appear in fewer graphs than the minimum
+        frequency, and the graphs left empty, before writing. Supports still refer to the original graphs
+        :param dedupe_graphs: If True, writes one representative of every group of identical graphs, and counts
+        supports by group size. Supports still refer to every original graph
+        :return: A MiningResult (or generator of FrequentGraph objects when lazy). The RunReport of the run is kept as
+        the result's report, and as last_report
+        """
+        report = self.last_report = RunReport(self.metrics)
+        # Lazy runs aren't kept, so an earlier run mustn't be left for update to extend
+        self.remember(None, None, None)
+        parameters = kwargs
+        reduction = None
+        mined = graphs
+        if prune_labels or dedupe_graphs:
+            graphs = graphs if isinstance(graphs, Sequence) else list(graphs)
+            threshold = self.resolve_frequency(kwargs.get('minimum_frequency', '0.05'), len(graphs))
+            # The reduced collection is smaller, so relative thresholds are resolved against the original one
+            kwargs = dict(kwargs, minimum_frequency=threshold)
+        if prune_labels:
+            with report.phase('prune'):
+                reduction = LabelPruning(graphs, threshold)
+            log.debug("Pruning dropped %i of %i graphs" % (reduction.n_dropped, len(graphs)))
+            mined = reduction.graphs
+        if dedupe_graphs:
+            with report.phase('dedupe'):
+                if reduction is None:
+                    reduction = GraphDeduplication(graphs, threshold, kwargs.get('maximum_frequency'))
+                else:
+                    reduction = GraphDeduplication(reduction.graphs, threshold, kwargs.get('maximum_frequency'),
+                                                   reduction.positions, reduction.index)
+            log.debug("Deduplication dropped %i duplicate graphs" % reduction.n_duplicates)
+            kwargs = reduction.mining_parameters(kwargs)
+            mined = reduction.graphs
+
+        if self.transport == 'pipe':
+            frequent_graphs = mine_piped(self, mined, serialization_workers, **kwargs)
+            if lazy:
+                return frequent_graphs if reduction is None else reduction.restore(frequent_graphs)
+            with report.phase('mine'):
+                frequent_graphs = list(frequent_graphs)
+        else:
+            with report.phase('write'):
+                n_graphs = self.write_graph(mined, serialization_workers)
+            report.bytes_written = os.path.getsize(self.input_file)
+            log.debug("Mining %i graphs" % n_graphs)
+            if self.cache is not None:
+                with report.phase('mine'):
+                    frequent_graphs = self._mine_cached(**kwargs)
+                if lazy:
+                    return iter(frequent_graphs) if reduction is None else reduction.restore(frequent_graphs)
+            else:
+                with report.phase('mine'):
+                    self.mine_output(**kwargs)
+                if os.path.exists(self.output_file):
+                    report.bytes_read = os.path.getsize(self.output_file)
+                if lazy:
+                    report.finish()
+                    frequent_graphs = self.iter_frequent_graphs(self.graph_index)
+                    return frequent_graphs if reduction is None else reduction.restore(frequent_graphs)
+                with report.phase('read'):
+                    frequent_graphs = self.read_graph(self.graph_index)
+        if reduction is not None:
+            frequent_graphs = list(reduction.restore(frequent_graphs))
+            self.graph_index = reduction.index
+        report.n_fragments = len(frequent_graphs)
+        result = MiningResult(frequent_graphs, self.graph_index)
+        result.report = report.finish()
+        return self.remember(graphs if isinstance(graphs, Sequence) else None, result, parameters)
+
+    async def amine_graphs(self, graphs, timeout=None, serialization_workers=None, **kwargs):
+        """
+        Mines the frequent subgraphs of a collection of graphs without blocking the event loop. Every call works on
+        its own input and output files, so calls on one miner can run concurrently, and at most max_concurrent_jobs
+        JVMs run at once. Cancelling the call kills its JVM.
+
+        Unlike mine_graphs, the result isn't kept for update, as concurrent calls would overwrite each other.
+        :param graphs: The NetworkX graphs to mine
+        :param timeout: The number of seconds ParSeMiS may run for before it is killed and asyncio.TimeoutError raised
+        :param serialization_workers: Serializes the graphs across a process pool of this size
+        :return: A MiningResult
+        """
+        self.remember(None, None, None)
+        return await mine_async(self, graphs, timeout, serialization_workers, **kwargs)
 
-    def write_graph(self, graphs):
+    def job_slots(self):
+        """
+        :return: The semaphore limiting the number of concurrent JVMs started on the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._job_slots is None or self._job_slots[0] is not loop:
+            self._job_slots = (loop, asyncio.Semaphore(self.max_concurrent_jobs))
+        return self._job_slots[1]
+
+    def isolated_job(self, directory):
+        """
+        Copies the miner for a job that runs alongside others, such as an async run, a pipe run or a session batch
+        :param directory: The directory the job writes its input and reads its output in
+        :return: A copy of the miner whose input and output files are in directory
+        """
+        job = copy.copy(self)
+        job.input_file = "%s/%s" % (directory, os.path.basename(self.input_file))
+        job.output_file = "%s/%s" % (directory, os.path.basename(self.output_file))
+        return job
+
+    def cache_key(self, **kwargs):
+        """
+        :return: The cache key of the written input with the mining parameters. Encoded inputs also depend on the
+        labels of the codes they use
+        """
+        if self.label_vocabulary is not None:
+            kwargs = dict(kwargs, label_vocabulary=self.label_vocabulary.fingerprint(self.n_label_codes))
+        return self.cache.key(self.input_file, self.mine_undirected, kwargs)
+
+    def _mine_cached(self, **kwargs):
+        key = self.cache_key(**kwargs)
+        frequent_graphs = self.cache.get(key, self.graph_index, FrequentGraph)
+        if frequent_graphs is None:
+            self.mine_output(**kwargs)
+            frequent_graphs = self.read_graph(self.graph_index)
+            self.cache.put(key, frequent_graphs, self.graph_index)
+        return frequent_graphs
+
+    def remember(self, graphs, result, parameters):
+        """
+        Keeps the graphs, result and parameters of the latest run, so that update can extend it. Runs that can't be
+        extended remember None
+        :param graphs: The mined graphs, or None if they were given as a one-shot iterable
+        :return: The result
+        """
+        self.last_graphs = graphs
+        self.last_result = result
+        self.last_parameters = parameters
+        return result
+
+    def update(self, new_graphs):
+        """
+        Incrementally updates the result of the latest mine_graphs call after new graphs are appended to its
+        collection. Only the new graphs are mined, and the result is the same as re-mining the whole collection.
+        :param new_graphs: The NetworkX graphs appended to the collection
+        :return: A MiningResult over the old and new graphs together
+        """
+        if self.last_result is None or self.last_graphs is None:
+            raise ValueError("update needs the result of a previous call to mine_graphs, with the graphs as a list")
+        return self.remember(*mine_incremental(self, new_graphs))
+
+    def mine_progressive(self, graphs, max_patterns=None, time_budget=None, stop_when=None,
+                         serialization_workers=None, poll_interval=0.1, **kwargs):
+        """
+        Mines the frequent subgraphs of a collection of graphs, yielding each FrequentGraph as soon as ParSeMiS has
+        written it rather than once it has exited. ParSeMiS only writes its output after the search has finished, so
+        fragments arrive from then on. The JVM is terminated once any stop condition is met or the generator is
+        closed, and the fragments yielded up to then are kept by the caller.
+        :param graphs: The NetworkX graphs to mine
+        :param max_patterns: Stops reading the output after this many fragments. The search has already finished
+        :param time_budget: Stops after this many seconds, which is the only condition that cuts the search short
+        :param stop_when: A function of each FrequentGraph, that stops reading the output after the first fragment
+        it's True for. The search has already finished
+        :param serialization_workers: Serializes the graphs across a process pool of this size
+        :param poll_interval: The number of seconds between checks of the output file for new lines
+        :return: A generator of FrequentGraph objects. The RunReport of the run is kept as last_report, and finished
+        once the generator is
+        """
+        self.last_report = RunReport(self.metrics)
+        self.remember(None, None, None)
+        return mine_progressive(self, graphs, max_patterns, time_budget, stop_when, serialization_workers,
+                                poll_interval, **kwargs)
+
+    def mine_graphs_sharded(self, graphs, n_shards=None, n_workers=None, **kwargs):
+        """
+        Mines the frequent subgraphs of a collection by splitting it into shards, mining each shard in its own
+        ParSeMiS process, and re-counting the global support of every locally frequent candidate.
+
+        The result is the same as mining the whole collection with mine_graphs.
+        :param graphs: The NetworkX graphs to mine
+        :param n_shards: The number of shards, defaults to the number of workers
+        :param n_workers: The number of concurrent ParSeMiS processes, defaults to the number of CPUs
+        :param kwargs: Mining parameters, as for mine_graphs. heap_size sets the heap of each process (e.g. "2g")
+        :return: A MiningResult
+        """
+        self.remember(None, None, None)
+        result = mine_sharded(self, graphs, n_shards, n_workers, **kwargs)
+        return self.remember(graphs if isinstance(graphs, Sequence) else None, result, kwargs)
+
+    def session(self, pool_size=1, heap_size=None, timeout=None):
+        """
+        Starts a session that keeps ParSeMiS loaded in a pool of long lived JVMs, so that repeated mining calls don't
+        pay for JVM startup. Requires javac to compile the small server class on first use.
+        :param pool_size: The number of JVMs to keep alive
+        :param heap_size: The maximum heap of each JVM, defaults to the scheduler's maximum heap, or else 10g
+        :param timeout: The number of seconds to wait for a mining request before restarting its JVM
+        :return: A MinerSession, to be used as a context manager
+        """
+        return MinerSession(self, pool_size, heap_size, timeout)
+
+    def write_graph(self, graphs, n_workers=None):
         if self.mine_undirected:
-            self.write_g(graphs)
+            return self.write_g(graphs, n_workers)
         else:
-            self.write_lg(graphs)
+            return self.write_lg(graphs, n_workers)
 
-    def read_graph(self, graphs):
+    def read_graph(self, graphs=None):
         if self.mine_undirected:
             return self.read_g(graphs)
         else:
-            return self.read_lg()
+            return self.read_lg(graphs)
+
+    def iter_frequent_graphs(self, graphs=None):
+        """
+        Lazily reads the output file, yielding each FrequentGraph as soon as its block has been parsed
+        :param graphs: The graphs that were mined, or their GraphIndex. Defaults to the index of the latest write
+        :return: A generator of FrequentGraph objects
+        """
+        if self.mine_undirected:
+            return self.iter_g(graphs)
+        else:
+            return self.iter_lg(graphs)
+
+    def parse_frequent_graphs(self, lines, index):
+        """
+        Parses ParSeMiS output from any iterable of lines
+        :return: A generator of FrequentGraph objects
+        """
+        if self.mine_undirected:
+            return self.parse_g(lines, index)
+        else:
+            return self.parse_lg(lines, index)
+
+    def mine_output(self, **kwargs):
+        """
+        Mines the written input into the output file. Any previous output is removed first, so that a failed run
+        can't be read (or cached) as this one's
+        :raises RuntimeError: If ParSeMiS exited with a nonzero code
+        """
+        if os.path.exists(self.output_file):
+            os.remove(self.output_file)
+        return_code = self.perform_mining(**kwargs)
+        if return_code:
+            raise RuntimeError("ParSeMiS exited with code %i" % return_code)
+        return return_code
 
     def perform_mining(self, **kwargs):
-        commands = ['java', '-jar',
-                    "-Xmx10g",
-                    self.parsemis_location,
-                    "--graphFile=%s" % self.input_file,
-                    "--outputFile=%s" % self.output_file,
-                    "--minimumFrequency=%s" % kwargs.get('minimum_frequency', '0.05'),
-                    "--findPathsOnly=%s" % kwargs.get('find_paths_only', True),
-                    "--findTreesOnly=%s" % kwargs.get('find_trees_only', True),
-                    "--singleRooted=%s" % kwargs.get('single_rooter', True),
-                    "--connectedFragments=%s" % kwargs.get('connectedFragments', True),
-                    "--algorithm=%s" % kwargs.get('algorithm', 'gspan'),
-                    "--closeGraph=%s" % kwargs.get('close_graph', False),
-                    "--subdue=%s" % kwargs.get('subdue', False),
-                    "--zaretsky=%s" % kwargs.get('zaretsky', False),
-                    "--distribution=%s" % kwargs.get('distribution', 'threads'),
-                    "--threads=%s" % kwargs.get('n_threads', 1),
-                    "--storeEmbeddings=%s" % kwargs.get('store_embeddings', True)
-                    ]
+        if self.scheduler is not None:
+            return self.scheduler.run(self, **kwargs)
+        commands = self.build_commands(**kwargs)
+        return self.run_commands(commands)
+
+    def run_commands(self, commands):
+        """
+        Runs ParSeMiS, capturing its output and resource usage in last_report
+        :return: The exit code
+        """
+        return run_instrumented(commands, self.last_report)
+
+    def build_commands(self, **kwargs):
+        """
+        :return: The java command line that runs ParSeMiS over the input file
+        """
+        return ['java', '-jar'] + self.jvm_options(**kwargs) + [self.parsemis_location] + \
+            self.build_arguments(**kwargs)
+
+    def jvm_options(self, **kwargs):
+        options = ["-Xmx%s" % kwargs.get('heap_size', '10g'), "-XX:+ExitOnOutOfMemoryError"]
         if self.debug_statement is not None:
-            commands.insert(2, self.debug_statement)
+            options.insert(0, self.debug_statement)
+        return options
+
+    def build_arguments(self, **kwargs):
+        """
+        :return: The ParSeMiS command line arguments for the mining parameters
+        """
+        arguments = ["--graphFile=%s" % self.input_file,
+                     "--outputFile=%s" % self.output_file,
+                     "--minimumFrequency=%s" % kwargs.get('minimum_frequency', '0.05'),
+                     "--findPathsOnly=%s" % kwargs.get('find_paths_only', True),
+                     "--findTreesOnly=%s" % kwargs.get('find_trees_only', True),
+                     "--singleRooted=%s" % kwargs.get('single_rooter', True),
+                     "--connectedFragments=%s" % kwargs.get('connectedFragments', True),
+                     "--algorithm=%s" % kwargs.get('algorithm', 'gspan'),
+                     "--closeGraph=%s" % kwargs.get('close_graph', False),
+                     "--subdue=%s" % kwargs.get('subdue', False),
+                     "--zaretsky=%s" % kwargs.get('zaretsky', False),
+                     "--distribution=%s" % kwargs.get('distribution', 'threads'),
+                     "--threads=%s" % kwargs.get('n_threads', 1),
+                     "--storeEmbeddings=%s" % kwargs.get('store_embeddings', True)
+                     ]
 
         if 'minimum_node_count' in kwargs:
-            commands.append("--minimumNodeCount=%i" % kwargs.get('minimum_node_count'))
+            arguments.append("--minimumNodeCount=%i" % kwargs.get('minimum_node_count'))
         if 'maximum_node_count' in kwargs:
-            commands.append("--maximumNodeCount=%i" % kwargs.get('maximum_node_count'))
+            arguments.append("--maximumNodeCount=%i" % kwargs.get('maximum_node_count'))
         if 'minimum_edge_count' in kwargs:
-            commands.append("--minimumEdgeCount=%i" % kwargs.get('minimum_edge_count'))
+            arguments.append("--minimumEdgeCount=%i" % kwargs.get('minimum_edge_count'))
         if 'maximum_edge_count' in kwargs:
-            commands.append("--maximumEdgeCount=%i" % kwargs.get('maximum_edge_count'))
+            arguments.append("--maximumEdgeCount=%i" % kwargs.get('maximum_edge_count'))
         if 'maximum_frequency' in kwargs:
-            commands.append("--maximumFrequency=%i" % kwargs.get('maximum_frequency'))
+            arguments.append("--maximumFrequency=%i" % kwargs.get('maximum_frequency'))
+        return arguments
+
+    @staticmethod
+    def resolve_frequency(frequency, n_graphs):
+        """
+        Resolves a frequency threshold to an absolute number of graphs
+        :param frequency: An absolute count (e.g. 5), a percentage (e.g. "5%"), or a fraction (e.g. 0.05)
+        :param n_graphs: The number of graphs in the collection
+        :return: The minimum number of graphs a fragment has to appear in
+        """
+        frequency = str(frequency).strip()
+        if frequency.endswith("%"):
+            return int(math.ceil(round(float(frequency[:-1]) * n_graphs / 100, 9)))
+        value = float(frequency)
+        if value < 1:
+            return int(math.ceil(round(value * n_graphs, 9)))
+        return int(value)
+
+    def write_lg(self, graphs, n_workers=None, chunk_size=1000):
+        """
+        Writes graphs to the LineGraph input file
+        :param graphs: Any iterable of NetworkX graphs, including a generator
+        :param n_workers: Serializes chunks of graphs across a process pool of this size
+        :param chunk_size: The number of graphs serialized and written at once
+        :return: The number of graphs written
+        """
+        return self._write(graphs, ParsemisMiner.serialize_lg, n_workers, chunk_size)
 
-        log.debug(commands)
-        subprocess.call(commands)
+    def write_g(self, graphs, n_workers=None, chunk_size=1000):
+        """
+        Writes graphs to the .g input file
+        :param graphs: Any iterable of NetworkX graphs, including a generator
+        :param n_workers: Serializes chunks of graphs across a process pool of this size
+        :param chunk_size: The number of graphs serialized and written at once
+        :return: The number of graphs written
+        """
+        return self._write(graphs, ParsemisMiner.serialize_g, n_workers, chunk_size)
 
-    def write_lg(self, graphs):
+    def _write(self, graphs, serialize, n_workers, chunk_size):
         log.debug("Writing graphs to %s" % self.input_file)
-        with open(self.input_file, "w") as f:
-            for g_id, graph in enumerate(graphs):
-                try:
-                    if "id" in graph.graph:
-                        f.write("t # %s\n" % graph.graph['id'])
+        self.graph_index = GraphIndex()
+        with open(self.input_file, "w", buffering=1 << 20) as f:
+            for block in self.serialize_chunks(graphs, serialize, n_workers, chunk_size):
+                f.write(block)
+        log.debug("Wrote %i graphs to %s" % (len(self.graph_index), self.input_file))
+        return len(self.graph_index)
+
+    def serialize_chunks(self, graphs, serialize, n_workers=None, chunk_size=1000):
+        """
+        Serializes graphs chunk by chunk, in order, recording their ids in graph_index and, when the miner has a
+        scheduler, their sizes in input_statistics. With several workers, a bounded number of chunks are serialized
+        ahead of the one being written. With a label vocabulary, labels are encoded in this process and only the
+        chunk's codes are sent to the workers.
+        """
+        graphs = iter(graphs)
+        # Statistics are an extra pass over every graph, only needed to size the heap
+        self.input_statistics = InputStatistics() if self.scheduler is not None else None
+        self.n_label_codes = 0
+        executor = ProcessPoolExecutor(n_workers) if n_workers is not None and n_workers > 1 else None
+        pending = deque()
+        try:
+            while True:
+                chunk = list(islice(graphs, chunk_size))
+                if len(chunk) == 0:
+                    break
+                start = len(self.graph_index)
+                for position, graph in enumerate(chunk, start):
+                    self.graph_index.append(graph.graph.get('id', position))
+                    if self.input_statistics is not None:
+                        self.input_statistics.add(graph)
+                codes = None
+                if self.label_vocabulary is not None:
+                    codes = self.label_vocabulary.encoder_for(chunk)
+                    self.n_label_codes = max(self.n_label_codes, max(codes.values(), default=-1) + 1)
+                if executor is None:
+                    yield serialize(chunk, start, 'label', codes)
+                else:
+                    pending.append(executor.submit(serialize, chunk, start, 'label', codes))
+                    if len(pending) >= 2 * n_workers:
+                        yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+            if self.label_vocabulary_file is not None:
+                self.label_vocabulary.save(self.label_vocabulary_file)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    @staticmethod
+    def serialize_lg(graphs, start=0, attribute_name='label', codes=None):
+        """
+        Serializes graphs in the LineGraph format
+        :param start: The position of the first graph in the collection, used for graphs without an id
+        :param codes: A dict of label -> integer code, to write codes rather than labels
+        :return: The serialized graphs
+        """
+        lines = []
+        for g_id, graph in enumerate(graphs, start):
+            try:
+                lines.append("t # %s" % graph.graph.get('id', g_id))
+                node_dict = {}
+                for n_id, n in enumerate(graph.nodes()):
+                    node_dict[n] = n_id
+                    if codes is not None:
+                        lines.append("v %i %i" % (n_id, codes[n]))
                     else:
-                        f.write("t # %s\n" % g_id)
-                    node_dict = {}
-
-                    for n_id, n in enumerate(graph.nodes()):
-                        if n == '':
-                            n = '[EMPTY_NODE]'
-                        node_dict[n] = n_id
-                        f.write("v %i %s\n" % (node_dict[n], n))
-
-                    for edge in graph.edges():
-                        labels = self.get_label_from_edge(graph, edge)
-                        for label in labels:
-                            if label is not None:
-                                f.write("e %i %i %s\n" % (node_dict[edge[0]], node_dict[edge[1]], label))
-                            else:
-                                f.write("e %i %i\n" % (node_dict[edge[0]], node_dict[edge[1]]))
-                except Exception as e:
-                    log.error(e)
-            f.close()
-
-    def write_g(self, graphs):
-        log.debug("Writing graphs to %s" % self.input_file)
-        with open(self.input_file, "w") as f:
-            for g_id, graph in enumerate(graphs):
-                try:
-                    f.write("XP\n")
-                    node_dict = {}
-                    for n_id, n in enumerate(graph.nodes()):
-                        node_dict[n] = n_id + 1
-                        f.write("v %i %s\n" % (node_dict[n], n))
-                    for edge in graph.edges():
-                        labels = self.get_label_from_edge(graph, edge)
-                        for label in labels:
-                            if label is not None:
-                                f.write("u %i %i %s\n" % (node_dict[edge[0]], node_dict[edge[1]], label))
-                            else:
-                                f.write("u %i %i\n" % (node_dict[edge[0]], node_dict[edge[1]]))
-                except Exception as e:
-                    log.error(e)
-
-    def read_lg(self):
+                        lines.append("v %i %s" % (n_id, '[EMPTY_NODE]' if n == '' else n))
+                for u, v, data in graph.edges(data=True):
+                    if attribute_name in data:
+                        label = data[attribute_name]
+                        if label is not None:
+                            lines.append("e %i %i %s" % (node_dict[u], node_dict[v],
+                                                         label if codes is None else codes[label]))
+                        else:
+                            lines.append("e %i %i" % (node_dict[u], node_dict[v]))
+            except Exception as e:
+                log.error(e)
+        lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def serialize_g(graphs, start=0, attribute_name='label', codes=None):
+        """
+        Serializes graphs in the .g format
+        :param start: The position of the first graph in the collection
+        :param codes: A dict of label -> integer code, to write codes rather than labels
+        :return: The serialized graphs
+        """
+        lines = []
+        for graph in graphs:
+            try:
+                lines.append("XP")
+                node_dict = {}
+                for n_id, n in enumerate(graph.nodes()):
+                    node_dict[n] = n_id + 1
+                    lines.append("v %i %s" % (n_id + 1, n if codes is None else codes[n]))
+                for u, v, data in graph.edges(data=True):
+                    if attribute_name in data:
+                        label = data[attribute_name]
+                        if label is not None:
+                            lines.append("u %i %i %s" % (node_dict[u], node_dict[v],
+                                                         label if codes is None else codes[label]))
+                        else:
+                            lines.append("u %i %i" % (node_dict[u], node_dict[v]))
+            except Exception as e:
+                log.error(e)
+        lines.append("")
+        return "\n".join(lines)
+
+    def read_lg(self, graphs=None):
         """
         Reads an LineGraph file and converts it to a list of NetworkX Graph Objects
-        :param file: LineGraph file to read
-        :return: A list of LineGraph objects
+        :param graphs: The graphs that were mined, or their GraphIndex. If not given, the index of the latest write is
+        used, or else supports are indexed by the names in the output file
+        :return: A list of FrequentGraph objects
         """
-        log.debug("Reading graphs from %s" % self.output_file)
-        frequent_graphs = []
+        return list(self.iter_lg(graphs))
 
+    def iter_lg(self, graphs=None):
+        """
+        Reads an LineGraph file line by line, yielding a FrequentGraph once its block is complete
+        :param graphs: The graphs that were mined, or their GraphIndex. If not given, the index of the latest write is
+        used, or else supports are indexed by the names in the output file
+        :return: A generator of FrequentGraph objects
+        """
+        log.debug("Reading graphs from %s" % self.output_file)
+        index = self.graph_index_for(graphs)
         with open(self.output_file, "r") as f:
-            graph_map = {}
-            node_map = {}
-            graph_id = 0
-            for line in f.readlines():
-                line = line.strip()
-                if line.startswith("t #"):
-                    node_map = {}
-                    graph_id += 1
-                    graph = nx.DiGraph(id=graph_id, embeddings=[])
-                    graph_map[graph_id] = graph
-                elif line.startswith("v"):
-                    parts = line.split(" ")
-                    label = " ".join(parts[2:]).strip('\'')
-                    graph_map[graph_id].add_node(label)
-                    node_map[parts[1]] = label
-                elif line.startswith("e"):
-                    parts = line.split(" ")
-                    label = " ".join(parts[3:]).strip('\'')
-                    graph_map[graph_id].add_edge(node_map[parts[1]], node_map[parts[2]], label=label)
-                elif line.startswith("#=>"):
-                    graph_map[graph_id].graph['embeddings'].append(line.split(" ")[1])
-
-            for graph in graph_map:
-                fg = FrequentGraph(graph_map[graph], graph_map[graph].graph['embeddings'])
-                frequent_graphs.append(fg)
+            # When the files are pipes, the index is only complete once ParSeMiS has started writing its output
+            yield from self.parse_lg(f, index)
 
-        return frequent_graphs
-
-    def read_g(self, graphs):
+    def parse_lg(self, lines, index):
+        """
+        Parses LineGraph output, yielding a FrequentGraph once its block is complete
+        :param lines: Any iterable of lines, such as an open file
+        :param index: The GraphIndex of the mined graphs
+        :return: A generator of FrequentGraph objects
+        """
+        encoded = self.label_vocabulary is not None
+        table = self.label_vocabulary if encoded else LabelVocabulary()
+        names = {str(graph_id): position for position, graph_id in reversed(list(enumerate(index.ids)))}
+        graph_id = 0
+        node_map, node_labels, edges, edge_labels, positions = None, [], [], [], []
+        for line in lines:
+            parts = line.strip().split(" ", 3)
+            kind = parts[0]
+            if kind == "t":
+                if node_map is not None:
+                    graph = CompactGraph.from_lists(table.labels, node_labels, edges, edge_labels, True, graph_id)
+                    yield FrequentGraph(graph, GraphSupport(positions, index))
+                graph_id += 1
+                node_map, node_labels, edges, edge_labels, positions = {}, [], [], [], []
+            elif kind == "v":
+                node_map[parts[1]] = len(node_labels)
+                if encoded:
+                    node_labels.append(int(parts[2]))
+                else:
+                    node_labels.append(table.encode(" ".join(parts[2:]).strip('\'')))
+            elif kind == "e":
+                edges.append(node_map[parts[1]])
+                edges.append(node_map[parts[2]])
+                if len(parts) <= 3:
+                    edge_labels.append(NONE_LABEL)
+                else:
+                    edge_labels.append(int(parts[3]) if encoded else table.encode(parts[3].strip('\'')))
+            elif kind == "#=>":
+                position = names.get(parts[1])
+                if position is None:
+                    position = index.add(parts[1])
+                positions.append(position)
+        if node_map is not None:
+            graph = CompactGraph.from_lists(table.labels, node_labels, edges, edge_labels, True, graph_id)
+            yield FrequentGraph(graph, GraphSupport(positions, index))
+
+    def read_g(self, graphs=None):
+        return list(self.iter_g(graphs))
+
+    def iter_g(self, graphs=None):
+        """
+        Reads a .g file line by line, yielding a FrequentGraph once its block is complete
+        :param graphs: The graphs that were mined, or their GraphIndex, used to map embeddings back to graph ids.
+        Defaults to the index of the latest write
+        :return: A generator of FrequentGraph objects
+        """
         log.debug("Reading graphs from %s" % self.output_file)
-        frequent_graphs = []
+        index = self.graph_index_for(graphs)
         with open(self.output_file, "r") as f:
-            graph_map = {}
-            node_map = {}
-            graph_id = 0
-            for line in f.readlines():
-                line = line.strip()
-                if line.startswith("XP"):
-                    graph_id += 1
-                    node_map = {}
-                    graph_map[graph_id] = nx.Graph(id=graph_id, embeddings=[])
-                elif line.startswith("v"):
-                    node_id = line.split(" ")[1]
-                    label = " ".join(line.split(" ")[2:])
-                    graph_map[graph_id].add_node(label)
-                    node_map[node_id] = label
-                elif line.startswith("u"):
-                    start_node_id = line.split(" ")[1]
-                    end_node_id = line.split(" ")[2]
-                    label = None
-                    if len(line.split(" ")) >= 3:
-                        label = " ".join(line.split(" ")[3:])
-                    graph_map[graph_id].add_edge(node_map[start_node_id], node_map[end_node_id], label=label)
-                elif line.startswith("% => "):
-                    line = re.sub("(% => \d{1,}\[)", "", line)
-                    line = re.sub("\]$", "", line)
-                    for index in line.split(","):
-                        if index != "":
-                            appears_in_id = graphs[int(index.strip())].graph['id']
-                            graph_map[graph_id].graph['embeddings'].append(appears_in_id)
-
-            for graph in graph_map:
-                fg = FrequentGraph(graph_map[graph], graph_map[graph].graph['embeddings'])
-                frequent_graphs.append(fg)
+            yield from self.parse_g(f, index)
 
-        return frequent_graphs
+    def parse_g(self, lines, index):
+        """
+        Parses .g output, yielding a FrequentGraph once its block is complete
+        :param lines: Any iterable of lines, such as an open file
+        :param index: The GraphIndex of the mined graphs
+        :return: A generator of FrequentGraph objects
+        """
+        encoded = self.label_vocabulary is not None
+        table = self.label_vocabulary if encoded else LabelVocabulary()
+        empty = np.empty(0, dtype=np.int32)
+        graph_id = 0
+        node_map, node_labels, edges, edge_labels, positions = None, [], [], [], empty
+        for line in lines:
+            line = line.strip()
+            parts = line.split(" ", 3)
+            kind = parts[0]
+            if kind == "XP":
+                if node_map is not None:
+                    graph = CompactGraph.from_lists(table.labels, node_labels, edges, edge_labels, False, graph_id)
+                    yield FrequentGraph(graph, GraphSupport(positions, index))
+                graph_id += 1
+                node_map, node_labels, edges, edge_labels, positions = {}, [], [], [], empty
+            elif kind == "v":
+                node_map[parts[1]] = len(node_labels)
+                node_labels.append(int(parts[2]) if encoded else table.encode(" ".join(parts[2:])))
+            elif kind == "u":
+                edges.append(node_map[parts[1]])
+                edges.append(node_map[parts[2]])
+                if len(parts) <= 3:
+                    edge_labels.append(NONE_LABEL)
+                else:
+                    edge_labels.append(int(parts[3]) if encoded else table.encode(parts[3]))
+            elif kind == "%":
+                indices = np.fromstring(line[line.index("[") + 1:-1], dtype=np.int32, sep=",")
+                positions = np.concatenate((positions, indices))
+        if node_map is not None:
+            graph = CompactGraph.from_lists(table.labels, node_labels, edges, edge_labels, False, graph_id)
+            yield FrequentGraph(graph, GraphSupport(positions, index))
+
+    def graph_index_for(self, graphs):
+        """
+        :param graphs: The mined graphs, their GraphIndex, or None for the index recorded by the latest write
+        :return: A GraphIndex
+        """
+        if isinstance(graphs, GraphIndex):
+            return graphs
+        if graphs is not None:
+            return GraphIndex.from_graphs(graphs)
+        if self.graph_index is not None:
+            return self.graph_index
+        return GraphIndex()
 
     @staticmethod
     def get_label_from_edge(g, edge, attribute_name='label'):
@@ -274,7 +795,7 @@ class ParsemisMiner:
             edge_attributes = g.get_edge_data(edge[1], edge[0])
 
         labels = []
-        if type(g) == nx.MultiDiGraph or type(g) == nx.MultiGraph:
+        if g.is_multigraph():
             for index in edge_attributes:
                 if attribute_name in edge_attributes[index]:
                     labels.append(edge_attributes[index][attribute_name])
@@ -288,11 +809,21 @@ class ParsemisMiner:
     def is_subgraph(graph, subgraph):
         if not set(subgraph.nodes()).issubset(graph.nodes()):
             return False
-        else:
-            for edge in subgraph.edges():
-                return ParsemisMiner.graph_has_edge(graph, subgraph, edge)
+        for edge in subgraph.edges():
+            if not ParsemisMiner.graph_has_edge(graph, subgraph, edge):
+                return False
         return True
 
+    @staticmethod
+    def contains_many(patterns, graphs):
+        """
+        Checks every pattern against every graph, with the same semantics as is_subgraph
+        :param patterns: NetworkX graphs or FrequentGraph objects
+        :param graphs: NetworkX graphs
+        :return: A boolean numpy array of shape (len(patterns), len(graphs))
+        """
+        return ContainmentIndex(graphs).contains_many(patterns)
+
     @staticmethod
     def graph_has_edge(graph, subgraph, edge):
         if graph.has_edge(edge[0], edge[1]) or (not nx.is_directed(graph) and graph.has_edge(edge[1], edge[0])):
@@ -322,6 +853,28 @@ class ParsemisMiner:
         return np.prod(np.column_stack((a_values, b_values)), axis=1).sum() / len(a_values)
 
 
+    @staticmethod
+    def calculate_dot_product_similarity_matrix(sub_graphs, super_graphs, n_workers=None):
+        """
+        Calculates calculate_dot_product_similarity for every pair of sub graph and super graph at once
+        :param sub_graphs: NetworkX graphs or FrequentGraph objects
+        :param super_graphs: NetworkX graphs
+        :param n_workers: Splits the sub graphs across a process pool of this size
+        :return: A numpy array of shape (len(sub_graphs), len(super_graphs))
+        """
+        return SimilarityIndex(super_graphs).dot_product_matrix(sub_graphs, n_workers)
+
+    @staticmethod
+    def calculate_jaccard_similarity_matrix(sub_graphs, super_graphs, n_workers=None):
+        """
+        Calculates calculate_jaccard_similarity for every pair of sub graph and super graph at once
+        :param sub_graphs: NetworkX graphs or FrequentGraph objects
+        :param super_graphs: NetworkX graphs
+        :param n_workers: Splits the sub graphs across a process pool of this size
+        :return: A numpy array of shape (len(sub_graphs), len(super_graphs))
+        """
+        return SimilarityIndex(super_graphs).jaccard_matrix(sub_graphs, n_workers)
+
     @staticmethod
     def calculate_jaccard_similarity(sub_graph: nx.Graph, super_graph: nx.Graph):
         """
@@ -1,3 +1,5 @@
+import tempfile
+import types
 import unittest
 
 import networkx as nx
@@ -192,6 +194,17 @@ class TestParsemisWrapperMethods(unittest.TestCase):
 
         self.assertFalse(ParsemisMiner.is_subgraph(G, invalid_subgraph_b))
 
+    def test_is_subgraph_checks_every_edge(self):
+        G = nx.Graph()
+        G.add_edge(1, 2, label='a')
+        G.add_edge(2, 3, label='b')
+
+        subgraph = nx.Graph()
+        subgraph.add_edge(1, 2, label='a')
+        subgraph.add_edge(2, 3, label='c')
+
+        self.assertFalse(ParsemisMiner.is_subgraph(G, subgraph))
+
     def test_frequent_graph(self):
         G = nx.MultiDiGraph()
         G.add_edge(1, 2, label='a')
@@ -235,4 +248,85 @@ class TestParsemisWrapperMethods(unittest.TestCase):
         self.assertEqual(ParsemisMiner.calculate_dot_product_similarity(sub_graph, super_graph), 0.6, 'Dot Product')
         self.assertEqual(ParsemisMiner.calculate_jaccard_similarity(sub_graph, super_graph), 0.6, 'Jaccard Similarity')
 
+    def _miner_with_output(self, output, mine_undirected=True):
+        data_location = tempfile.mkdtemp()
+        miner = ParsemisMiner(data_location, mine_undirected=mine_undirected)
+        with open(miner.output_file, "w") as f:
+            f.write(output)
+        return miner
+
+    def test_iter_g_yields_each_block(self):
+        graphs = [nx.Graph(id="g%i" % i) for i in range(4)]
+        miner = self._miner_with_output(
+            "XP\nv 1 a\nv 2 b\nu 1 2 x\n% => 2[0,3]\n"
+            "XP\nv 1 a\n% => 3[0, 1, 2]\n"
+        )
+
+        frequent_graphs = miner.iter_frequent_graphs(graphs)
+        self.assertIsInstance(frequent_graphs, types.GeneratorType)
+
+        first = next(frequent_graphs)
+        self.assertEqual(first.appears_in, ["g0", "g3"])
+        self.assertEqual(first.graph.edges["a", "b"]["label"], "x")
+
+        second = next(frequent_graphs)
+        self.assertEqual(second.appears_in, ["g0", "g1", "g2"])
+        self.assertEqual(list(second.graph.nodes()), ["a"])
+
+        self.assertRaises(StopIteration, next, frequent_graphs)
+        self.assertEqual(len(miner.read_g(graphs)), 2)
+
+    def test_iter_lg_yields_each_block(self):
+        miner = self._miner_with_output(
+            "t # 1\nv 0 a\nv 1 b\ne 0 1 x\n#=> g0\n#=> g2\n"
+            "t # 2\nv 0 b\n#=> g1\n",
+            mine_undirected=False
+        )
+
+        frequent_graphs = list(miner.iter_frequent_graphs(None))
+        self.assertEqual(len(frequent_graphs), 2)
+        self.assertEqual(frequent_graphs[0].appears_in, ["g0", "g2"])
+        self.assertEqual(frequent_graphs[1].appears_in, ["g1"])
+        self.assertTrue(frequent_graphs[0].graph.has_edge("a", "b"))
+
+    def test_write_g_streams_generators(self):
+        def graphs():
+            for i in range(25):
+                graph = nx.Graph(id="g%i" % i)
+                graph.add_edge("a", "n%i" % i, label="x")
+                graph.add_edge("a", "b")
+                yield graph
+
+        miner = ParsemisMiner(tempfile.mkdtemp())
+        self.assertEqual(miner.write_g(graphs(), chunk_size=4), 25)
+        with open(miner.input_file) as f:
+            serial = f.read()
+        self.assertEqual(serial.count("XP\n"), 25)
+        self.assertIn("XP\nv 1 a\nv 2 n3\nv 3 b\nu 1 2 x\nXP\n", serial)
+        self.assertEqual(miner.graph_index.ids[3], "g3")
+
+        self.assertEqual(miner.write_g(graphs(), n_workers=3, chunk_size=4), 25)
+        with open(miner.input_file) as f:
+            self.assertEqual(f.read(), serial)
+
+    def test_write_lg_multigraph(self):
+        graph = nx.MultiDiGraph()
+        graph.add_edge("a", "b", label="x")
+        graph.add_edge("a", "b", label="y")
+
+        miner = ParsemisMiner(tempfile.mkdtemp(), mine_undirected=False)
+        miner.write_lg(iter([graph]))
+        with open(miner.input_file) as f:
+            self.assertEqual(f.read(), "t # 0\nv 0 a\nv 1 b\ne 0 1 x\ne 0 1 y\n")
+
+    def test_isolated_job(self):
+        miner = ParsemisMiner(tempfile.mkdtemp(), mine_undirected=False, debug=False)
+        directory = tempfile.mkdtemp()
+        job = miner.isolated_job(directory)
+        self.assertEqual(job.input_file, "%s/input.lg" % directory)
+        self.assertEqual(job.output_file, "%s/output.lg" % directory)
+        self.assertEqual(miner.input_file, "%s/input.lg" % miner.data_location)
+        self.assertIs(job.scheduler, miner.scheduler)
+        self.assertFalse(job.mine_undirected)
+
     # def jaccard_similarity_is_one_when_same(self):
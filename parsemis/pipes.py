@@ -0,0 +1,160 @@
+"""
+Mining through named pipes rather than files.
+
+The input and output files handed to ParSeMiS are FIFOs in a fresh temporary directory. A writer thread serializes
+the graphs into the input FIFO while ParSeMiS reads them, and the output FIFO is parsed while ParSeMiS writes it,
+so nothing is written to disk and the serialization, mining and parsing phases overlap.
+
+ParSeMiS runs as an InstrumentedProcess, as it does for the file transport, so the miner's last_report gets its output,
+exit code and resource usage. The bytes passed through each FIFO are counted, and the write and read phases are timed
+as the writer thread and the parser see them, overlapping each other and the run.
+"""
+import logging as log
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Sequence
+from contextlib import nullcontext
+
+from parsemis.report import InstrumentedProcess
+from parsemis.scheduler import InputStatistics, format_size
+from parsemis.support import GraphIndex
+
+
+def mine_piped(miner, graphs, serialization_workers=None, deadline=None, **kwargs):
+    """
+    Mines graphs through FIFOs, yielding FrequentGraph objects as ParSeMiS writes them
+    :param deadline: A time.monotonic() time at which ParSeMiS is terminated, whether or not it has written anything.
+    No fragment is yielded after it, and the run isn't treated as failed
+    """
+    directory = tempfile.mkdtemp(prefix="parsemis-")
+    job = miner.isolated_job(directory)
+    os.mkfifo(job.input_file)
+    os.mkfifo(job.output_file)
+    job.graph_index = miner.graph_index = GraphIndex()
+
+    heap = None
+    if job.scheduler is not None:
+        # The graphs are only written once ParSeMiS has started, so a sequence is measured up front, and the heap of a
+        # generator is left at the scheduler's maximum
+        job.input_statistics = InputStatistics.from_graphs(graphs) if isinstance(graphs, Sequence) else None
+        heap, minimum_frequency = job.scheduler.plan(job, **kwargs)
+        kwargs = dict(kwargs, heap_size=format_size(heap), minimum_frequency=minimum_frequency)
+        job.scheduler.acquire(heap)
+
+    report = job.last_report
+    try:
+        process = InstrumentedProcess(job.build_commands(**kwargs), report)
+    except BaseException:
+        if heap is not None:
+            job.scheduler.release(heap)
+        raise
+    expired = threading.Event()
+    timer = None
+    if deadline is not None:
+        timer = threading.Timer(max(deadline - time.monotonic(), 0), _expire, args=(process, expired))
+        timer.daemon = True
+        timer.start()
+    errors = []
+    done = threading.Event()
+    writer = threading.Thread(target=_feed, args=(job, graphs, serialization_workers, errors, report), daemon=True)
+    watchdog = threading.Thread(target=_unblock_on_exit, args=(process, job, writer, done), daemon=True)
+    writer.start()
+    watchdog.start()
+
+    finished = False
+    try:
+        for frequent_graph in _read(job, report):
+            # The last fragment read after the deadline may have been cut short by the termination
+            if expired.is_set():
+                break
+            yield frequent_graph
+        finished = True
+    finally:
+        if timer is not None:
+            timer.cancel()
+        if not finished and process.poll() is None:
+            process.terminate()
+        return_code = process.wait()
+        if heap is not None:
+            job.scheduler.release(heap)
+        done.set()
+        watchdog.join()
+        writer.join()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if expired.is_set():
+        log.debug("Mining stopped at its deadline")
+        return
+    if return_code != 0:
+        raise RuntimeError("ParSeMiS exited with code %i" % return_code)
+    if errors:
+        raise errors[0]
+
+
+def _expire(process, expired):
+    expired.set()
+    if process.poll() is None:
+        log.debug("Terminating ParSeMiS process %i at its deadline" % process.pid)
+        process.terminate()
+
+
+def _read(job, report):
+    """
+    Parses the output FIFO, counting the bytes read from it
+    """
+    index = job.graph_index
+    with open(job.output_file, "rb") as f, report.phase('read') if report is not None else nullcontext():
+        yield from job.parse_frequent_graphs(_decoded(f, report), index)
+
+
+def _decoded(lines, report):
+    for line in lines:
+        if report is not None:
+            report.bytes_read += len(line)
+        yield line.decode("utf-8")
+
+
+def _feed(job, graphs, n_workers, errors, report):
+    serialize = job.serialize_g if job.mine_undirected else job.serialize_lg
+    try:
+        with open(job.input_file, "wb", buffering=1 << 20) as f, \
+                report.phase('write') if report is not None else nullcontext():
+            for block in job.serialize_chunks(graphs, serialize, n_workers):
+                data = block.encode("utf-8")
+                f.write(data)
+                if report is not None:
+                    report.bytes_written += len(data)
+    except BrokenPipeError:
+        log.error("ParSeMiS stopped reading %s" % job.input_file)
+    except BaseException as e:
+        errors.append(e)
+
+
+def _unblock_on_exit(process, job, writer, done):
+    """
+    Once ParSeMiS exits, opens the far side of both FIFOs so that the writer thread and the reader, if they are
+    blocked in open() or on a full pipe, can finish
+    """
+    process.wait()
+
+    input_fifo = os.open(job.input_file, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        while writer.is_alive():
+            try:
+                if len(os.read(input_fifo, 1 << 16)) == 0:
+                    time.sleep(0.01)
+            except BlockingIOError:
+                time.sleep(0.01)
+    finally:
+        os.close(input_fifo)
+
+    while not done.is_set():
+        try:
+            os.close(os.open(job.output_file, os.O_WRONLY | os.O_NONBLOCK))
+            return
+        except OSError:
+            # The reader hasn't opened the FIFO yet, or has already finished with it
+            done.wait(0.01)
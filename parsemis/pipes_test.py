@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from parsemis.parsemis_wrapper import ParsemisMiner
+from parsemis.testing import NodeAndEdgeMiner, as_dict, random_graphs
+
+STUB = """
+import sys
+sys.path.insert(0, %r)
+from parsemis.testing import NodeAndEdgeMiner
+miner = NodeAndEdgeMiner.__new__(NodeAndEdgeMiner)
+miner.input_file, miner.output_file = sys.argv[1:3]
+print("done: 1")
+sys.exit(miner.perform_mining(minimum_frequency=sys.argv[3]) or int(sys.argv[4]))
+""" % os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+class PipedStubMiner(ParsemisMiner):
+    """
+    Runs NodeAndEdgeMiner in a child process in place of the JVM
+    """
+
+    exit_code = 0
+
+    def build_commands(self, **kwargs):
+        return [sys.executable, "-c", STUB, self.input_file, self.output_file,
+                str(kwargs.get('minimum_frequency', '0.05')), str(self.exit_code)]
+
+
+class TestPipes(unittest.TestCase):
+
+    def test_pipe_matches_file(self):
+        graphs = random_graphs(40)
+        expected = as_dict(NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs, minimum_frequency=5))
+
+        miner = PipedStubMiner(tempfile.mkdtemp(), transport='pipe')
+        self.assertEqual(as_dict(miner.mine_graphs(graphs, minimum_frequency=5)), expected)
+        self.assertEqual(as_dict(miner.mine_graphs(iter(graphs), lazy=True, minimum_frequency=5)), expected)
+        self.assertFalse(os.path.exists(miner.input_file))
+
+    def test_pipe_early_stop(self):
+        miner = PipedStubMiner(tempfile.mkdtemp(), transport='pipe')
+        frequent_graphs = miner.mine_graphs(random_graphs(40), lazy=True, minimum_frequency=1)
+        next(frequent_graphs)
+        frequent_graphs.close()
+
+    def test_pipe_failure(self):
+        miner = PipedStubMiner(tempfile.mkdtemp(), transport='pipe')
+        miner.exit_code = 2
+        with self.assertRaises(RuntimeError):
+            miner.mine_graphs(random_graphs(10), minimum_frequency=1)
+
+    def test_pipe_rejects_cache(self):
+        with self.assertRaises(ValueError):
+            ParsemisMiner(tempfile.mkdtemp(), transport='pipe', cache=object())
+
+
+if __name__ == '__main__':
+    unittest.main()
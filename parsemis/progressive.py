@@ -0,0 +1,143 @@
+"""
+Progressive mining, yielding fragments as soon as ParSeMiS has written them rather than once it has exited.
+
+ParSeMiS' Miner.run parses its input, then mines, and only then prints its output, so no fragment can be read while
+the search is still running: fragments arrive once it has finished, while the output is being written. The output
+file is tailed as it is written: lines are read as they appear, with a partly written line held back until it is
+complete, and a fragment is yielded as soon as the next one starts (or the output ends), so only complete fragments
+are ever returned. With the pipe transport the output pipe is read the same way.
+
+Only a time budget can cut the search itself short: the JVM is terminated once it runs out, even before any output,
+and the caller keeps whatever has been yielded so far. The other stop conditions, a number of patterns or a
+predicate that accepts a fragment, are only checked as fragments are read, so they stop parsing the output early
+and terminate the JVM while it is still writing, but not the search.
+"""
+import logging as log
+import os
+import subprocess
+import time
+
+from parsemis.pipes import mine_piped
+from parsemis.report import InstrumentedProcess
+from parsemis.scheduler import format_size
+
+
+class _BudgetExhausted(Exception):
+    pass
+
+
+def tail_lines(path, process, deadline=None, poll_interval=0.1):
+    """
+    Follows a file that a process is writing, yielding each complete line, until the process exits
+    :param deadline: A time.monotonic() time after which to stop waiting, raising _BudgetExhausted
+    """
+    def wait():
+        if deadline is not None and time.monotonic() >= deadline:
+            raise _BudgetExhausted()
+        time.sleep(poll_interval)
+
+    while not os.path.exists(path):
+        if process.poll() is not None:
+            return
+        wait()
+
+    with open(path, "r") as f:
+        partial = ""
+        while True:
+            exited = process.poll() is not None
+            line = f.readline()
+            if line.endswith("\n"):
+                yield partial + line
+                partial = ""
+            elif line:
+                partial += line
+            elif exited:
+                if partial:
+                    yield partial
+                return
+            else:
+                wait()
+
+
+def _until(frequent_graphs, max_patterns, deadline, stop_when):
+    count = 0
+    for frequent_graph in frequent_graphs:
+        count += 1
+        yield frequent_graph
+        if max_patterns is not None and count >= max_patterns:
+            return
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+        if stop_when is not None and stop_when(frequent_graph):
+            return
+
+
+def _counted(frequent_graphs, report):
+    report.n_fragments = 0
+    for frequent_graph in frequent_graphs:
+        report.n_fragments += 1
+        yield frequent_graph
+
+
+def _stop(process, timeout=10):
+    if process.poll() is None:
+        log.debug("Terminating ParSeMiS process %i" % process.pid)
+        process.terminate()
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return process.wait()
+
+
+def mine_progressive(miner, graphs, max_patterns=None, time_budget=None, stop_when=None, serialization_workers=None,
+                     poll_interval=0.1, **kwargs):
+    """
+    Mines graphs, yielding fragments as ParSeMiS writes its output once the search has finished. See
+    ParsemisMiner.mine_progressive
+    """
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    report = miner.last_report
+
+    if miner.transport == 'pipe':
+        frequent_graphs = mine_piped(miner, graphs, serialization_workers, deadline, **kwargs)
+        try:
+            yield from _counted(_until(frequent_graphs, max_patterns, deadline, stop_when), report)
+        finally:
+            frequent_graphs.close()
+            report.finish()
+        return
+
+    with report.phase('write'):
+        miner.write_graph(graphs, serialization_workers)
+    report.bytes_written = os.path.getsize(miner.input_file)
+    if os.path.exists(miner.output_file):
+        os.remove(miner.output_file)
+    heap = None
+    if miner.scheduler is not None:
+        # Fragments are yielded as they are found, so a run that runs out of memory isn't retried
+        heap, minimum_frequency = miner.scheduler.plan(miner, **kwargs)
+        kwargs = dict(kwargs, heap_size=format_size(heap), minimum_frequency=minimum_frequency)
+        miner.scheduler.acquire(heap)
+    try:
+        process = InstrumentedProcess(miner.build_commands(**kwargs), report)
+        lines = tail_lines(miner.output_file, process, deadline, poll_interval)
+        finished = False
+        try:
+            with report.phase('read'):
+                yield from _counted(_until(miner.parse_frequent_graphs(lines, miner.graph_index), max_patterns,
+                                           deadline, stop_when), report)
+            finished = process.poll() is not None
+        except _BudgetExhausted:
+            log.debug("Mining stopped after %.1fs" % time_budget)
+        finally:
+            return_code = _stop(process)
+            if os.path.exists(miner.output_file):
+                report.bytes_read = os.path.getsize(miner.output_file)
+            report.finish()
+    finally:
+        if heap is not None:
+            miner.scheduler.release(heap)
+
+    if finished and return_code != 0:
+        raise RuntimeError("ParSeMiS exited with code %i" % return_code)
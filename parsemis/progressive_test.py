@@ -0,0 +1,96 @@
+import sys
+import tempfile
+import time
+import unittest
+
+from parsemis.parsemis_wrapper import ParsemisMiner
+from parsemis.testing import random_graphs
+
+WRITER = """
+import sys, time
+n_fragments, delay, exit_code = int(sys.argv[2]), float(sys.argv[3]), int(sys.argv[4])
+with open(sys.argv[1], "w") as f:
+    for i in range(n_fragments):
+        # Each fragment is flushed in two parts, splitting its node line
+        f.write("XP\\nv 1 lab")
+        f.flush()
+        time.sleep(delay)
+        f.write("el%i\\n%% => 2[0,%i]\\n" % (i, 1 + i % 4))
+        f.flush()
+sys.exit(exit_code)
+"""
+
+
+class SlowWriterMiner(ParsemisMiner):
+    """
+    Stands in for a ParSeMiS run that writes one single node fragment every delay seconds
+    """
+
+    n_fragments = 10
+    delay = 0.05
+    exit_code = 0
+
+    def build_commands(self, **kwargs):
+        return [sys.executable, "-c", WRITER, self.output_file, str(self.n_fragments), str(self.delay),
+                str(self.exit_code)]
+
+
+class SearchingMiner(ParsemisMiner):
+    """
+    Stands in for a ParSeMiS run whose search outlasts any test, and so never writes output
+    """
+
+    def build_commands(self, **kwargs):
+        return [sys.executable, "-c", "import time; time.sleep(60)"]
+
+
+class TestProgressiveMining(unittest.TestCase):
+
+    def labels(self, frequent_graphs):
+        return [list(frequent_graph.graph.nodes())[0] for frequent_graph in frequent_graphs]
+
+    def test_complete_run(self):
+        miner = SlowWriterMiner(tempfile.mkdtemp())
+        frequent_graphs = list(miner.mine_progressive(random_graphs(5), poll_interval=0.01))
+        self.assertEqual(self.labels(frequent_graphs), ["label%i" % i for i in range(10)])
+        self.assertEqual(frequent_graphs[2].appears_in.tolist(), ["g0", "g3"])
+
+    def test_max_patterns(self):
+        miner = SlowWriterMiner(tempfile.mkdtemp())
+        miner.n_fragments, miner.delay = 1000, 0.02
+        start = time.monotonic()
+        frequent_graphs = list(miner.mine_progressive(random_graphs(5), max_patterns=3, poll_interval=0.01))
+        self.assertEqual(self.labels(frequent_graphs), ["label0", "label1", "label2"])
+        self.assertLess(time.monotonic() - start, 10)
+
+    def test_time_budget_and_predicate(self):
+        miner = SlowWriterMiner(tempfile.mkdtemp())
+        miner.n_fragments, miner.delay = 1000, 0.05
+        start = time.monotonic()
+        frequent_graphs = list(miner.mine_progressive(random_graphs(5), time_budget=0.5, poll_interval=0.01))
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertLess(len(frequent_graphs), 1000)
+        self.assertEqual(self.labels(frequent_graphs), ["label%i" % i for i in range(len(frequent_graphs))])
+
+        frequent_graphs = list(miner.mine_progressive(random_graphs(5), poll_interval=0.01,
+                                                      stop_when=lambda fg: "label4" in fg.graph))
+        self.assertEqual(len(frequent_graphs), 5)
+
+    def test_time_budget_stops_the_search(self):
+        for transport in ('file', 'pipe'):
+            miner = SearchingMiner(tempfile.mkdtemp(), transport=transport)
+            start = time.monotonic()
+            frequent_graphs = list(miner.mine_progressive(random_graphs(5), time_budget=0.5, poll_interval=0.01))
+            self.assertEqual(frequent_graphs, [])
+            self.assertLess(time.monotonic() - start, 10)
+            self.assertIsNotNone(miner.last_report.exit_code)
+
+    def test_failure(self):
+        miner = SlowWriterMiner(tempfile.mkdtemp())
+        miner.exit_code = 1
+        with self.assertRaises(RuntimeError):
+            list(miner.mine_progressive(random_graphs(5), poll_interval=0.01))
+
+
+if __name__ == '__main__':
+    unittest.main()
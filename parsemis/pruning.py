@@ -0,0 +1,93 @@
+"""
+Label frequency pruning of the input, before it is written for ParSeMiS.
+
+A fragment can only appear in the graphs that contain all of its labels, so a node label, or an edge with its end
+labels, that appears in fewer graphs than the minimum frequency can't be part of any frequent fragment. Dropping
+those nodes and edges, and the graphs left empty, shrinks the input ParSeMiS has to load and search without
+changing the result.
+
+ParSeMiS reports supports as positions in the pruned collection, so the positions of the graphs that were kept are
+recorded, and supports are mapped back to positions in the original collection once the fragments are read.
+"""
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+
+from parsemis.support import GraphIndex, GraphSupport
+
+# The graph class of the pruned copy of a graph, by whether it is directed and whether it is a multigraph. Keeping
+# multigraphs keeps their parallel edges, which may differ in their labels
+GRAPH_CLASSES = {
+    (False, False): nx.Graph,
+    (True, False): nx.DiGraph,
+    (False, True): nx.MultiGraph,
+    (True, True): nx.MultiDiGraph,
+}
+
+
+def _edge_key(graph, u, v, label):
+    if not graph.is_directed() and str(v) < str(u):
+        u, v = v, u
+    return u, v, label
+
+
+def label_document_frequencies(graphs, attribute_name='label'):
+    """
+    Counts the number of graphs every node label and every labelled edge appears in
+    :return: A Counter of node label -> graphs, and a Counter of (source, target, edge label) -> graphs
+    """
+    node_frequencies = Counter()
+    edge_frequencies = Counter()
+    for graph in graphs:
+        node_frequencies.update(list(graph.nodes()))
+        edge_frequencies.update({_edge_key(graph, u, v, data[attribute_name])
+                                 for u, v, data in graph.edges(data=True) if attribute_name in data})
+    return node_frequencies, edge_frequencies
+
+
+class LabelPruning:
+    """
+    A collection with its infrequent nodes and edges dropped, and the positions of the graphs that were kept
+    """
+
+    __slots__ = ('threshold', 'graphs', 'positions', 'index')
+
+    def __init__(self, graphs, threshold, attribute_name='label') -> None:
+        """
+        :param graphs: The NetworkX graphs to prune, as a sequence
+        :param threshold: The minimum number of graphs a fragment has to appear in
+        """
+        super().__init__()
+        self.threshold = threshold
+        self.graphs = []
+        self.index = GraphIndex.from_graphs(graphs)
+        node_frequencies, edge_frequencies = label_document_frequencies(graphs, attribute_name)
+
+        positions = []
+        for position, graph in enumerate(graphs):
+            pruned = GRAPH_CLASSES[graph.is_directed(), graph.is_multigraph()]()
+            pruned.graph['id'] = graph.graph.get('id', position)
+            pruned.add_nodes_from(node for node in graph.nodes() if node_frequencies[node] >= threshold)
+            for u, v, data in graph.edges(data=True):
+                if attribute_name not in data:
+                    continue
+                if edge_frequencies[_edge_key(graph, u, v, data[attribute_name])] >= threshold:
+                    pruned.add_edge(u, v, **{attribute_name: data[attribute_name]})
+            if pruned.number_of_nodes() > 0:
+                self.graphs.append(pruned)
+                positions.append(position)
+        self.positions = np.asarray(positions, dtype=np.int32)
+
+    @property
+    def n_dropped(self):
+        return len(self.index) - len(self.graphs)
+
+    def restore(self, frequent_graphs):
+        """
+        Maps the supports of fragments mined from the pruned graphs back to the original collection
+        :return: A generator of FrequentGraph objects whose supports are over index
+        """
+        for frequent_graph in frequent_graphs:
+            positions = self.positions[frequent_graph.appears_in.positions]
+            yield type(frequent_graph)(frequent_graph.compact, GraphSupport(positions, self.index))
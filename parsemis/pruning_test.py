@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+
+import networkx as nx
+
+from parsemis.pruning import LabelPruning, label_document_frequencies
+from parsemis.testing import NodeAndEdgeMiner, as_dict, random_graphs
+
+
+class TestLabelPruning(unittest.TestCase):
+
+    def test_document_frequencies(self):
+        first = nx.Graph()
+        first.add_edge("a", "b", label="x")
+        first.add_edge("c", "b", label="x")
+        second = nx.Graph()
+        second.add_edge("b", "a", label="x")
+        nodes, edges = label_document_frequencies([first, second])
+        self.assertEqual(nodes, {"a": 2, "b": 2, "c": 1})
+        self.assertEqual(edges, {("a", "b", "x"): 2, ("b", "c", "x"): 1})
+
+    def test_prunes_infrequent_labels_and_empty_graphs(self):
+        graphs = [nx.Graph(id="g%i" % i) for i in range(4)]
+        for graph in graphs[:3]:
+            graph.add_edge("a", "b", label="x")
+        graphs[0].add_edge("b", "c", label="y")
+        graphs[3].add_node("d")
+
+        pruning = LabelPruning(graphs, 2)
+        self.assertEqual(pruning.positions.tolist(), [0, 1, 2])
+        self.assertEqual(pruning.n_dropped, 1)
+        self.assertEqual(set(pruning.graphs[0].nodes()), {"a", "b"})
+        self.assertEqual(pruning.graphs[0].graph['id'], "g0")
+
+    def test_keeps_parallel_edges(self):
+        graphs = [nx.MultiGraph(id="g%i" % i) for i in range(3)]
+        for graph in graphs:
+            graph.add_edge("a", "b", label="x")
+            graph.add_edge("a", "b", label="y")
+
+        pruning = LabelPruning(graphs, 3)
+        self.assertTrue(all(graph.is_multigraph() for graph in pruning.graphs))
+        self.assertEqual(pruning.graphs[0].number_of_edges(), 2)
+
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+        result = miner.mine_graphs(graphs, prune_labels=True, minimum_frequency=3)
+        edge_labels = {label for frequent_graph in result for _, _, label in frequent_graph.graph.edges(data='label')}
+        self.assertEqual(edge_labels, {"x", "y"})
+        self.assertTrue(all(frequent_graph.appears_in.tolist() == ["g0", "g1", "g2"] for frequent_graph in result))
+
+    def test_mining_matches_unpruned(self):
+        graphs = random_graphs(80, seed=2)
+        graphs[7] = nx.Graph(id="lonely")
+        graphs[7].add_edge("p", "q", label="z")
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+
+        for minimum_frequency in ["10%", 7, 0.3]:
+            expected = as_dict(miner.mine_graphs(graphs, minimum_frequency=minimum_frequency))
+            pruned = miner.mine_graphs(iter(graphs), prune_labels=True, minimum_frequency=minimum_frequency)
+            self.assertEqual(as_dict(pruned), expected)
+            self.assertEqual(len(pruned.index), len(graphs))
+            self.assertIn('prune', pruned.report.phases)
+
+            lazy = miner.mine_graphs(graphs, lazy=True, prune_labels=True, minimum_frequency=minimum_frequency)
+            self.assertEqual(as_dict(lazy), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
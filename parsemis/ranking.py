@@ -0,0 +1,228 @@
+"""
+Scoring and ranking of frequent graphs.
+
+Every measure is computed for all of the fragments of a result at once, from arrays of their supports and sizes, or
+from a fragments x classes table of counts when the input graphs carry a class:
+
+- support: the number of input graphs a fragment appears in
+- normalized_support: the relative support times the fragment's size (its nodes plus its edges), so that a large
+  fragment can outrank a small one that is only slightly more frequent
+- closed / maximal: the support of fragments that have no super-fragment in the result with the same support (closed)
+  or no super-fragment at all (maximal). Other fragments are left unranked
+- information_gain / chi_square: how well a fragment's presence separates the classes of the input graphs
+
+rank_patterns fills in the rank of every fragment of a result, 1 being the best. top_k keeps the best k fragments of
+a stream in a heap, so fragments can be scored one at a time as they are parsed, without keeping them all. Closedness
+and maximality depend on the other fragments, so they can't be streamed.
+"""
+import heapq
+from itertools import count
+
+import numpy as np
+
+from parsemis.containment import ContainmentIndex
+from parsemis.results import MiningResult
+from parsemis.support import GraphSupport
+
+MEASURES = ('support', 'normalized_support', 'closed', 'maximal', 'information_gain', 'chi_square')
+STREAMING_MEASURES = ('support', 'normalized_support', 'information_gain', 'chi_square')
+DISCRIMINATIVE_MEASURES = ('information_gain', 'chi_square')
+
+
+def graph_classes(graphs, attribute_name='class'):
+    """
+    :return: The class of each graph, from a graph attribute
+    """
+    return [graph.graph[attribute_name] for graph in graphs]
+
+
+def _class_codes(classes):
+    codes = np.unique(np.asarray(classes, dtype=object).astype(str), return_inverse=True)[1]
+    return codes.astype(np.int64), int(codes.max()) + 1 if len(codes) > 0 else 0
+
+
+def _entropy(counts):
+    """
+    :param counts: An array of shape (n, n_classes)
+    :return: The entropy of each row's distribution, in bits
+    """
+    totals = counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = np.where(totals > 0, counts / totals, 0)
+        terms = np.where(p > 0, p * np.log2(p), 0)
+    return -terms.sum(axis=1)
+
+
+def information_gain(class_counts, class_totals):
+    """
+    :param class_counts: An array of shape (n_patterns, n_classes) of the graphs of each class a fragment appears in
+    :param class_totals: An array of the number of graphs of each class
+    :return: The information gain of splitting the graphs on each fragment's presence
+    """
+    class_counts = np.asarray(class_counts, dtype=np.float64)
+    class_totals = np.asarray(class_totals, dtype=np.float64)
+    n = class_totals.sum()
+    absent = class_totals - class_counts
+    present_share = class_counts.sum(axis=1) / n
+    return _entropy(class_totals[np.newaxis]) - present_share * _entropy(class_counts) \
+        - (1 - present_share) * _entropy(absent)
+
+
+def chi_square(class_counts, class_totals):
+    """
+    :return: The chi-square statistic of the contingency table of each fragment's presence against the classes
+    """
+    class_counts = np.asarray(class_counts, dtype=np.float64)
+    class_totals = np.asarray(class_totals, dtype=np.float64)
+    n = class_totals.sum()
+    statistic = np.zeros(len(class_counts))
+    for observed, n_rows in ((class_counts, class_counts.sum(axis=1)),
+                             (class_totals - class_counts, n - class_counts.sum(axis=1))):
+        expected = n_rows[:, np.newaxis] * class_totals[np.newaxis] / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            statistic += np.where(expected > 0, (observed - expected) ** 2 / expected, 0).sum(axis=1)
+    return statistic
+
+
+def _size(frequent_graph):
+    graph = frequent_graph.compact
+    return len(graph.node_labels) + len(graph.edge_labels)
+
+
+def _check_measure(measure, classes):
+    if measure not in MEASURES:
+        raise ValueError("Unknown measure %s, expected one of %s" % (measure, ", ".join(MEASURES)))
+    if measure in DISCRIMINATIVE_MEASURES and classes is None:
+        raise ValueError("The %s measure needs the classes of the input graphs" % measure)
+
+
+def has_superpattern(frequent_graphs, support=None):
+    """
+    Finds the fragments that another fragment strictly contains. The fragments containing each one are read from the
+    posting lists of a ContainmentIndex over the fragments, so no fragments x fragments matrix is built
+    :param frequent_graphs: A sequence of FrequentGraph objects
+    :param support: The support of each fragment, to only count super-fragments with the same support
+    :return: A boolean array, True for each fragment that has such a super-fragment
+    """
+    compacts = [frequent_graph.compact for frequent_graph in frequent_graphs]
+    index = ContainmentIndex(compacts)
+    found = np.zeros(len(compacts), dtype=bool)
+    for i, pattern in enumerate(compacts):
+        candidates = index.containing(pattern)
+        if support is not None:
+            candidates = candidates[support[candidates] == support[i]]
+        # A fragment the pattern also contains is the same fragment, not a super-fragment
+        found[i] = any(j != i and not index.contains(i, compacts[j]) for j in candidates.tolist())
+    return found
+
+
+def score_patterns(result, measure='support', classes=None):
+    """
+    Scores every fragment of a result
+    :param result: A MiningResult, or a sequence of FrequentGraph objects
+    :param measure: One of MEASURES
+    :param classes: The class of each input graph, in the order of the result's GraphIndex, for the discriminative
+    measures
+    :return: A float array of the score of each fragment, higher being better, and NaN for fragments that are unranked
+    """
+    _check_measure(measure, classes)
+    if not isinstance(result, MiningResult):
+        result = MiningResult(result)
+    support = result.support_counts().astype(np.float64)
+    if measure == 'support':
+        return support
+    if measure == 'normalized_support':
+        sizes = np.array([_size(frequent_graph) for frequent_graph in result], dtype=np.float64)
+        return support / max(len(result.index), 1) * sizes
+    if measure in ('closed', 'maximal'):
+        superseded = has_superpattern(list(result), support if measure == 'closed' else None)
+        return np.where(superseded, np.nan, support)
+
+    codes, n_classes = _class_codes(classes)
+    onehot = np.zeros((len(codes), n_classes))
+    onehot[np.arange(len(codes)), codes] = 1
+    class_counts = np.asarray(result.to_scipy_sparse().T.dot(onehot))
+    class_totals = onehot.sum(axis=0)
+    if measure == 'information_gain':
+        return information_gain(class_counts, class_totals)
+    return chi_square(class_counts, class_totals)
+
+
+def rank_patterns(result, measure='support', classes=None):
+    """
+    Scores every fragment of a result and sets its rank, from 1 for the best. Ties keep the order of the result, and
+    unranked fragments get a rank of None
+    :return: The ranked FrequentGraph objects, best first
+    """
+    frequent_graphs = list(result)
+    scores = score_patterns(result, measure, classes)
+    ranked = []
+    for rank, position in enumerate(np.argsort(-scores, kind='stable')):
+        if np.isnan(scores[position]):
+            break
+        frequent_graphs[position].set_rank(rank + 1)
+        ranked.append(frequent_graphs[position])
+    for position in np.flatnonzero(np.isnan(scores)):
+        frequent_graphs[position].set_rank(None)
+    return ranked
+
+
+class _StreamScorer:
+    """
+    Scores fragments one at a time, with the same measures as score_patterns
+    """
+
+    def __init__(self, measure, classes, n_graphs) -> None:
+        super().__init__()
+        _check_measure(measure, classes)
+        if measure not in STREAMING_MEASURES:
+            raise ValueError("The %s measure depends on the other fragments, so can't be streamed" % measure)
+        self.measure = measure
+        self.n_graphs = n_graphs
+        if classes is not None:
+            self.codes, self.n_classes = _class_codes(classes)
+            self.class_totals = np.bincount(self.codes, minlength=self.n_classes)
+            self.n_graphs = len(self.codes)
+
+    def score(self, frequent_graph):
+        support = frequent_graph.appears_in
+        if self.measure == 'support':
+            return float(len(support))
+        if self.measure == 'normalized_support':
+            n_graphs = self.n_graphs
+            if n_graphs is None:
+                n_graphs = len(support.index) if isinstance(support, GraphSupport) else 1
+            return len(support) / max(n_graphs, 1) * _size(frequent_graph)
+
+        if not isinstance(support, GraphSupport):
+            raise ValueError("The %s measure needs supports that are positions in the input collection" % self.measure)
+        class_counts = np.bincount(self.codes[support.positions], minlength=self.n_classes)[np.newaxis]
+        if self.measure == 'information_gain':
+            return float(information_gain(class_counts, self.class_totals)[0])
+        return float(chi_square(class_counts, self.class_totals)[0])
+
+
+def top_k(frequent_graphs, k, measure='support', classes=None, n_graphs=None):
+    """
+    Selects the best k fragments of any iterable, such as the generator of a lazy or progressive mining run, keeping
+    only k fragments at a time. Ties keep the earlier fragment
+    :param k: The number of fragments to keep
+    :param measure: One of STREAMING_MEASURES
+    :param classes: The class of each input graph, for the discriminative measures
+    :param n_graphs: The number of input graphs for normalized_support, defaults to the size of the supports' index
+    :return: The best k FrequentGraph objects, best first, with their ranks set
+    """
+    scorer = _StreamScorer(measure, classes, n_graphs)
+    heap = []
+    sequence = count()
+    for frequent_graph in frequent_graphs:
+        entry = (scorer.score(frequent_graph), -next(sequence), frequent_graph)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    best = [frequent_graph for _, _, frequent_graph in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+    for rank, frequent_graph in enumerate(best):
+        frequent_graph.set_rank(rank + 1)
+    return best
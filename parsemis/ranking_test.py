@@ -0,0 +1,104 @@
+import math
+import tempfile
+import unittest
+
+import networkx as nx
+import numpy as np
+from scipy.stats import chi2_contingency
+
+from parsemis.parsemis_wrapper import FrequentGraph, ParsemisMiner
+from parsemis.ranking import (STREAMING_MEASURES, graph_classes, has_superpattern, rank_patterns, score_patterns,
+                              top_k)
+from parsemis.testing import NodeAndEdgeMiner, random_graphs
+
+
+def entropy(counts):
+    n = sum(counts)
+    return -sum(c / n * math.log2(c / n) for c in counts if c > 0) if n > 0 else 0
+
+
+class TestRanking(unittest.TestCase):
+
+    def setUp(self):
+        self.graphs = random_graphs(60, seed=9)
+        for i, graph in enumerate(self.graphs):
+            graph.graph['class'] = "positive" if "a" in graph or i % 5 == 0 else "negative"
+        self.classes = graph_classes(self.graphs)
+        self.miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+        self.result = self.miner.mine_graphs(self.graphs, minimum_frequency=2)
+
+    def test_support_ranks(self):
+        ranked = rank_patterns(self.result)
+        self.assertEqual(len(ranked), len(self.result))
+        self.assertEqual([fg.support for fg in ranked], sorted(self.result.support_counts().tolist(), reverse=True))
+        self.assertEqual([fg.rank for fg in ranked], list(range(1, len(ranked) + 1)))
+
+        scores = score_patterns(self.result, 'normalized_support')
+        for frequent_graph, score in zip(self.result, scores):
+            size = frequent_graph.graph.number_of_nodes() + frequent_graph.graph.number_of_edges()
+            self.assertAlmostEqual(score, frequent_graph.support / len(self.graphs) * size)
+
+    def test_closed_and_maximal(self):
+        frequent_graphs = list(self.result)
+        closed = score_patterns(self.result, 'closed')
+        maximal = score_patterns(self.result, 'maximal')
+        for i, pattern in enumerate(frequent_graphs):
+            supers = [other for other in frequent_graphs if other is not pattern
+                      and ParsemisMiner.is_subgraph(other.graph, pattern.graph)
+                      and not ParsemisMiner.is_subgraph(pattern.graph, other.graph)]
+            self.assertEqual(np.isnan(maximal[i]), len(supers) > 0)
+            self.assertEqual(np.isnan(closed[i]), any(other.support == pattern.support for other in supers))
+
+        graphs = [nx.Graph(id=i) for i in range(3)]
+        for graph in graphs:
+            graph.add_edge("a", "b", label="x")
+        graphs[0].add_node("c")
+        graphs[1].add_node("c")
+        result = self.miner.mine_graphs(graphs, minimum_frequency=2)
+        closed = {fg.to_string() for fg, score in zip(result, score_patterns(result, 'closed')) if not np.isnan(score)}
+        self.assertEqual(closed, {"c", "(a)-[x]-(b)"})
+
+        fragments = [nx.Graph(), nx.Graph(), nx.Graph(), nx.Graph()]
+        fragments[0].add_node("a")
+        for fragment in fragments[1:]:
+            fragment.add_edge("a", "b", label="x")
+        fragments[3].add_edge("b", "c", label="y")
+        fragments = [FrequentGraph(fragment, list(range(n))) for fragment, n in zip(fragments, [3, 2, 2, 1])]
+        self.assertEqual(has_superpattern(fragments).tolist(), [True, True, True, False])
+        self.assertEqual(has_superpattern(fragments, np.array([3, 2, 2, 1])).tolist(), [False] * 4)
+        self.assertEqual(has_superpattern(fragments, np.array([2, 2, 2, 2])).tolist(), [True, True, True, False])
+
+        ranked = rank_patterns(self.result, 'maximal')
+        self.assertEqual(len(ranked), np.count_nonzero(~np.isnan(maximal)))
+        self.assertTrue(all(fg.rank is None for fg in frequent_graphs if fg not in ranked))
+
+    def test_discriminative_measures(self):
+        gains = score_patterns(self.result, 'information_gain', self.classes)
+        chi_squares = score_patterns(self.result, 'chi_square', self.classes)
+        totals = [self.classes.count(c) for c in ("negative", "positive")]
+        for i, frequent_graph in enumerate(self.result):
+            present = [sum(1 for graph_id in frequent_graph.appears_in
+                           if self.classes[int(graph_id[1:])] == c) for c in ("negative", "positive")]
+            absent = [t - p for t, p in zip(totals, present)]
+            n, n_present = sum(totals), sum(present)
+            expected_gain = entropy(totals) - n_present / n * entropy(present) - (n - n_present) / n * entropy(absent)
+            self.assertAlmostEqual(gains[i], expected_gain)
+            if n_present < n:
+                self.assertAlmostEqual(chi_squares[i], chi2_contingency([present, absent], correction=False)[0])
+        with self.assertRaises(ValueError):
+            score_patterns(self.result, 'chi_square')
+
+    def test_streaming_top_k(self):
+        for measure in STREAMING_MEASURES:
+            expected = [fg.to_string() for fg in rank_patterns(self.result, measure, self.classes)[:5]]
+            stream = self.miner.mine_graphs(self.graphs, lazy=True, minimum_frequency=2)
+            best = top_k(stream, 5, measure, self.classes)
+            self.assertEqual([fg.to_string() for fg in best], expected)
+            self.assertEqual([fg.rank for fg in best], [1, 2, 3, 4, 5])
+        self.assertEqual(len(top_k(iter(self.result), 1000)), len(self.result))
+        with self.assertRaises(ValueError):
+            top_k(self.result, 5, 'closed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+"""
+Instrumentation of mining runs.
+
+A RunReport records the wall and CPU time of each phase of a run (writing the input, mining, reading the output),
+the bytes written and read, the number of fragments found, and the exit code and peak resident memory of the JVM.
+ParSeMiS' stdout and stderr are captured rather than passed through to the terminal; every line is kept in the
+report, logged at debug level, and scanned for "name: value" pairs so that progress can be followed while it runs.
+
+Every transport runs ParSeMiS as an InstrumentedProcess, whose exit is recorded by a thread of its own, so runs whose
+output is consumed while the JVM is still running (pipe, progressive and async runs) are reported as fully as file
+runs. Session JVMs outlive their runs, so their usage is read from /proc by process_usage instead.
+
+A metrics callback, if given, is called as callback(event, data) with:
+    "phase", a dict of the phase name and its wall and cpu seconds, as each phase ends
+    "progress", a dict of the seconds since the JVM started, the output line and the values parsed from it
+    "report", the finished RunReport
+"""
+import logging as log
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+_VALUE = re.compile(r"([A-Za-z][\w .\-]*?)\s*[:=]\s*(-?\d+(?:\.\d+)?)")
+
+
+def parse_progress(line):
+    """
+    :return: A dict of the numeric "name: value" or "name = value" pairs in a line of ParSeMiS output
+    """
+    return {name.strip().lower(): float(value) for name, value in _VALUE.findall(line)}
+
+
+class RunReport:
+    """
+    Timings and resource usage of a single mining run
+    """
+
+    def __init__(self, callback=None, max_output_lines=10000) -> None:
+        """
+        :param callback: Called as callback(event, data) for each phase, progress line and the finished report
+        :param max_output_lines: The number of lines of ParSeMiS output to keep
+        """
+        super().__init__()
+        self.callback = callback
+        self.phases = {}
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.n_fragments = None
+        self.peak_rss = None
+        self.exit_code = None
+        self.child_cpu = 0.0
+        self.first_output = None
+        self.java_output = deque(maxlen=max_output_lines)
+        self.progress = {}
+
+    def emit(self, event, data):
+        if self.callback is not None:
+            try:
+                self.callback(event, data)
+            except Exception as e:
+                log.error("Metrics callback failed: %s" % e)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Times the enclosed block as a phase. Its CPU time includes that of any JVM run within the block
+        """
+        wall, cpu, child_cpu = time.perf_counter(), time.process_time(), self.child_cpu
+        try:
+            yield self
+        finally:
+            timing = {'wall': time.perf_counter() - wall,
+                      'cpu': time.process_time() - cpu + self.child_cpu - child_cpu}
+            self.phases[name] = timing
+            self.emit("phase", dict(timing, name=name))
+
+    def record_output(self, line, elapsed):
+        if self.first_output is None:
+            self.first_output = elapsed
+        self.java_output.append(line)
+        values = parse_progress(line)
+        self.progress.update(values)
+        self.emit("progress", {'elapsed': elapsed, 'line': line, 'values': values})
+
+    def finish(self):
+        self.emit("report", self)
+        return self
+
+    @property
+    def startup_time(self):
+        """
+        :return: The seconds from starting the JVM to its first line of output, an upper bound on JVM startup
+        """
+        return self.first_output
+
+    def to_dict(self):
+        return {'phases': {name: dict(timing) for name, timing in self.phases.items()},
+                'bytes_written': self.bytes_written,
+                'bytes_read': self.bytes_read,
+                'n_fragments': self.n_fragments,
+                'peak_rss': self.peak_rss,
+                'exit_code': self.exit_code,
+                'child_cpu': self.child_cpu,
+                'startup_time': self.startup_time,
+                'progress': dict(self.progress)}
+
+    def __repr__(self):
+        return "RunReport(%s)" % self.to_dict()
+
+
+def process_usage(pid):
+    """
+    Reads the CPU time and peak resident memory of a running process, for long lived processes such as session JVMs
+    that aren't reaped after each run
+    :return: A tuple of (CPU seconds, peak resident bytes), or None where /proc can't be read
+    """
+    try:
+        with open("/proc/%i/stat" % pid) as f:
+            # The fields after the command name start at the state, so utime and stime are its 12th and 13th
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/%i/status" % pid) as f:
+            peak_rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration, ValueError, IndexError):
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK"), peak_rss
+
+
+class InstrumentedProcess:
+    """
+    A running command whose output is captured into a report. The command is reaped by a thread of its own, which
+    records its exit code, CPU time and peak memory, so it can be polled, waited for and terminated from any thread
+    while its output is consumed elsewhere, as pipe and progressive runs do
+    """
+
+    def __init__(self, commands, report=None) -> None:
+        """
+        :param commands: The command line to run
+        :param report: The RunReport to record the output and resource usage in
+        """
+        super().__init__()
+        log.debug(commands)
+        self.report = report
+        self.returncode = None
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._exited = threading.Event()
+        self._callbacks = []
+        self._process = subprocess.Popen(commands, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                         errors="replace")
+        self.pid = self._process.pid
+        self._reader = threading.Thread(target=self._read_output, daemon=True)
+        self._reader.start()
+        threading.Thread(target=self._reap, daemon=True).start()
+
+    def _read_output(self):
+        for line in self._process.stdout:
+            line = line.rstrip("\n")
+            log.debug(line)
+            if self.report is not None:
+                self.report.record_output(line, time.perf_counter() - self._started)
+
+    def _reap(self):
+        # Waiting without reaping first means the pid can't be reused while the process is still being signalled
+        os.waitid(os.P_PID, self.pid, os.WEXITED | os.WNOWAIT)
+        with self._lock:
+            _, status, usage = os.wait4(self.pid, 0)
+            self.returncode = self._process.returncode = os.waitstatus_to_exitcode(status)
+        self._reader.join()
+        self._process.stdout.close()
+
+        report = self.report
+        if report is not None:
+            report.exit_code = self.returncode
+            report.child_cpu += usage.ru_utime + usage.ru_stime
+            # ru_maxrss is in kilobytes on Linux, and bytes on macOS
+            peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+            report.peak_rss = max(report.peak_rss or 0, peak_rss)
+        with self._lock:
+            self._exited.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def poll(self):
+        """
+        :return: The exit code, or None while the command is running or its exit is still being recorded
+        """
+        return self.returncode if self._exited.is_set() else None
+
+    def wait(self, timeout=None):
+        """
+        :raises subprocess.TimeoutExpired: If the command is still running after timeout seconds
+        :return: The exit code, once it has been recorded in the report
+        """
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired(self._process.args, timeout)
+        return self.returncode
+
+    def add_exit_callback(self, callback):
+        """
+        Calls callback(), from the reaping thread, once the exit has been recorded, or at once if it already has
+        """
+        with self._lock:
+            if not self._exited.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def send_signal(self, signum):
+        with self._lock:
+            if self.returncode is None:
+                os.kill(self.pid, signum)
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+def run_instrumented(commands, report=None):
+    """
+    Runs a command, capturing its output into the report along with its exit code, CPU time and peak memory
+    :return: The exit code
+    """
+    process = InstrumentedProcess(commands, report)
+    try:
+        return process.wait()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
@@ -0,0 +1,78 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+
+from parsemis.pipes_test import PipedStubMiner
+from parsemis.report import RunReport, parse_progress, run_instrumented
+from parsemis.testing import random_graphs
+
+
+class TestRunReport(unittest.TestCase):
+
+    def test_parse_progress(self):
+        self.assertEqual(parse_progress("fragments found: 12, time = 3.5"), {'fragments found': 12.0, 'time': 3.5})
+        self.assertEqual(parse_progress("Starting gSpan"), {})
+
+    def test_run_instrumented(self):
+        events = []
+        report = RunReport(lambda event, data: events.append((event, data)))
+        script = "import sys; print('graphs: 10'); print('fragments: 4', file=sys.stderr); sys.exit(2)"
+        with report.phase('mine'):
+            self.assertEqual(run_instrumented([sys.executable, "-c", script], report), 2)
+
+        self.assertEqual(report.exit_code, 2)
+        self.assertEqual(sorted(report.java_output), ["fragments: 4", "graphs: 10"])
+        self.assertEqual(report.progress, {'graphs': 10.0, 'fragments': 4.0})
+        self.assertGreater(report.peak_rss, 0)
+        self.assertGreaterEqual(report.phases['mine']['cpu'], report.child_cpu)
+        self.assertIsNotNone(report.startup_time)
+        self.assertEqual([event for event, _ in events], ["progress", "progress", "phase"])
+
+    def test_mine_graphs_report(self):
+        events = []
+        miner = PipedStubMiner(tempfile.mkdtemp(), metrics=lambda event, data: events.append(event))
+        result = miner.mine_graphs(random_graphs(20), minimum_frequency=3)
+
+        report = result.report
+        self.assertIs(report, miner.last_report)
+        self.assertEqual(list(report.phases), ['write', 'mine', 'read'])
+        self.assertEqual(report.exit_code, 0)
+        self.assertEqual(report.n_fragments, len(result))
+        self.assertGreater(report.bytes_written, 0)
+        self.assertGreater(report.bytes_read, 0)
+        self.assertGreater(report.phases['mine']['cpu'], 0)
+        self.assertEqual(events, ['phase', 'progress', 'phase', 'phase', 'report'])
+        self.assertEqual(set(report.to_dict()['phases']), {'write', 'mine', 'read'})
+
+    def assert_complete(self, report, n_fragments, phases):
+        self.assertEqual(report.exit_code, 0)
+        self.assertGreater(report.peak_rss, 0)
+        self.assertGreater(report.child_cpu, 0)
+        self.assertGreater(report.bytes_written, 0)
+        self.assertGreater(report.bytes_read, 0)
+        self.assertEqual(report.n_fragments, n_fragments)
+        self.assertIn("done: 1", report.java_output)
+        self.assertEqual(report.progress, {'done': 1.0})
+        self.assertEqual(set(report.phases), set(phases))
+
+    def test_every_transport_is_reported(self):
+        graphs = random_graphs(20)
+        for transport in ('file', 'pipe'):
+            miner = PipedStubMiner(tempfile.mkdtemp(), transport=transport)
+            result = miner.mine_graphs(graphs, minimum_frequency=3)
+            self.assert_complete(result.report, len(result), ['write', 'mine', 'read'])
+            self.assertEqual(result.report.bytes_written, PipedStubMiner(tempfile.mkdtemp()).mine_graphs(
+                graphs, minimum_frequency=3).report.bytes_written)
+
+            frequent_graphs = list(miner.mine_progressive(graphs, minimum_frequency=3, poll_interval=0.01))
+            self.assert_complete(miner.last_report, len(frequent_graphs), ['write', 'read'])
+
+        miner = PipedStubMiner(tempfile.mkdtemp())
+        result = asyncio.run(miner.amine_graphs(graphs, minimum_frequency=3))
+        self.assertIs(result.report, miner.last_report)
+        self.assert_complete(result.report, len(result), ['write', 'mine', 'read'])
+
+
+if __name__ == '__main__':
+    unittest.main()
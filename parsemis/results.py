@@ -0,0 +1,150 @@
+"""
+Mining results with an index between the frequent graphs and the input graphs they appear in.
+
+The pattern -> graph relation is held as a CSR style pair of arrays (indptr, indices), and its transpose gives the
+inverted graph -> pattern index, so both directions can be queried without scanning every support.
+"""
+from collections.abc import Sequence
+
+import numpy as np
+
+from parsemis.support import GraphIndex, GraphSupport
+
+
+class MiningResult(Sequence):
+    """
+    A sequence of FrequentGraph objects, along with lookups between frequent graphs and input graphs.
+
+    Frequent graphs are referred to by their position in the result, and input graphs by their id.
+    """
+
+    def __init__(self, frequent_graphs, graphs=None) -> None:
+        """
+        :param frequent_graphs: The FrequentGraph objects of the result
+        :param graphs: The mined graphs, or their GraphIndex
+        """
+        super().__init__()
+        self._frequent_graphs = list(frequent_graphs)
+        self._index = self._find_index(graphs)
+        self._pattern_indptr = None
+        self._pattern_indices = None
+        self._graph_indptr = None
+        self._graph_indices = None
+        self.report = None
+
+    def _find_index(self, graphs):
+        for frequent_graph in self._frequent_graphs:
+            if isinstance(frequent_graph.appears_in, GraphSupport):
+                return frequent_graph.appears_in.index
+        if isinstance(graphs, GraphIndex):
+            return graphs
+        if graphs is not None:
+            return GraphIndex.from_graphs(graphs)
+        return GraphIndex()
+
+    @property
+    def index(self):
+        return self._index
+
+    def __len__(self):
+        return len(self._frequent_graphs)
+
+    def __getitem__(self, item):
+        return self._frequent_graphs[item]
+
+    def __iter__(self):
+        return iter(self._frequent_graphs)
+
+    def _positions(self, frequent_graph):
+        support = frequent_graph.appears_in
+        if isinstance(support, GraphSupport) and support.index is self._index:
+            return support.positions
+        return np.unique(np.array([self._index.add(graph_id) for graph_id in support], dtype=np.int32))
+
+    def _build(self):
+        if self._pattern_indptr is not None:
+            return
+        positions = [self._positions(frequent_graph) for frequent_graph in self._frequent_graphs]
+        counts = np.array([len(p) for p in positions], dtype=np.int64)
+        self._pattern_indptr = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._pattern_indptr[1:])
+        if len(positions) > 0:
+            self._pattern_indices = np.concatenate(positions).astype(np.int32)
+        else:
+            self._pattern_indices = np.empty(0, dtype=np.int32)
+
+        # Transpose into the inverted index: a stable sort on graph positions keeps pattern ids ordered
+        pattern_ids = np.repeat(np.arange(len(positions), dtype=np.int32), counts)
+        order = np.argsort(self._pattern_indices, kind='stable')
+        self._graph_indices = pattern_ids[order]
+        self._graph_indptr = np.zeros(len(self._index) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._pattern_indices, minlength=len(self._index)), out=self._graph_indptr[1:])
+
+    @property
+    def shape(self):
+        """
+        :return: The shape of the graph x pattern feature matrix
+        """
+        return len(self._index), len(self._frequent_graphs)
+
+    def support_counts(self):
+        """
+        :return: An array holding the support of each frequent graph
+        """
+        self._build()
+        return np.diff(self._pattern_indptr)
+
+    def graph_positions(self, pattern):
+        """
+        :param pattern: The position of a frequent graph in this result
+        :return: The positions of the input graphs the frequent graph appears in
+        """
+        self._build()
+        return self._pattern_indices[self._pattern_indptr[pattern]:self._pattern_indptr[pattern + 1]]
+
+    def graphs_containing(self, pattern):
+        """
+        :param pattern: The position of a frequent graph in this result
+        :return: The ids of the input graphs the frequent graph appears in
+        """
+        return self._index.ids[self.graph_positions(pattern)].tolist()
+
+    def pattern_positions(self, graph_id):
+        """
+        :param graph_id: The id of an input graph
+        :return: The positions of the frequent graphs that appear in the input graph
+        """
+        self._build()
+        position = self._index.position(graph_id)
+        if position is None:
+            return np.empty(0, dtype=np.int32)
+        return self._graph_indices[self._graph_indptr[position]:self._graph_indptr[position + 1]]
+
+    def patterns_in(self, graph_id):
+        """
+        :param graph_id: The id of an input graph
+        :return: The FrequentGraph objects that appear in the input graph
+        """
+        return [self._frequent_graphs[pattern] for pattern in self.pattern_positions(graph_id)]
+
+    def to_scipy_sparse(self):
+        """
+        Exports the graph x pattern feature matrix, where entry (i, j) is 1 if frequent graph j appears in input
+        graph i
+        :return: A scipy.sparse.csr_matrix
+        """
+        from scipy.sparse import csr_matrix
+
+        self._build()
+        data = np.ones(len(self._graph_indices), dtype=np.uint8)
+        return csr_matrix((data, self._graph_indices, self._graph_indptr), shape=self.shape)
+
+    def to_numpy(self, dtype=np.uint8):
+        """
+        Exports the graph x pattern feature matrix as a dense numpy array
+        """
+        self._build()
+        matrix = np.zeros(self.shape, dtype=dtype)
+        graph_positions = np.repeat(np.arange(len(self._index)), np.diff(self._graph_indptr))
+        matrix[graph_positions, self._graph_indices] = 1
+        return matrix
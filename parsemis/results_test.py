@@ -0,0 +1,38 @@
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from parsemis.parsemis_wrapper import FrequentGraph
+from parsemis.results import MiningResult
+from parsemis.support import GraphIndex, GraphSupport
+
+
+class TestMiningResult(unittest.TestCase):
+
+    def setUp(self):
+        self.graphs = [nx.Graph(id="g%i" % i) for i in range(4)]
+        index = GraphIndex.from_graphs(self.graphs)
+        self.result = MiningResult([
+            FrequentGraph(nx.Graph(), GraphSupport([0, 2, 3], index)),
+            FrequentGraph(nx.Graph(), GraphSupport([2], index)),
+            FrequentGraph(nx.Graph(), GraphSupport([], index)),
+        ], self.graphs)
+
+    def test_lookups(self):
+        self.assertEqual(len(self.result), 3)
+        self.assertEqual(self.result.support_counts().tolist(), [3, 1, 0])
+        self.assertEqual(self.result.graphs_containing(0), ["g0", "g2", "g3"])
+        self.assertEqual(self.result.pattern_positions("g2").tolist(), [0, 1])
+        self.assertEqual(self.result.pattern_positions("g1").tolist(), [])
+        self.assertEqual(self.result.patterns_in("g3"), [self.result[0]])
+
+    def test_feature_matrix(self):
+        expected = np.array([[1, 0, 0], [0, 0, 0], [1, 1, 0], [1, 0, 0]])
+        np.testing.assert_array_equal(self.result.to_numpy(), expected)
+        np.testing.assert_array_equal(self.result.to_scipy_sparse().toarray(), expected)
+
+    def test_id_list_supports(self):
+        result = MiningResult([FrequentGraph(nx.Graph(), ["g1", "g3"])], self.graphs)
+        self.assertEqual(result.pattern_positions("g3").tolist(), [0])
+        self.assertEqual(result.shape, (4, 1))
@@ -0,0 +1,211 @@
+"""
+Sizing the ParSeMiS heap per run, and packing runs into a machine wide memory budget.
+
+The heap a run needs is estimated from statistics gathered while its input was written: the size of the input
+itself, scaled by how much of the search space the frequency threshold leaves open. A low threshold relative to the
+number of graphs, or few distinct labels, makes many more fragments frequent, and each of them is held in memory
+with its embeddings. The estimate is deliberately rough; a run that still runs out of memory is retried with a
+larger heap, or optionally a higher threshold.
+"""
+import logging as log
+import math
+import os
+import threading
+from contextlib import contextmanager
+
+# The JVM exits with this code when started with -XX:+ExitOnOutOfMemoryError and the heap is exhausted
+OUT_OF_MEMORY_EXIT_CODE = 3
+
+_UNITS = {'k': 1 << 10, 'm': 1 << 20, 'g': 1 << 30, 't': 1 << 40}
+
+
+def parse_size(size):
+    """
+    :param size: A number of bytes, or a JVM style size such as "512m" or "10g"
+    :return: The number of bytes
+    """
+    size = str(size).strip().lower()
+    if size[-1] in _UNITS:
+        return int(float(size[:-1]) * _UNITS[size[-1]])
+    return int(size)
+
+
+def format_size(n_bytes):
+    """
+    :return: A JVM heap size, in whole megabytes
+    """
+    return "%im" % max(1, int(math.ceil(n_bytes / _UNITS['m'])))
+
+
+def physical_memory():
+    """
+    :return: The physical memory of the machine in bytes, or None if it can't be determined
+    """
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class InputStatistics:
+    """
+    Counts of the graphs, nodes, edges and distinct labels written for a run
+    """
+
+    __slots__ = ('n_graphs', 'n_nodes', 'n_edges', 'node_labels', 'edge_labels')
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.n_graphs = 0
+        self.n_nodes = 0
+        self.n_edges = 0
+        self.node_labels = set()
+        self.edge_labels = set()
+
+    @classmethod
+    def from_graphs(cls, graphs):
+        statistics = cls()
+        for graph in graphs:
+            statistics.add(graph)
+        return statistics
+
+    def add(self, graph, attribute_name='label'):
+        self.n_graphs += 1
+        self.n_nodes += graph.number_of_nodes()
+        self.node_labels.update(graph.nodes())
+        for _, _, label in graph.edges(data=attribute_name):
+            self.n_edges += 1
+            self.edge_labels.add(label)
+
+    @property
+    def label_cardinality(self):
+        return len(self.node_labels) + len(self.edge_labels)
+
+    def to_dict(self):
+        return {'n_graphs': self.n_graphs, 'n_nodes': self.n_nodes, 'n_edges': self.n_edges,
+                'n_node_labels': len(self.node_labels), 'n_edge_labels': len(self.edge_labels)}
+
+
+class MemoryScheduler:
+    """
+    Runs ParSeMiS with a heap sized to its input, admitting runs only while their heaps fit in a memory budget. One
+    scheduler can be shared by the miners of several threads, via ParsemisMiner(scheduler=...).
+    """
+
+    def __init__(self, budget=None, minimum_heap='256m', maximum_heap=None, max_retries=2, growth=2.0,
+                 raise_threshold=False, overhead='128m', bytes_per_node=512, bytes_per_edge=768) -> None:
+        """
+        :param budget: The total heap of all concurrent runs, defaults to 80% of physical memory
+        :param minimum_heap: The smallest heap given to a run
+        :param maximum_heap: The largest heap given to a run, defaults to the budget
+        :param max_retries: The number of times a run that ran out of memory is retried
+        :param growth: The factor the heap (or threshold) grows by on each retry
+        :param raise_threshold: Once the heap can't grow any more, retries with a higher minimum frequency. This
+        changes the result, so is off by default
+        :param overhead: The fixed heap needed by ParSeMiS itself
+        :param bytes_per_node: The heap needed per input node, before scaling for the search
+        :param bytes_per_edge: The heap needed per input edge, before scaling for the search
+        """
+        super().__init__()
+        if budget is None:
+            memory = physical_memory()
+            budget = int(memory * 0.8) if memory is not None else parse_size('10g')
+        self.budget = parse_size(budget)
+        self.minimum_heap = parse_size(minimum_heap)
+        self.maximum_heap = min(parse_size(maximum_heap), self.budget) if maximum_heap is not None else self.budget
+        self.max_retries = max_retries
+        self.growth = growth
+        self.raise_threshold = raise_threshold
+        self.overhead = parse_size(overhead)
+        self.bytes_per_node = bytes_per_node
+        self.bytes_per_edge = bytes_per_edge
+        self.reserved = 0
+        self._condition = threading.Condition()
+
+    def estimate_heap(self, statistics, threshold):
+        """
+        :param statistics: The InputStatistics of the run
+        :param threshold: The absolute minimum frequency of the run
+        :return: The estimated heap in bytes, clamped to the minimum and maximum heap
+        """
+        input_bytes = self.bytes_per_node * statistics.n_nodes + self.bytes_per_edge * statistics.n_edges
+        # The lower the threshold relative to the collection, the more fragments and embeddings are kept
+        openness = math.log2(1 + statistics.n_graphs / max(1, threshold))
+        # Few distinct labels means many repeated, and so frequent, substructures
+        repetition = 1 + math.log2(1 + statistics.n_edges / max(1, statistics.label_cardinality)) / 4
+        estimate = self.overhead + input_bytes * (1 + openness) * repetition
+        return int(min(self.maximum_heap, max(self.minimum_heap, estimate)))
+
+    def acquire(self, heap):
+        """
+        Blocks until a heap of this size fits in the budget, and reserves it
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.reserved == 0 or self.reserved + heap <= self.budget)
+            self.reserved += heap
+
+    def release(self, heap):
+        with self._condition:
+            self.reserved -= heap
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, heap):
+        """
+        Holds a heap of this size in the budget for the duration of a with block
+        """
+        self.acquire(heap)
+        try:
+            yield heap
+        finally:
+            self.release(heap)
+
+    def plan(self, miner, **kwargs):
+        """
+        :return: The heap in bytes and the minimum frequency of the first attempt of a run over the miner's input
+        """
+        minimum_frequency = kwargs.get('minimum_frequency', '0.05')
+        if 'heap_size' in kwargs:
+            return parse_size(kwargs['heap_size']), minimum_frequency
+        statistics = miner.input_statistics
+        if statistics is None:
+            # The input hasn't been seen yet, such as a generator streamed through a pipe
+            return self.maximum_heap, minimum_frequency
+        threshold = miner.resolve_frequency(minimum_frequency, statistics.n_graphs)
+        return self.estimate_heap(statistics, threshold), minimum_frequency
+
+    def retry(self, miner, heap, minimum_frequency):
+        """
+        :return: The heap and minimum frequency to retry a run that ran out of memory with, or None once neither can
+        grow
+        """
+        if heap < self.maximum_heap:
+            heap = min(self.maximum_heap, int(heap * self.growth))
+            log.warning("ParSeMiS ran out of memory, retrying with a %s heap" % format_size(heap))
+            return heap, minimum_frequency
+        if self.raise_threshold:
+            threshold = miner.resolve_frequency(minimum_frequency, miner.input_statistics.n_graphs)
+            threshold = int(math.ceil(threshold * self.growth))
+            log.warning("ParSeMiS ran out of memory, retrying with a minimum frequency of %i" % threshold)
+            return heap, threshold
+        return None
+
+    def run(self, miner, **kwargs):
+        """
+        Runs ParSeMiS over the miner's input file, retrying after an OutOfMemoryError
+        :return: The exit code of the last attempt
+        :raises MemoryError: If the last retry still ran out of memory
+        """
+        heap, minimum_frequency = self.plan(miner, **kwargs)
+        for attempt in range(self.max_retries + 1):
+            commands = miner.build_commands(**dict(kwargs, heap_size=format_size(heap),
+                                                   minimum_frequency=minimum_frequency))
+            with self.reserve(heap):
+                return_code = miner.run_commands(commands)
+            if return_code != OUT_OF_MEMORY_EXIT_CODE:
+                return return_code
+            retry = self.retry(miner, heap, minimum_frequency)
+            if retry is None:
+                break
+            heap, minimum_frequency = retry
+        raise MemoryError("ParSeMiS ran out of memory with a %s heap" % format_size(heap))
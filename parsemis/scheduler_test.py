@@ -0,0 +1,139 @@
+import asyncio
+import sys
+import tempfile
+import threading
+import unittest
+
+from parsemis.parsemis_wrapper import ParsemisMiner
+from parsemis.scheduler import InputStatistics, MemoryScheduler, format_size, parse_size
+from parsemis.testing import random_graphs
+
+
+class HeapLimitedMiner(ParsemisMiner):
+    """
+    Stands in for a JVM that runs out of memory below a given heap or threshold, recording every attempt
+    """
+
+    required_heap = '1g'
+    required_frequency = 0
+
+    def build_commands(self, **kwargs):
+        self.attempts.append((kwargs['heap_size'], kwargs['minimum_frequency']))
+        enough = parse_size(kwargs['heap_size']) >= parse_size(self.required_heap) and \
+            int(kwargs['minimum_frequency']) >= self.required_frequency
+        if not enough:
+            return [sys.executable, "-c", "import sys; sys.exit(3)"]
+        return [sys.executable, "-c", "open(%r, 'w').close()" % self.output_file]
+
+
+class TestMemoryScheduler(unittest.TestCase):
+
+    def test_sizes(self):
+        self.assertEqual(parse_size("10g"), 10 << 30)
+        self.assertEqual(parse_size("512m"), 512 << 20)
+        self.assertEqual(parse_size(1000), 1000)
+        self.assertEqual(format_size(512 << 20), "512m")
+        self.assertEqual(format_size(1), "1m")
+
+    def test_statistics_gathered_on_write(self):
+        graphs = random_graphs(20)
+        miner = ParsemisMiner(tempfile.mkdtemp())
+        miner.write_graph(graphs)
+        self.assertIsNone(miner.input_statistics)
+
+        miner = ParsemisMiner(tempfile.mkdtemp(), scheduler=MemoryScheduler())
+        miner.write_graph(graphs)
+        statistics = miner.input_statistics
+        self.assertEqual(statistics.n_graphs, 20)
+        self.assertEqual(statistics.n_nodes, sum(graph.number_of_nodes() for graph in graphs))
+        self.assertEqual(statistics.n_edges, sum(graph.number_of_edges() for graph in graphs))
+        self.assertEqual(statistics.edge_labels, {"x", "y"})
+
+    def test_estimate(self):
+        scheduler = MemoryScheduler(budget='64g', minimum_heap='1m', maximum_heap='32g')
+        statistics = InputStatistics()
+        for graph in random_graphs(1000):
+            statistics.add(graph)
+        low = scheduler.estimate_heap(statistics, 2)
+        high = scheduler.estimate_heap(statistics, 500)
+        self.assertGreater(low, high)
+        self.assertGreater(high, scheduler.overhead)
+
+        statistics.n_nodes = statistics.n_edges = 10 ** 12
+        self.assertEqual(scheduler.estimate_heap(statistics, 1), parse_size('32g'))
+
+    def test_retry_with_larger_heap(self):
+        miner = HeapLimitedMiner(tempfile.mkdtemp(), scheduler=MemoryScheduler(budget='8g', minimum_heap='256m'))
+        miner.attempts = []
+        miner.write_graph(random_graphs(10))
+        self.assertEqual(miner.perform_mining(minimum_frequency=2), 0)
+        self.assertEqual([heap for heap, _ in miner.attempts], ["256m", "512m", "1024m"])
+
+    def test_retry_with_higher_threshold(self):
+        scheduler = MemoryScheduler(budget='1g', minimum_heap='1g', max_retries=3, raise_threshold=True)
+        miner = HeapLimitedMiner(tempfile.mkdtemp(), scheduler=scheduler)
+        miner.attempts = []
+        miner.required_frequency = 8
+        miner.write_graph(random_graphs(10))
+        self.assertEqual(miner.perform_mining(minimum_frequency=2), 0)
+        self.assertEqual([frequency for _, frequency in miner.attempts], [2, 4, 8])
+
+    def test_out_of_memory(self):
+        miner = HeapLimitedMiner(tempfile.mkdtemp(), scheduler=MemoryScheduler(budget='512m', minimum_heap='256m'))
+        miner.attempts = []
+        miner.write_graph(random_graphs(10))
+        with self.assertRaises(MemoryError):
+            miner.perform_mining(minimum_frequency=2)
+        self.assertEqual(len(miner.attempts), 2)
+
+    def test_async_runs_are_scheduled(self):
+        scheduler = MemoryScheduler(budget='8g', minimum_heap='256m')
+        miner = HeapLimitedMiner(tempfile.mkdtemp(), scheduler=scheduler)
+        miner.attempts = []
+        result = asyncio.run(miner.amine_graphs(random_graphs(10), minimum_frequency=2))
+        self.assertEqual(len(result), 0)
+        self.assertEqual([heap for heap, _ in miner.attempts], ["256m", "512m", "1024m"])
+        self.assertEqual(scheduler.reserved, 0)
+
+        miner.attempts = []
+        miner.required_heap = '100g'
+        with self.assertRaises(MemoryError):
+            asyncio.run(miner.amine_graphs(random_graphs(10), minimum_frequency=2))
+        self.assertEqual(scheduler.reserved, 0)
+
+    def test_pipe_and_progressive_runs_are_sized(self):
+        graphs = random_graphs(10)
+        scheduler = MemoryScheduler(budget='8g', minimum_heap='1m', maximum_heap='4g')
+        expected = format_size(scheduler.estimate_heap(InputStatistics.from_graphs(graphs), 2))
+        for transport in ('file', 'pipe'):
+            miner = HeapLimitedMiner(tempfile.mkdtemp(), scheduler=scheduler, transport=transport)
+            miner.attempts = []
+            miner.required_heap = '1m'
+            self.assertEqual(list(miner.mine_progressive(graphs, minimum_frequency=2, poll_interval=0.01)), [])
+            self.assertEqual(miner.attempts, [(expected, 2)])
+            self.assertEqual(scheduler.reserved, 0)
+
+        miner.attempts = []
+        self.assertEqual(list(miner.mine_graphs(iter(graphs), lazy=True, minimum_frequency=2)), [])
+        self.assertEqual(miner.attempts, [("4096m", 2)])
+
+    def test_budget_admission(self):
+        scheduler = MemoryScheduler(budget=100)
+        scheduler.acquire(60)
+        admitted = threading.Event()
+
+        def second_job():
+            scheduler.acquire(60)
+            admitted.set()
+
+        thread = threading.Thread(target=second_job)
+        thread.start()
+        self.assertFalse(admitted.wait(0.2))
+        scheduler.release(60)
+        self.assertTrue(admitted.wait(5))
+        thread.join()
+        self.assertEqual(scheduler.reserved, 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,263 @@
+"""
+Long lived ParSeMiS sessions.
+
+A session keeps a small pool of JVMs running ParsemisServer, which loads ParSeMiS once and then mines one request
+per line read from stdin. Each mining call only pays for the mining itself, rather than for JVM startup, class
+loading and JIT warmup.
+
+ParSeMiS' output goes to the server's stderr, and each run's is ended by an END_OF_RUN line, so it is captured into
+the run's RunReport as it is for a JVM started per run. The JVM isn't reaped after a run, so its CPU time and peak
+memory are read from /proc where that exists.
+"""
+import logging as log
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from parsemis.report import RunReport, process_usage
+from parsemis.results import MiningResult
+from parsemis.scheduler import format_size, parse_size
+
+SERVER_CLASS = "ParsemisServer"
+# Written by the server to stderr after the output of every run, as ParsemisServer.END_OF_RUN
+END_OF_RUN = "ParsemisServer: end of run"
+
+
+def compile_server(parsemis_location, directory):
+    """
+    Compiles ParsemisServer.java against the ParSeMiS jar, unless an up to date class file already exists
+    :return: The directory holding ParsemisServer.class
+    """
+    source = "%s/%s.java" % (os.path.dirname(os.path.realpath(__file__)), SERVER_CLASS)
+    compiled = "%s/%s.class" % (directory, SERVER_CLASS)
+    if not os.path.exists(compiled) or os.path.getmtime(compiled) < os.path.getmtime(source):
+        os.makedirs(directory, exist_ok=True)
+        log.debug("Compiling %s into %s" % (source, directory))
+        subprocess.check_call(['javac', '-cp', parsemis_location, '-d', directory, source])
+    return directory
+
+
+class JvmWorker:
+    """
+    A single ParsemisServer process
+    """
+
+    def __init__(self, commands) -> None:
+        super().__init__()
+        self.commands = commands
+        self.process = None
+        self.report = None
+        self._responses = None
+        self._end_of_run = None
+        self._run_started = None
+
+    def start(self):
+        log.debug(self.commands)
+        self.process = subprocess.Popen(self.commands, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, universal_newlines=True, bufsize=1)
+        self._responses = queue.Queue()
+        self._end_of_run = threading.Event()
+        threading.Thread(target=self._read_responses, args=(self.process, self._responses), daemon=True).start()
+        threading.Thread(target=self._read_output, args=(self.process, self._end_of_run), daemon=True).start()
+
+    @staticmethod
+    def _read_responses(process, responses):
+        for line in process.stdout:
+            responses.put(line.rstrip("\n"))
+        responses.put(None)
+
+    def _read_output(self, process, end_of_run):
+        for line in process.stderr:
+            line = line.rstrip("\n")
+            if line == END_OF_RUN:
+                end_of_run.set()
+                continue
+            log.debug(line)
+            report = self.report
+            if report is not None:
+                report.record_output(line, time.perf_counter() - self._run_started)
+        end_of_run.set()
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def _send(self, line, timeout):
+        try:
+            self.process.stdin.write(line + "\n")
+            self.process.stdin.flush()
+            response = self._responses.get(timeout=timeout)
+        except (BrokenPipeError, queue.Empty) as e:
+            raise RuntimeError("ParSeMiS worker did not respond: %r" % e)
+        if response is None:
+            raise RuntimeError("ParSeMiS worker exited with code %s" % self.process.wait())
+        return response
+
+    def ping(self, timeout=10):
+        try:
+            return self.is_alive() and self._send("PING", timeout) == "PONG"
+        except RuntimeError:
+            return False
+
+    def run(self, arguments, timeout=None, report=None):
+        """
+        Runs ParSeMiS once, capturing its output, CPU time and peak memory in the report. A failed run is recorded with
+        an exit code of 1
+        :raises RuntimeError: If the run failed, or the worker didn't respond within the timeout
+        """
+        usage = process_usage(self.process.pid) if report is not None else None
+        self._end_of_run.clear()
+        self._run_started = time.perf_counter()
+        self.report = report
+        try:
+            response = self._send("\t".join(arguments), timeout)
+            # The output is read from another pipe than the response, so wait for its end to have been read too
+            self._end_of_run.wait(10)
+        finally:
+            self.report = None
+        if report is not None:
+            report.exit_code = 0 if response == "OK" else 1
+            finished = process_usage(self.process.pid)
+            if usage is not None and finished is not None:
+                report.child_cpu += finished[0] - usage[0]
+                report.peak_rss = max(report.peak_rss or 0, finished[1])
+        if response != "OK":
+            raise RuntimeError("ParSeMiS failed: %s" % response)
+
+    def close(self):
+        if self.process is None:
+            return
+        if self.is_alive():
+            try:
+                self.process.stdin.write("QUIT\n")
+                self.process.stdin.close()
+                self.process.wait(timeout=10)
+            except (BrokenPipeError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+
+    def restart(self):
+        self.close()
+        self.start()
+
+
+class MinerSession:
+    """
+    Mines graphs through a pool of long lived JVMs. Use it as a context manager, via ParsemisMiner.session():
+
+        with miner.session(pool_size=2) as session:
+            for batch in batches:
+                result = session.mine_graphs(batch, minimum_frequency="5%")
+
+    Mining parameters that configure the JVM itself (heap_size) are set when the session starts. With a
+    MemoryScheduler on the miner, the heap of every running JVM is held in the scheduler's budget until the session
+    closes.
+    """
+
+    def __init__(self, miner, pool_size=1, heap_size=None, timeout=None) -> None:
+        """
+        :param heap_size: The maximum heap of each JVM, defaults to the scheduler's maximum heap, or else 10g
+        """
+        super().__init__()
+        self.miner = miner
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.scheduler = miner.scheduler
+        if heap_size is None:
+            heap_size = format_size(self.scheduler.maximum_heap) if self.scheduler is not None else '10g'
+        self.heap = parse_size(heap_size)
+        class_directory = compile_server(miner.parsemis_location, "%s/server" % miner.data_location)
+        self.commands = ['java'] + miner.jvm_options(heap_size=heap_size) + \
+                        ['-cp', "%s%s%s" % (miner.parsemis_location, os.pathsep, class_directory), SERVER_CLASS]
+        self._workers = queue.Queue()
+        self._all_workers = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        for _ in range(self.pool_size):
+            if self.scheduler is not None:
+                self.scheduler.acquire(self.heap)
+            worker = JvmWorker(self.commands)
+            try:
+                worker.start()
+            except BaseException:
+                if self.scheduler is not None:
+                    self.scheduler.release(self.heap)
+                raise
+            self._all_workers.append(worker)
+            self._workers.put(worker)
+
+    def close(self):
+        for worker in self._all_workers:
+            worker.close()
+            if self.scheduler is not None:
+                self.scheduler.release(self.heap)
+        self._all_workers = []
+        self._workers = queue.Queue()
+
+    def check_health(self):
+        """
+        Pings every idle worker, restarting the ones that are dead or unresponsive
+        :return: The number of workers that had to be restarted
+        """
+        restarted = 0
+        for _ in range(self._workers.qsize()):
+            worker = self._workers.get()
+            if not worker.ping():
+                log.warning("Restarting unresponsive ParSeMiS worker")
+                worker.restart()
+                restarted += 1
+            self._workers.put(worker)
+        return restarted
+
+    def mine_graphs(self, graphs, **kwargs):
+        """
+        Mines a batch of graphs on one of the session's JVMs. Safe to call from several threads at once
+        :return: A MiningResult. The RunReport of the run is kept as the result's report, and as the miner's
+        last_report
+        """
+        job_location = tempfile.mkdtemp(dir=self.miner.data_location)
+        report = self.miner.last_report = RunReport(self.miner.metrics)
+        job = self.miner.isolated_job(job_location)
+        try:
+            with report.phase('write'):
+                job.write_graph(graphs)
+            report.bytes_written = os.path.getsize(job.input_file)
+            with report.phase('mine'):
+                self._run(job.build_arguments(**kwargs), report)
+            report.bytes_read = os.path.getsize(job.output_file)
+            with report.phase('read'):
+                frequent_graphs = job.read_graph(job.graph_index)
+            report.n_fragments = len(frequent_graphs)
+            result = MiningResult(frequent_graphs, job.graph_index)
+            result.report = report.finish()
+            return result
+        finally:
+            shutil.rmtree(job_location, ignore_errors=True)
+
+    def _run(self, arguments, report=None):
+        worker = self._workers.get()
+        try:
+            if not worker.is_alive():
+                worker.restart()
+            try:
+                worker.run(arguments, self.timeout, report)
+            except RuntimeError:
+                if worker.is_alive() and worker.ping():
+                    raise
+                # The JVM died or hung, so retry once on a fresh one
+                log.warning("Restarting failed ParSeMiS worker")
+                worker.restart()
+                worker.run(arguments, self.timeout, report)
+        finally:
+            self._workers.put(worker)
@@ -0,0 +1,110 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from parsemis.parsemis_wrapper import ParsemisMiner
+from parsemis.scheduler import MemoryScheduler, parse_size
+from parsemis.report import RunReport
+from parsemis.session import END_OF_RUN, SERVER_CLASS, JvmWorker
+from parsemis.testing import random_graphs
+
+# Speaks the ParsemisServer protocol, failing on "--fail" and exiting on "--crash"
+FAKE_SERVER = """
+import sys
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    if line == "PING":
+        print("PONG", flush=True)
+    elif line == "QUIT":
+        break
+    elif line == "--crash":
+        sys.exit(3)
+    else:
+        print("mining: " + line, file=sys.stderr)
+        print(%r, file=sys.stderr, flush=True)
+        print("ERROR failed" if line == "--fail" else "OK", flush=True)
+""" % END_OF_RUN
+
+# Answers every request by writing one single node fragment found in the first and third graphs
+WRITING_SERVER = """
+import sys
+for line in sys.stdin:
+    arguments = dict(argument.split("=", 1) for argument in line.rstrip("\\n").split("\\t") if "=" in argument)
+    if "--outputFile" in arguments:
+        with open(arguments["--outputFile"], "w") as f:
+            f.write("XP\\nv 1 a\\n%% => 2[0,2]\\n")
+        print("done: 1", file=sys.stderr)
+        print(%r, file=sys.stderr, flush=True)
+    print("PONG" if line.strip() == "PING" else "OK", flush=True)
+""" % END_OF_RUN
+
+
+class TestJvmWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.worker = JvmWorker([sys.executable, "-c", FAKE_SERVER])
+        self.worker.start()
+
+    def tearDown(self):
+        self.worker.close()
+
+    def test_run_and_ping(self):
+        self.assertTrue(self.worker.ping())
+        self.worker.run(["--graphFile=input.g", "--outputFile=output.g"], timeout=10)
+        self.assertRaises(RuntimeError, self.worker.run, ["--fail"], 10)
+        self.assertTrue(self.worker.ping())
+
+    def test_run_report(self):
+        report = RunReport()
+        self.worker.run(["--graphFile=input.g"], 10, report)
+        self.assertEqual(list(report.java_output), ["mining: --graphFile=input.g"])
+        self.assertEqual(report.exit_code, 0)
+        self.assertGreater(report.peak_rss, 0)
+
+        self.assertRaises(RuntimeError, self.worker.run, ["--fail"], 10, report)
+        self.assertEqual(list(report.java_output), ["mining: --graphFile=input.g", "mining: --fail"])
+        self.assertEqual(report.exit_code, 1)
+
+    def test_restart_after_crash(self):
+        self.assertRaises(RuntimeError, self.worker.run, ["--crash"], 10)
+        self.assertFalse(self.worker.ping())
+
+        self.worker.restart()
+        self.assertTrue(self.worker.ping())
+
+
+class TestMinerSession(unittest.TestCase):
+
+    def session(self, miner, **kwargs):
+        # An up to date class file stands in for compiling the server, which needs javac
+        os.makedirs("%s/server" % miner.data_location, exist_ok=True)
+        open("%s/server/%s.class" % (miner.data_location, SERVER_CLASS), "w").close()
+        session = miner.session(**kwargs)
+        session.commands = [sys.executable, "-c", WRITING_SERVER]
+        return session
+
+    def test_generator_input(self):
+        with self.session(ParsemisMiner(tempfile.mkdtemp())) as session:
+            result = session.mine_graphs(iter(random_graphs(4)))
+        self.assertEqual(result[0].appears_in.tolist(), ["g0", "g2"])
+
+    def test_report(self):
+        miner = ParsemisMiner(tempfile.mkdtemp())
+        with self.session(miner) as session:
+            result = session.mine_graphs(random_graphs(4))
+        report = result.report
+        self.assertIs(report, miner.last_report)
+        self.assertEqual(list(report.phases), ['write', 'mine', 'read'])
+        self.assertEqual(report.exit_code, 0)
+        self.assertGreater(report.peak_rss, 0)
+        self.assertGreater(report.bytes_written, 0)
+        self.assertGreater(report.bytes_read, 0)
+        self.assertEqual(report.n_fragments, 1)
+        self.assertEqual(list(report.java_output), ["done: 1"])
+
+    def test_heap_held_in_budget(self):
+        scheduler = MemoryScheduler(budget='8g', maximum_heap='2g')
+        with self.session(ParsemisMiner(tempfile.mkdtemp(), scheduler=scheduler), pool_size=2):
+            self.assertEqual(scheduler.reserved, 2 * parse_size('2g'))
+        self.assertEqual(scheduler.reserved, 0)
@@ -0,0 +1,99 @@
+"""
+Partition and merge mining across several ParSeMiS processes.
+
+The collection is split into contiguous shards, and each shard is mined in its own process with a threshold scaled
+to its size. A fragment that is frequent in the whole collection has to be frequent in at least one shard, so the
+union of the shard results is a complete set of candidates. A verification pass then counts the support of each
+candidate in the shards that didn't report it, which gives exactly the result of mining the whole collection.
+"""
+import logging as log
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from parsemis.containment import contains, pattern_key, written_sets
+from parsemis.results import MiningResult
+from parsemis.support import GraphIndex, GraphSupport
+
+
+def mine_sharded(miner, graphs, n_shards=None, n_workers=None, **kwargs):
+    """
+    Mines a collection of graphs shard by shard. See ParsemisMiner.mine_graphs_sharded
+    """
+    graphs = list(graphs)
+    if len(graphs) == 0:
+        return MiningResult([], graphs)
+    n_workers = n_workers or os.cpu_count() or 1
+    n_shards = max(1, min(n_shards or n_workers, len(graphs)))
+    minimum_frequency = miner.resolve_frequency(kwargs.pop('minimum_frequency', '0.05'), len(graphs))
+    maximum_frequency = kwargs.pop('maximum_frequency', None)
+    close_graph = kwargs.pop('close_graph', False)
+
+    bounds = [(shard[0], shard[-1] + 1) for shard in np.array_split(np.arange(len(graphs)), n_shards)]
+    jobs = []
+    for i, (start, end) in enumerate(bounds):
+        # If a fragment is below floor(f * n_i / N) in every shard, its total support is below f
+        shard_frequency = max(1, int(math.floor(minimum_frequency * (end - start) / len(graphs))))
+        shard_kwargs = dict(kwargs, minimum_frequency=shard_frequency, store_embeddings=True)
+        shard_location = "%s/shard_%i" % (miner.data_location, i)
+        jobs.append((miner.__class__, shard_location, miner.mine_undirected, graphs[start:end], shard_kwargs))
+
+    log.debug("Mining %i graphs in %i shards with %i workers" % (len(graphs), n_shards, n_workers))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        shard_results = list(executor.map(_mine_shard, jobs))
+
+    directed = not miner.mine_undirected
+    candidates = {}
+    for shard, (start, _) in enumerate(bounds):
+        for frequent_graph, positions in shard_results[shard]:
+            key = pattern_key(frequent_graph.compact, directed)
+            if key not in candidates:
+                candidates[key] = (frequent_graph, {})
+            candidates[key][1][shard] = positions + start
+
+    shard_sets = {}
+    frequent_graphs = []
+    index = GraphIndex.from_graphs(graphs)
+    for key, (frequent_graph, found) in candidates.items():
+        positions = list(found.values())
+        for shard, (start, end) in enumerate(bounds):
+            if shard in found:
+                continue
+            if shard not in shard_sets:
+                shard_sets[shard] = [written_sets(graph, directed) for graph in graphs[start:end]]
+            positions.append(np.array([start + i for i, sets in enumerate(shard_sets[shard])
+                                       if contains(sets, key)], dtype=np.int32))
+        support = GraphSupport(np.concatenate(positions), index)
+        if len(support) < minimum_frequency:
+            continue
+        if maximum_frequency is not None and len(support) > maximum_frequency:
+            continue
+        frequent_graphs.append((key, type(frequent_graph)(frequent_graph.compact, support)))
+
+    if close_graph:
+        frequent_graphs = _closed(frequent_graphs)
+    return MiningResult([frequent_graph for _, frequent_graph in frequent_graphs], graphs)
+
+
+def _mine_shard(job):
+    miner_class, data_location, mine_undirected, graphs, kwargs = job
+    miner = miner_class(data_location, mine_undirected=mine_undirected, debug=False)
+    result = miner.mine_graphs(graphs, **kwargs)
+    return [(frequent_graph, result.graph_positions(i)) for i, frequent_graph in enumerate(result)]
+
+
+def _closed(frequent_graphs):
+    """
+    Removes the fragments that have a frequent super fragment with the same support
+    """
+    by_support = {}
+    for key, frequent_graph in frequent_graphs:
+        by_support.setdefault(frequent_graph.support, []).append(key)
+
+    closed = []
+    for key, frequent_graph in frequent_graphs:
+        if not any(other != key and contains(other, key) for other in by_support[frequent_graph.support]):
+            closed.append((key, frequent_graph))
+    return closed
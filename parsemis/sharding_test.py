@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+
+import networkx as nx
+
+from parsemis.parsemis_wrapper import ParsemisMiner
+from parsemis.testing import NodeAndEdgeMiner, as_dict, random_graphs
+
+
+class TestShardedMining(unittest.TestCase):
+
+    def test_resolve_frequency(self):
+        self.assertEqual(ParsemisMiner.resolve_frequency("1%", 681), 7)
+        self.assertEqual(ParsemisMiner.resolve_frequency("5%", 100), 5)
+        self.assertEqual(ParsemisMiner.resolve_frequency(0.05, 100), 5)
+        self.assertEqual(ParsemisMiner.resolve_frequency(3, 100), 3)
+
+    def test_sharded_matches_single_run(self):
+        graphs = random_graphs(60)
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+
+        for minimum_frequency in ["10%", 7, 0.3]:
+            expected = as_dict(miner.mine_graphs(graphs, minimum_frequency=minimum_frequency))
+            sharded = miner.mine_graphs_sharded(graphs, n_shards=4, n_workers=2, minimum_frequency=minimum_frequency)
+            self.assertEqual(as_dict(sharded), expected)
+
+    def test_sharded_empty_collection(self):
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+        expected = miner.mine_graphs([], minimum_frequency=1)
+        result = miner.mine_graphs_sharded([], n_shards=4, n_workers=2, minimum_frequency=1)
+        self.assertEqual(len(result), len(expected))
+        self.assertEqual(len(result), 0)
+        self.assertEqual(len(result.index), 0)
+
+    def test_sharded_close_graph(self):
+        graphs = [nx.Graph(id="g%i" % i) for i in range(4)]
+        for graph in graphs:
+            graph.add_edge("a", "b", label="x")
+        graphs[0].add_node("c")
+
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp())
+        result = miner.mine_graphs_sharded(graphs, n_shards=2, n_workers=2, minimum_frequency=1, close_graph=True)
+        self.assertEqual(sorted(sorted(fg.graph.nodes()) for fg in result), [["a", "b"], ["c"]])
@@ -0,0 +1,150 @@
+"""
+Batch similarity between many subgraphs and many supergraphs.
+
+The nodes and labelled edges of the supergraphs are encoded once as integer features, giving a sparse
+graph x feature matrix. Each subgraph is broken into elements (its nodes and edges), where an element is present
+in a supergraph when any of its features is. A pattern x graph matrix of present elements then comes from two sparse
+matrix products, with the same semantics as ParsemisMiner.calculate_dot_product_similarity and
+calculate_jaccard_similarity.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+
+from parsemis.compact import CompactGraph
+
+
+def _node_feature(node):
+    return 'n', node
+
+
+def _edge_feature(u, v, labelled, label):
+    return 'e', u, v, labelled, label
+
+
+def _edge_labels(graph, attribute_name):
+    """
+    Groups the labels of every connected node pair, as ParsemisMiner.get_label_from_edge would return them
+    :return: A dict of (u, v) -> (number of edges, list of labels)
+    """
+    pairs = {}
+    for u, v, data in graph.edges(data=True):
+        count, labels = pairs.setdefault((u, v), (0, []))
+        if attribute_name in data:
+            labels.append(data[attribute_name])
+        pairs[(u, v)] = (count + 1, labels)
+    return pairs
+
+
+class SimilarityIndex:
+    """
+    Encodes a collection of supergraphs once, so that many subgraphs can be scored against all of them
+    """
+
+    def __init__(self, graphs, attribute_name='label') -> None:
+        super().__init__()
+        self.attribute_name = attribute_name
+        self._features = {}
+        indptr, indices = [0], []
+        for graph in graphs:
+            features = set()
+            undirected = not nx.is_directed(graph)
+            for node in graph.nodes():
+                features.add(self._feature_id(_node_feature(node)))
+            for (u, v), (_, labels) in _edge_labels(graph, attribute_name).items():
+                for a, b in ((u, v), (v, u)) if undirected else ((u, v),):
+                    if len(labels) == 0:
+                        features.add(self._feature_id(_edge_feature(a, b, False, None)))
+                    for label in labels:
+                        features.add(self._feature_id(_edge_feature(a, b, True, label)))
+            indices.extend(sorted(features))
+            indptr.append(len(indices))
+        self._graph_features = csr_matrix((np.ones(len(indices), dtype=np.int32), indices, indptr),
+                                          shape=(len(indptr) - 1, len(self._features)))
+
+    def _feature_id(self, feature):
+        return self._features.setdefault(feature, len(self._features))
+
+    def __len__(self):
+        return self._graph_features.shape[0]
+
+    def _encode(self, sub_graphs, count_parallel_edges):
+        """
+        Encodes subgraphs as a pattern x element weight matrix, and an element x feature matrix
+        """
+        pattern_indptr, pattern_indices, weights = [0], [], []
+        element_indptr, element_indices = [0], []
+        for sub_graph in sub_graphs:
+            for node in sub_graph.nodes():
+                element_keys = [_node_feature(node)]
+                self._add_element(element_keys, element_indptr, element_indices, pattern_indices, weights, 1)
+            for (u, v), (count, labels) in _edge_labels(sub_graph, self.attribute_name).items():
+                if len(labels) == 0:
+                    element_keys = [_edge_feature(u, v, False, None)]
+                else:
+                    element_keys = [_edge_feature(u, v, True, label) for label in labels]
+                weight = count if count_parallel_edges else 1
+                self._add_element(element_keys, element_indptr, element_indices, pattern_indices, weights, weight)
+            pattern_indptr.append(len(pattern_indices))
+
+        n_elements = len(element_indptr) - 1
+        patterns = csr_matrix((np.array(weights, dtype=np.float64), pattern_indices, pattern_indptr),
+                              shape=(len(pattern_indptr) - 1, n_elements))
+        elements = csr_matrix((np.ones(len(element_indices), dtype=np.int32), element_indices, element_indptr),
+                              shape=(n_elements, len(self._features)))
+        return patterns, elements
+
+    def _add_element(self, element_keys, element_indptr, element_indices, pattern_indices, weights, weight):
+        feature_ids = {self._features[key] for key in element_keys if key in self._features}
+        element_indices.extend(sorted(feature_ids))
+        pattern_indices.append(len(element_indptr) - 1)
+        element_indptr.append(len(element_indices))
+        weights.append(weight)
+
+    def _similarity(self, sub_graphs, count_parallel_edges, n_workers, sparse):
+        sub_graphs = [sub_graph if isinstance(sub_graph, (nx.Graph, CompactGraph)) else sub_graph.compact
+                      for sub_graph in sub_graphs]
+        patterns, elements = self._encode(sub_graphs, count_parallel_edges)
+        if n_workers is not None and n_workers > 1 and patterns.shape[0] > 1:
+            chunks = np.array_split(np.arange(patterns.shape[0]), n_workers)
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                parts = list(executor.map(_present_weights,
+                                          [(patterns[chunk], elements, self._graph_features) for chunk in chunks]))
+            present = vstack(parts).tocsr()
+        else:
+            present = _present_weights((patterns, elements, self._graph_features))
+
+        totals = np.asarray(patterns.sum(axis=1)).ravel()
+        totals[totals == 0] = 1
+        present = csr_matrix(present.multiply(1 / totals[:, np.newaxis]))
+        return present if sparse else present.toarray()
+
+    def dot_product_matrix(self, sub_graphs, n_workers=None, sparse=False):
+        """
+        :param sub_graphs: NetworkX graphs, CompactGraphs or FrequentGraph objects
+        :param n_workers: Splits the patterns across a process pool of this size
+        :param sparse: Returns a scipy.sparse.csr_matrix rather than a dense array
+        :return: A sub graph x graph matrix, matching calculate_dot_product_similarity for every pair
+        """
+        return self._similarity(sub_graphs, True, n_workers, sparse)
+
+    def jaccard_matrix(self, sub_graphs, n_workers=None, sparse=False):
+        """
+        :param sub_graphs: NetworkX graphs, CompactGraphs or FrequentGraph objects
+        :param n_workers: Splits the patterns across a process pool of this size
+        :param sparse: Returns a scipy.sparse.csr_matrix rather than a dense array
+        :return: A sub graph x graph matrix, matching calculate_jaccard_similarity for every pair
+        """
+        return self._similarity(sub_graphs, False, n_workers, sparse)
+
+
+def _present_weights(job):
+    """
+    :return: The total weight of the elements of each pattern that are present in each graph
+    """
+    patterns, elements, graph_features = job
+    present = elements @ graph_features.T
+    present.data[:] = 1
+    return patterns @ present
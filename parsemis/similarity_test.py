@@ -0,0 +1,37 @@
+import random
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from parsemis.parsemis_wrapper import ParsemisMiner
+from parsemis.similarity import SimilarityIndex
+from parsemis.testing import random_mixed_graphs
+
+
+class TestSimilarityIndex(unittest.TestCase):
+
+    def test_matches_pairwise_similarity(self):
+        rng = random.Random(0)
+        for graph_class in [nx.Graph, nx.DiGraph, nx.MultiGraph, nx.MultiDiGraph]:
+            sub_graphs = random_mixed_graphs(graph_class, 15, rng)
+            super_graphs = random_mixed_graphs(graph_class, 10, rng)
+
+            dot_product = ParsemisMiner.calculate_dot_product_similarity_matrix(sub_graphs, super_graphs)
+            jaccard = ParsemisMiner.calculate_jaccard_similarity_matrix(sub_graphs, super_graphs)
+            for i, sub_graph in enumerate(sub_graphs):
+                for j, super_graph in enumerate(super_graphs):
+                    self.assertAlmostEqual(
+                        dot_product[i, j], ParsemisMiner.calculate_dot_product_similarity(sub_graph, super_graph))
+                    self.assertAlmostEqual(
+                        jaccard[i, j], ParsemisMiner.calculate_jaccard_similarity(sub_graph, super_graph))
+
+    def test_process_pool(self):
+        rng = random.Random(1)
+        sub_graphs = random_mixed_graphs(nx.Graph, 9, rng)
+        index = SimilarityIndex(random_mixed_graphs(nx.Graph, 7, rng))
+
+        np.testing.assert_allclose(index.dot_product_matrix(sub_graphs, n_workers=3),
+                                   index.dot_product_matrix(sub_graphs))
+        np.testing.assert_allclose(index.jaccard_matrix(sub_graphs, sparse=True).toarray(),
+                                   index.jaccard_matrix(sub_graphs))
@@ -0,0 +1,213 @@
+"""
+Compact binary storage for mining results.
+
+Frequent graphs are flattened into a handful of numpy arrays, laid out as a GraphStore's are: per fragment offsets
+into arrays of node label codes, edges, edge label codes and supporting graph positions, along with each fragment's
+string and rank. save_results writes one .npy file per column to a directory, with the labels and graph ids as
+JSON, so labels load back with the types they had. load_results memory maps the columns, so a result set of any size
+opens at once, and a fragment is only built from its slices of the columns when it is accessed. Saving only ever
+replaces a directory that holds saved results. The result cache keeps its entries in the same format.
+"""
+import os
+from collections.abc import Sequence
+
+import numpy as np
+
+from parsemis.compact import CompactGraph
+from parsemis.dataset import concatenate_arrays, count_offsets, edge_label_codes, label_codes, read_meta, write_arrays
+from parsemis.results import MiningResult
+from parsemis.support import GraphIndex, GraphSupport
+from parsemis.vocabulary import LabelVocabulary
+
+RESULTS_VERSION = 1
+RESULTS_FORMAT = 'results'
+COLUMNS = ('directed', 'node_offsets', 'node_labels', 'edge_offsets', 'edges', 'edge_labels', 'support_offsets',
+           'support_positions', 'ranks', 'string_offsets', 'strings')
+
+
+class _LabelMapping:
+    """
+    Maps the label ids of fragments to codes in one vocabulary, converting each distinct label table once
+    """
+
+    def __init__(self, vocabulary) -> None:
+        super().__init__()
+        self.vocabulary = vocabulary
+        self._tables = {}
+
+    def codes(self, labels):
+        table, codes = self._tables.get(id(labels), (None, None))
+        if table is not labels or len(codes) < len(labels):
+            codes = label_codes(self.vocabulary, labels)
+            self._tables[id(labels)] = (labels, codes)
+        return codes
+
+
+def _is_results(meta):
+    # Results saved before the format was recorded are told apart from graph stores by having no source
+    return 'ids' in meta and 'source' not in meta
+
+
+def _read_results_meta(path):
+    """
+    :return: The metadata of the results saved in a directory, or None if it holds none
+    """
+    return read_meta(path, RESULTS_FORMAT, _is_results)
+
+
+def save_results(path, frequent_graphs, index=None):
+    """
+    Writes frequent graphs to a directory of columns, replacing any results already there. Any other file or
+    directory at path is left alone, and raises a FileExistsError
+    :param frequent_graphs: A MiningResult, or a sequence of FrequentGraph objects
+    :param index: The GraphIndex supports are positions in. Defaults to the index of the result, or of the supports
+    """
+    if os.path.exists(path) and _read_results_meta(path) is None:
+        raise FileExistsError("%s exists and does not hold saved results" % path)
+    if index is None:
+        index = frequent_graphs.index if isinstance(frequent_graphs, MiningResult) else \
+            MiningResult(frequent_graphs).index
+    vocabulary = LabelVocabulary()
+    mapping = _LabelMapping(vocabulary)
+    directed, node_labels, edges, edge_labels, positions, ranks, strings = [], [], [], [], [], [], []
+    for frequent_graph in frequent_graphs:
+        graph = frequent_graph.compact
+        codes = mapping.codes(graph.labels)
+        directed.append(graph.directed)
+        node_labels.append(codes[graph.node_labels])
+        edges.append(graph.edges_array)
+        edge_labels.append(edge_label_codes(graph.edge_labels, codes))
+        support = frequent_graph.appears_in
+        if isinstance(support, GraphSupport) and support.index is index:
+            positions.append(support.positions)
+        else:
+            positions.append(np.unique(np.array([index.add(graph_id) for graph_id in support], dtype=np.int32)))
+        ranks.append(np.nan if frequent_graph.rank is None else frequent_graph.rank)
+        strings.append(frequent_graph.to_string().encode("utf-8"))
+
+    columns = {
+        'directed': np.array(directed, dtype=bool),
+        'node_offsets': count_offsets([len(a) for a in node_labels]),
+        'node_labels': concatenate_arrays(node_labels, np.int32),
+        'edge_offsets': count_offsets([len(a) for a in edge_labels]),
+        'edges': concatenate_arrays(edges, np.int32).reshape(-1, 2),
+        'edge_labels': concatenate_arrays(edge_labels, np.int32),
+        'support_offsets': count_offsets([len(a) for a in positions]),
+        'support_positions': concatenate_arrays(positions, np.int32),
+        'ranks': np.array(ranks, dtype=np.float64),
+        'string_offsets': count_offsets([len(a) for a in strings]),
+        'strings': np.frombuffer(b"".join(strings), dtype=np.uint8),
+    }
+
+    write_arrays(path, columns, vocabulary,
+                  {'format': RESULTS_FORMAT, 'version': RESULTS_VERSION, 'ids': index.ids.tolist()})
+
+
+def load_results(path, frequent_graph_class=None, mmap_mode='r', index=None):
+    """
+    Opens results written by save_results, without reading the columns
+    :param frequent_graph_class: The class to build each result with, defaults to FrequentGraph
+    :param mmap_mode: The mode the columns are memory mapped with, or None to read them into memory
+    :param index: The GraphIndex the supports are positions in, defaults to one of the graph ids saved with the results
+    :return: A StoredResults
+    """
+    return StoredResults(path, frequent_graph_class, mmap_mode, index)
+
+
+class StoredResults(Sequence):
+    """
+    A sequence of frequent graphs backed by memory mapped columns. Each fragment is built when it is accessed, and
+    supports, ranks and strings can be read without building any
+    """
+
+    def __init__(self, path, frequent_graph_class=None, mmap_mode='r', index=None) -> None:
+        super().__init__()
+        if frequent_graph_class is None:
+            from parsemis.parsemis_wrapper import FrequentGraph
+            frequent_graph_class = FrequentGraph
+        self.path = path
+        self.frequent_graph_class = frequent_graph_class
+        meta = _read_results_meta(path)
+        if meta is None:
+            raise ValueError("%s does not hold saved results" % path)
+        if meta['version'] != RESULTS_VERSION:
+            raise ValueError("Results %s have version %s, expected %i" % (path, meta['version'], RESULTS_VERSION))
+        self._ids = meta['ids']
+        self._index = index
+        self.labels = LabelVocabulary.load(os.path.join(path, "labels.json")).labels
+        self.columns = {name: np.load(os.path.join(path, "%s.npy" % name), mmap_mode=mmap_mode)
+                        for name in COLUMNS}
+
+    @property
+    def index(self):
+        """
+        :return: The GraphIndex of the collection the results were mined from
+        """
+        if self._index is None:
+            self._index = GraphIndex(self._ids)
+        return self._index
+
+    def __len__(self):
+        return len(self.columns['directed'])
+
+    def _slice(self, name, item):
+        offsets = self.columns['%s_offsets' % name]
+        return slice(int(offsets[item]), int(offsets[item + 1]))
+
+    def _check(self, item):
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("Result index out of range")
+        return item
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        item = self._check(item)
+        columns = self.columns
+        nodes, edges = self._slice('node', item), self._slice('edge', item)
+        graph = CompactGraph(self.labels, columns['node_labels'][nodes], columns['edges'][edges],
+                             columns['edge_labels'][edges], bool(columns['directed'][item]), item + 1)
+        frequent_graph = self.frequent_graph_class(graph, GraphSupport(self.graph_positions(item), self.index))
+        rank = columns['ranks'][item]
+        if not np.isnan(rank):
+            frequent_graph.set_rank(float(rank))
+        return frequent_graph
+
+    def graph_positions(self, pattern):
+        """
+        :return: The positions of the input graphs a frequent graph appears in
+        """
+        return self.columns['support_positions'][self._slice('support', self._check(pattern))]
+
+    def graphs_containing(self, pattern):
+        """
+        :return: The ids of the input graphs a frequent graph appears in
+        """
+        return self.index.ids[self.graph_positions(pattern)].tolist()
+
+    def support_counts(self):
+        """
+        :return: An array holding the support of each frequent graph
+        """
+        return np.diff(self.columns['support_offsets'])
+
+    @property
+    def ranks(self):
+        """
+        :return: An array holding the rank of each frequent graph, NaN where it had none
+        """
+        return self.columns['ranks']
+
+    def to_string(self, pattern):
+        """
+        :return: The string of a frequent graph, as FrequentGraph.to_string gave when it was saved
+        """
+        return self.columns['strings'][self._slice('string', self._check(pattern))].tobytes().decode("utf-8")
+
+    def to_result(self):
+        """
+        :return: A MiningResult holding every frequent graph
+        """
+        return MiningResult(list(self), self.index)
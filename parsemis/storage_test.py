@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from parsemis.dataset import GraphStore
+from parsemis.parsemis_wrapper import FrequentGraph
+from parsemis.storage import load_results, save_results
+from parsemis.testing import NodeAndEdgeMiner, random_graphs
+from parsemis.vocabulary import LabelVocabulary
+
+
+class TestColumnarResults(unittest.TestCase):
+
+    def setUp(self):
+        self.result = NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(random_graphs(50, seed=8),
+                                                                        minimum_frequency=3)
+        for i, frequent_graph in enumerate(self.result):
+            if i % 3:
+                frequent_graph.set_rank(i / 2)
+        self.path = os.path.join(tempfile.mkdtemp(), "results")
+        save_results(self.path, self.result)
+
+    def test_round_trip(self):
+        stored = load_results(self.path)
+        self.assertEqual(len(stored), len(self.result))
+        self.assertIsInstance(stored.columns['support_positions'], np.memmap)
+        np.testing.assert_array_equal(stored.support_counts(), self.result.support_counts())
+
+        for i, expected in enumerate(self.result):
+            frequent_graph = stored[i]
+            self.assertEqual(frequent_graph, expected)
+            self.assertEqual(frequent_graph.appears_in.tolist(), expected.appears_in.tolist())
+            self.assertEqual(frequent_graph.rank, expected.rank)
+            self.assertEqual(stored.to_string(i), expected.to_string())
+            self.assertEqual(stored.graphs_containing(i), self.result.graphs_containing(i))
+        self.assertEqual(stored[-1], self.result[-1])
+        self.assertTrue(np.isnan(stored.ranks[0]))
+
+        result = stored.to_result()
+        self.assertEqual(result.patterns_in("g4"), self.result.patterns_in("g4"))
+
+    def test_networkx_fragments_and_overwrite(self):
+        fragments = [FrequentGraph(frequent_graph.graph, frequent_graph.appears_in.tolist())
+                     for frequent_graph in self.result[:5]]
+        save_results(self.path, fragments, self.result.index)
+        stored = load_results(self.path, mmap_mode=None)
+        self.assertEqual(len(stored), 5)
+        self.assertEqual(stored[:5], self.result[:5])
+        self.assertEqual([fg.appears_in.tolist() for fg in stored], [fg.appears_in for fg in fragments])
+        with self.assertRaises(IndexError):
+            stored[5]
+
+    def test_only_replaces_results(self):
+        directory = tempfile.mkdtemp()
+        with open(os.path.join(directory, "keep.txt"), "w") as f:
+            f.write("not results")
+        store = GraphStore.compile([], os.path.join(directory, "store"), n_workers=1)
+        for path in (directory, os.path.join(directory, "keep.txt"), store.path):
+            with self.assertRaises(FileExistsError):
+                save_results(path, self.result)
+        self.assertEqual(len(GraphStore(store.path)), 0)
+        self.assertTrue(os.path.exists(os.path.join(directory, "keep.txt")))
+
+        # Results saved before the format was recorded are still replaced
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump({'version': 1, 'ids': []}, f)
+        save_results(self.path, self.result[:2])
+        self.assertEqual(len(load_results(self.path)), 2)
+
+    def test_int_labels(self):
+        graphs = []
+        for i in range(3):
+            graph = nx.Graph(id="g%i" % i)
+            graph.add_edge(1, 2 + i % 2, label=7)
+            graphs.append(graph)
+        result = NodeAndEdgeMiner(tempfile.mkdtemp(), label_vocabulary=LabelVocabulary()).mine_graphs(graphs)
+        single_node = [frequent_graph for frequent_graph in result if len(frequent_graph.graph) == 1]
+        self.assertEqual(sorted(frequent_graph.to_string() for frequent_graph in single_node), ["1", "2", "3"])
+
+        save_results(self.path, result)
+        stored = load_results(self.path)
+        self.assertEqual([stored.to_string(i) for i in range(len(stored))], [fg.to_string() for fg in result])
+        self.assertEqual(stored[:], result[:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Compact storage for the supports of frequent graphs.
+
+Instead of keeping a Python list of graph ids per FrequentGraph, the input graphs a fragment appears in are
+stored as a sorted numpy array of positions in the input collection, while the ids themselves are held once
+in a GraphIndex that is shared between all of the fragments of a mining run.
+"""
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class GraphIndex:
+    """
+    Maps the ids of the graphs in an input collection to their position in that collection
+    """
+
+    __slots__ = ('_ids', '_positions', '_id_array')
+
+    def __init__(self, ids=()) -> None:
+        super().__init__()
+        self._ids = []
+        self._positions = {}
+        self._id_array = None
+        for graph_id in ids:
+            self.append(graph_id)
+
+    @classmethod
+    def from_graphs(cls, graphs):
+        """
+        Builds an index over a collection of NetworkX graphs, using their 'id' graph attribute, or their
+        position in the collection when they don't have one
+        """
+        return cls(graph.graph.get('id', position) for position, graph in enumerate(graphs))
+
+    def add(self, graph_id):
+        """
+        Adds a graph id to the index if it isn't already present
+        :return: The position of the graph id
+        """
+        position = self._positions.get(graph_id)
+        if position is None:
+            position = len(self._ids)
+            self._ids.append(graph_id)
+            self._positions[graph_id] = position
+            self._id_array = None
+        return position
+
+    def append(self, graph_id):
+        """
+        Adds the next graph of the collection, even if its id is already present
+        :return: The position of the graph
+        """
+        position = len(self._ids)
+        self._ids.append(graph_id)
+        self._positions.setdefault(graph_id, position)
+        self._id_array = None
+        return position
+
+    def position(self, graph_id):
+        """
+        :return: The position of a graph id (the first one, if the id is repeated), or None if it isn't in the index
+        """
+        return self._positions.get(graph_id)
+
+    @property
+    def ids(self):
+        """
+        :return: A numpy object array where position i holds the id of the i-th graph
+        """
+        if self._id_array is None:
+            self._id_array = np.empty(len(self._ids), dtype=object)
+            self._id_array[:] = self._ids
+        return self._id_array
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getstate__(self):
+        return self._ids
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+
+class GraphSupport:
+    """
+    The set of input graphs a frequent graph appears in, stored as a sorted int32 array of positions in a
+    GraphIndex.
+
+    Iterating over a GraphSupport yields graph ids, and `graph_id in support` is a dictionary lookup followed by a
+    binary search. Supports over the same GraphIndex can be combined with &, | and -.
+    """
+
+    __slots__ = ('_positions', '_index')
+
+    def __init__(self, positions, index: GraphIndex) -> None:
+        super().__init__()
+        self._positions = np.unique(np.asarray(positions, dtype=np.int32))
+        self._index = index
+
+    @property
+    def positions(self):
+        return self._positions
+
+    @property
+    def index(self):
+        return self._index
+
+    def tolist(self):
+        return self._index.ids[self._positions].tolist()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __contains__(self, graph_id):
+        position = self._index.position(graph_id)
+        if position is None:
+            return False
+        i = np.searchsorted(self._positions, position)
+        return i < len(self._positions) and self._positions[i] == position
+
+    def __eq__(self, other):
+        if isinstance(other, GraphSupport):
+            if self._index is other._index:
+                return np.array_equal(self._positions, other._positions)
+            return self.tolist() == other.tolist()
+        if isinstance(other, Sequence):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "GraphSupport(%s)" % self.tolist()
+
+    def _check_index(self, other):
+        if self._index is not other._index:
+            raise ValueError("Supports can only be combined when they share the same GraphIndex")
+
+    def intersection(self, other):
+        self._check_index(other)
+        return GraphSupport(np.intersect1d(self._positions, other._positions, assume_unique=True), self._index)
+
+    def union(self, other):
+        self._check_index(other)
+        return GraphSupport(np.union1d(self._positions, other._positions), self._index)
+
+    def difference(self, other):
+        self._check_index(other)
+        return GraphSupport(np.setdiff1d(self._positions, other._positions, assume_unique=True), self._index)
+
+    __and__ = intersection
+    __or__ = union
+    __sub__ = difference
@@ -0,0 +1,49 @@
+import pickle
+import unittest
+
+import networkx as nx
+
+from parsemis.parsemis_wrapper import FrequentGraph
+from parsemis.support import GraphIndex, GraphSupport
+
+
+class TestGraphSupport(unittest.TestCase):
+
+    def setUp(self):
+        self.index = GraphIndex.from_graphs([nx.Graph(id="g%i" % i) for i in range(6)])
+
+    def test_membership(self):
+        support = GraphSupport([4, 1, 1, 3], self.index)
+
+        self.assertEqual(len(support), 3)
+        self.assertEqual(support.tolist(), ["g1", "g3", "g4"])
+        self.assertIn("g3", support)
+        self.assertNotIn("g0", support)
+        self.assertNotIn("missing", support)
+
+    def test_set_algebra(self):
+        a = GraphSupport([0, 1, 2, 3], self.index)
+        b = GraphSupport([2, 3, 4], self.index)
+
+        self.assertEqual((a & b).tolist(), ["g2", "g3"])
+        self.assertEqual((a | b).tolist(), ["g0", "g1", "g2", "g3", "g4"])
+        self.assertEqual((a - b).tolist(), ["g0", "g1"])
+        self.assertRaises(ValueError, a.intersection, GraphSupport([0], GraphIndex(["g0"])))
+
+    def test_equality(self):
+        support = GraphSupport([1, 3], self.index)
+        self.assertEqual(support, GraphSupport([3, 1], self.index))
+        self.assertEqual(support, ["g1", "g3"])
+        self.assertNotEqual(support, ("g1",))
+        self.assertFalse(support == None)
+        self.assertNotEqual(support, 5)
+
+    def test_graph_index_pickles(self):
+        index = pickle.loads(pickle.dumps(self.index))
+        self.assertEqual(index.position("g5"), 5)
+        self.assertEqual(len(index), 6)
+
+    def test_frequent_graph_support(self):
+        fg = FrequentGraph(nx.Graph(), GraphSupport([0, 5], self.index))
+        self.assertEqual(fg.support, 2)
+        self.assertRaises(AttributeError, setattr, fg, "other", 1)
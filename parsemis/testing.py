@@ -0,0 +1,87 @@
+"""
+Stand-ins and graph generators shared by the tests.
+
+NodeAndEdgeMiner takes the place of ParSeMiS, which needs Java, so mining can be tested end to end anywhere. The
+generators build small random collections of labelled graphs, and as_dict keys a result by its fragments so two
+results can be compared whatever the order of their fragments.
+"""
+import random
+
+import networkx as nx
+
+from parsemis.parsemis_wrapper import ParsemisMiner
+
+
+class NodeAndEdgeMiner(ParsemisMiner):
+    """
+    Stands in for ParSeMiS by reporting every single node and single edge fragment of a .g input file
+    """
+
+    def perform_mining(self, **kwargs):
+        graphs = []
+        with open(self.input_file) as f:
+            for line in f:
+                parts = line.strip().split(" ")
+                if parts[0] == "XP":
+                    graphs.append(({}, set()))
+                elif parts[0] == "v":
+                    graphs[-1][0][parts[1]] = parts[2]
+                elif parts[0] == "u":
+                    nodes = graphs[-1][0]
+                    graphs[-1][1].add((tuple(sorted((nodes[parts[1]], nodes[parts[2]]))), parts[3]))
+
+        fragments = {}
+        for position, (nodes, edges) in enumerate(graphs):
+            for node in set(nodes.values()):
+                fragments.setdefault("v 1 %s\n" % node, []).append(position)
+            for (u, v), label in edges:
+                fragments.setdefault("v 1 %s\nv 2 %s\nu 1 2 %s\n" % (u, v, label), []).append(position)
+
+        minimum_frequency = self.resolve_frequency(kwargs.get('minimum_frequency', '0.05'), len(graphs))
+        with open(self.output_file, "w") as f:
+            for fragment, positions in fragments.items():
+                if len(positions) >= minimum_frequency:
+                    f.write("XP\n%s%% => %i[%s]\n" % (fragment, len(positions), ",".join(map(str, positions))))
+        return 0
+
+
+def random_graphs(n_graphs, seed=0):
+    """
+    :return: Undirected graphs with ids g0, g1, ..., whose nodes are the letters a to h and whose edges are labelled
+    x or y
+    """
+    rng = random.Random(seed)
+    graphs = []
+    for i in range(n_graphs):
+        graph = nx.Graph(id="g%i" % i)
+        for _ in range(rng.randint(1, 6)):
+            u, v = rng.sample("abcdefgh", 2)
+            graph.add_edge(u, v, label=rng.choice("xy"))
+        graphs.append(graph)
+    return graphs
+
+
+def random_mixed_graphs(graph_class, n_graphs, rng):
+    """
+    :param graph_class: The NetworkX graph class to build, such as a MultiDiGraph
+    :param rng: A random.Random
+    :return: Graphs whose nodes are the integers 0 to 5, and whose edges are labelled a or b, or left unlabelled
+    """
+    graphs = []
+    for _ in range(n_graphs):
+        graph = graph_class()
+        for _ in range(rng.randint(1, 5)):
+            u, v = rng.sample(range(6), 2)
+            if rng.random() < 0.2:
+                graph.add_edge(u, v)
+            else:
+                graph.add_edge(u, v, label=rng.choice("ab"))
+        graphs.append(graph)
+    return graphs
+
+
+def as_dict(result):
+    """
+    :return: A dict of the nodes and edges of each fragment of a result -> the ids of the graphs it appears in
+    """
+    return {frozenset(fg.graph.nodes()) | frozenset(fg.graph.edges()): fg.appears_in.tolist() for fg in result}
@@ -0,0 +1,135 @@
+"""
+Integer encoding of node and edge labels.
+
+With a LabelVocabulary, every node and edge label is written to ParSeMiS as a dense integer code rather than as its
+text, and fragments are decoded back to the original labels when they are read, by indexing the label list. Input
+and output files get smaller and faster to parse, and labels holding spaces, quotes or other characters that the
+text formats can't represent round trip exactly.
+
+The vocabulary is one list shared by node and edge labels, and can be saved as JSON and loaded again, so that the
+codes stay the same across runs.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+
+class LabelVocabulary:
+
+    def __init__(self, labels=None) -> None:
+        """
+        :param labels: The labels of the vocabulary, where each label's code is its position
+        """
+        super().__init__()
+        self._labels = []
+        self._codes = {}
+        self._lock = threading.Lock()
+        for label in labels or []:
+            self.encode(label)
+
+    def __len__(self):
+        return len(self._labels)
+
+    def __contains__(self, label):
+        return label in self._codes
+
+    @property
+    def labels(self):
+        """
+        :return: The list of labels, indexed by code
+        """
+        return self._labels
+
+    def encode(self, label):
+        """
+        :return: The code of a label, adding it to the vocabulary if it's new
+        """
+        code = self._codes.get(label)
+        if code is None:
+            with self._lock:
+                code = self._codes.setdefault(label, len(self._labels))
+                if code == len(self._labels):
+                    self._labels.append(label)
+        return code
+
+    def decode(self, code):
+        return self._labels[int(code)]
+
+    def decode_array(self, codes):
+        """
+        :param codes: An array of codes
+        :return: An object array of the labels of the codes
+        """
+        labels = np.empty(len(self._labels), dtype=object)
+        labels[:] = self._labels
+        return labels[np.asarray(codes, dtype=np.int64)]
+
+    def encoder_for(self, graphs, attribute_name='label'):
+        """
+        Encodes the node and edge labels of some graphs
+        :return: A dict from each of their labels to its code, small enough to send to a worker process
+        """
+        codes = {}
+        for graph in graphs:
+            for node in graph.nodes():
+                if node not in codes:
+                    codes[node] = self.encode(node)
+            for _, _, label in graph.edges(data=attribute_name):
+                if label is not None and label not in codes:
+                    codes[label] = self.encode(label)
+        return codes
+
+    def fingerprint(self, n_codes=None):
+        """
+        :param n_codes: Only the first n_codes labels are hashed, so a vocabulary that has since grown still gives the
+        same fingerprint for the codes an input used
+        :return: A hex digest of the labels and their codes
+        """
+        labels = self._labels[:n_codes] if n_codes is not None else self._labels
+        return hashlib.sha256(json.dumps(labels, default=repr).encode("utf-8")).hexdigest()
+
+    def to_json(self):
+        """
+        :return: The vocabulary as a JSON object of its labels. Labels have to be JSON serializable
+        """
+        return json.dumps({'labels': self._labels})
+
+    @staticmethod
+    def from_json(text):
+        """
+        :param text: JSON written by to_json. Lists are read back as the tuples they were written from, since a list
+        can't be a label
+        """
+        return LabelVocabulary(_hashable(label) for label in json.loads(text)['labels'])
+
+    def save(self, path):
+        """
+        Atomically writes the vocabulary as JSON, see to_json
+        """
+        text = self.to_json()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".json")
+        try:
+            with os.fdopen(descriptor, "w") as f:
+                f.write(text)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    @staticmethod
+    def load(path):
+        with open(path) as f:
+            return LabelVocabulary.from_json(f.read())
+
+
+def _hashable(label):
+    if isinstance(label, list):
+        return tuple(_hashable(item) for item in label)
+    return label
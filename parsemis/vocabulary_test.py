@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+
+from parsemis.testing import NodeAndEdgeMiner, random_graphs
+from parsemis.vocabulary import LabelVocabulary
+
+
+def awkward(label):
+    return "label '%s' with spaces" % label
+
+
+def as_dict(result, mapping=None):
+    fragments = {}
+    for frequent_graph in result:
+        graph = nx.relabel_nodes(frequent_graph.graph, mapping) if mapping is not None else frequent_graph.graph
+        key = frozenset(graph.nodes()) | frozenset(frozenset(edge) for edge in graph.edges())
+        fragments[key] = frequent_graph.appears_in.tolist()
+    return fragments
+
+
+class TestLabelVocabulary(unittest.TestCase):
+
+    def test_encode_decode(self):
+        vocabulary = LabelVocabulary(["a", "b"])
+        self.assertEqual(vocabulary.encode("b"), 1)
+        self.assertEqual(vocabulary.encode("c"), 2)
+        self.assertEqual(vocabulary.decode(2), "c")
+        self.assertEqual(vocabulary.decode_array([2, 0]).tolist(), ["c", "a"])
+        self.assertEqual(len(vocabulary), 3)
+        self.assertIn("a", vocabulary)
+
+    def test_save_load(self):
+        path = "%s/vocabulary.json" % tempfile.mkdtemp()
+        vocabulary = LabelVocabulary(["a", "b c", 3])
+        vocabulary.save(path)
+        loaded = LabelVocabulary.load(path)
+        self.assertEqual(loaded.labels, ["a", "b c", 3])
+        self.assertEqual(loaded.fingerprint(), vocabulary.fingerprint())
+        self.assertEqual(vocabulary.fingerprint(2), LabelVocabulary(["a", "b c", "d"]).fingerprint(2))
+
+    def test_mining_round_trips_labels(self):
+        graphs = random_graphs(40)
+        expected = as_dict(NodeAndEdgeMiner(tempfile.mkdtemp()).mine_graphs(graphs, minimum_frequency=4))
+
+        encoded = [nx.relabel_nodes(graph, awkward) for graph in graphs]
+        for graph in encoded:
+            for u, v, data in graph.edges(data=True):
+                data['label'] = awkward(data['label'])
+
+        path = "%s/vocabulary.json" % tempfile.mkdtemp()
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp(), label_vocabulary=path)
+        result = miner.mine_graphs(encoded, minimum_frequency=4)
+        with open(miner.input_file) as f:
+            self.assertNotIn("spaces", f.read())
+
+        for frequent_graph in result:
+            labels = [label for _, _, label in frequent_graph.graph.edges(data='label')]
+            self.assertTrue(all(label.startswith("label '") for label in labels))
+        self.assertEqual(as_dict(result, {awkward(label): label for label in "abcdefgh"}), expected)
+
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(NodeAndEdgeMiner(tempfile.mkdtemp(), label_vocabulary=path).label_vocabulary.labels,
+                         miner.label_vocabulary.labels)
+
+    def test_read_lg_decodes(self):
+        vocabulary = LabelVocabulary()
+        miner = NodeAndEdgeMiner(tempfile.mkdtemp(), mine_undirected=False, label_vocabulary=vocabulary)
+        graph = nx.DiGraph(id="g0")
+        graph.add_edge("it's", "a b", label="x y")
+        miner.write_graph([graph])
+        with open(miner.input_file) as f:
+            self.assertEqual(f.read().split("\n")[1:4], ["v 0 0", "v 1 1", "e 0 1 2"])
+
+        with open(miner.output_file, "w") as f:
+            f.write("t # 1\nv 0 0\nv 1 1\ne 0 1 2\n#=> g0\n")
+        frequent_graph, = miner.read_graph()
+        self.assertEqual(list(frequent_graph.graph.edges(data='label')), [("it's", "a b", "x y")])
+        self.assertEqual(frequent_graph.appears_in.tolist(), ["g0"])
+
+
+if __name__ == '__main__':
+    unittest.main()
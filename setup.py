@@ -6,6 +6,6 @@ setup(name='parsemis',
       author_email="tomkdickinson@gmail.com",
       packages=['parsemis'],
       package_data = {
-         '': ['parsemis.jar']
+         '': ['parsemis.jar', 'ParsemisServer.java']
       }
 )